@@ -6,6 +6,8 @@ from datetime import datetime
 from huggingface_hub import login
 from dotenv import load_dotenv
 import os
+from Summarizer.summary_text import prepare_summary_input, summary_length_bounds, summary_metrics
+from utils.metrics import track_stage
 load_dotenv()
 # Fix Windows encoding issue
 if sys.platform == "win32":
@@ -54,10 +56,11 @@ except Exception as e:
     summarizer = None
     model_name = "None"
 
-def Falcon_Sum(news_text=None):
+def Falcon_Sum(news_text=None, segments=None):
     """
     Run an improved summarization model optimized for news content.
     Returns abstractive summaries that capture core content, not just paraphrasing.
+    `segments` are the transcript's caption timings, when known.
     """
     try:
         if not summarizer:
@@ -77,60 +80,31 @@ def Falcon_Sum(news_text=None):
                 "model_used": model_name
             }
 
-        # Clean and prepare text
-        news_text = news_text.strip()
-        original_length = len(news_text)
-        
-        # Handle long texts intelligently
-        max_input_length = 1024  # BART/Pegasus token limit
-        if len(news_text) > max_input_length:
-            # Try to find a good breaking point (sentence boundary)
-            truncated_text = news_text[:max_input_length]
-            last_sentence = truncated_text.rfind('.')
-            if last_sentence > 500:  # If we find a reasonable sentence boundary
-                news_text = truncated_text[:last_sentence + 1]
-            else:
-                news_text = truncated_text + "..."
-        
-        # Determine optimal summary length based on input length
-        if len(news_text) < 200:
-            max_length, min_length = 50, 20
-        elif len(news_text) < 500:
-            max_length, min_length = 80, 30
-        elif len(news_text) < 1000:
-            max_length, min_length = 120, 40
-        else:
-            max_length, min_length = 150, 50
+        # Clean, truncate at a sentence boundary and size the summary
+        news_text, original_length = prepare_summary_input(news_text, segments)
+        max_length, min_length = summary_length_bounds(news_text)
 
         # Generate summary with optimized parameters
-        summary_result = summarizer(
-            news_text,
-            max_length=max_length,
-            min_length=min_length,
-            do_sample=False,  # Deterministic output
-            early_stopping=True,
-            no_repeat_ngram_size=3,  # Avoid repetition
-            num_beams=4  # Better quality with beam search
-        )
+        with track_stage("summarize_falcon"):
+            summary_result = summarizer(
+                news_text,
+                max_length=max_length,
+                min_length=min_length,
+                do_sample=False,  # Deterministic output
+                early_stopping=True,
+                no_repeat_ngram_size=3,  # Avoid repetition
+                num_beams=4  # Better quality with beam search
+            )
 
         summary = summary_result[0]['summary_text']
         
-        # Quality metrics
-        compression_ratio = len(summary) / len(news_text)
-        
         return {
             "status": "success",
             "original_text": news_text,
             "summary": summary,
             "timestamp": datetime.utcnow().isoformat(),
             "model_used": model_name,
-            "metrics": {
-                "original_length": original_length,
-                "processed_length": len(news_text),
-                "summary_length": len(summary),
-                "compression_ratio": round(compression_ratio, 2),
-                "was_truncated": original_length > max_input_length
-            }
+            "metrics": summary_metrics(original_length, news_text, summary)
         }
 
     except Exception as e:
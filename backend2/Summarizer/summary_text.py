@@ -0,0 +1,65 @@
+# summary_text.py
+"""
+Text handling around the summarizers, without any model or API imports:
+the extractive fallback and the input/output processing of Falcon_Sum.
+"""
+from Transcripts.sentence_segmenter import sentence_segmenter, finish_sentence, truncate_at_sentence
+
+# BART/Pegasus token limit, in characters
+MAX_INPUT_CHARS = 1024
+# Truncating at a sentence boundary must keep at least this much text
+MIN_TRUNCATED_CHARS = 500
+
+
+def simple_extractive_summary(text: str, max_sentences: int = 3, segments=None) -> str:
+    """
+    Simple extractive summarization without ML models.
+    Sentences come from the segmenter, so unpunctuated auto-captions are
+    split too (at caption pauses and discourse markers when `segments`,
+    the stored caption timings, are given).
+    """
+    sentences = sentence_segmenter.split(text, segments)
+    if len(sentences) <= max_sentences:
+        return text
+
+    # Evenly spaced sentences: first, middle and last for the default three
+    if max_sentences >= 3:
+        indices = sorted({round(i * (len(sentences) - 1) / (max_sentences - 1)) for i in range(max_sentences)})
+    else:
+        indices = range(max_sentences)
+    return ' '.join(finish_sentence(sentences[i]) for i in indices)
+
+
+def prepare_summary_input(news_text, segments=None, max_chars=MAX_INPUT_CHARS):
+    """(model input, length of the stripped text) for a transcript"""
+    if segments is not None and news_text[:1].isspace():
+        segments = None  # offsets index the unstripped text
+    news_text = news_text.strip()
+    original_length = len(news_text)
+    if len(news_text) > max_chars:
+        # Break at a sentence boundary (found in unpunctuated captions too)
+        # when that keeps a reasonable amount of text
+        news_text = truncate_at_sentence(news_text, max_chars, min_chars=MIN_TRUNCATED_CHARS, segments=segments)
+    return news_text, original_length
+
+
+def summary_length_bounds(news_text):
+    """(max_length, min_length) of the generated summary for an input"""
+    if len(news_text) < 200:
+        return 50, 20
+    if len(news_text) < 500:
+        return 80, 30
+    if len(news_text) < 1000:
+        return 120, 40
+    return 150, 50
+
+
+def summary_metrics(original_length, news_text, summary, max_chars=MAX_INPUT_CHARS):
+    """Quality metrics of a summary returned with the result"""
+    return {
+        "original_length": original_length,
+        "processed_length": len(news_text),
+        "summary_length": len(summary),
+        "compression_ratio": round(len(summary) / len(news_text), 2),
+        "was_truncated": original_length > max_chars
+    }
@@ -2,148 +2,171 @@
 import re
 import requests
 from datetime import datetime, timedelta, timezone
-from youtube_transcript_api import YouTubeTranscriptApi
-from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound, VideoUnavailable
 import isodate
 import os
+import logging
 import time
 import random
-from pymongo import MongoClient
+from pymongo import MongoClient, ReturnDocument, ReplaceOne, UpdateOne
 from urllib.parse import urlparse
 import hashlib
+from collections import Counter
 from dotenv import load_dotenv
+from Transcripts.news_stats import NewsStatsTracker
+from Transcripts.genre_classifier import GenreClassifier
+from Transcripts.transcript_segments import pack_segments
+from Transcripts.story_dedup import signature_from_binary, signature_to_binary
+from Transcripts.transcript_languages import LanguageNegotiator
+from Transcripts.negative_cache import NegativeCache, REQUESTS_SAVED
+from Transcripts.live_detector import LiveDetector
+from Transcripts.semantic_index import document_text
+from Transcripts.transcript_store import TRANSCRIPT_PREVIEW_CHARS, TranscriptStore, make_preview
+from models.news_document import LIST_PROJECTION, SCHEMA_VERSION, normalize_news_document
+from utils.metrics import CRAWL_CACHE_RATIO, CRAWL_VIDEOS, spend_quota, timed_stage, track_stage
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# YouTube Data API base URL; the ingestion benchmark points it at a local stand-in
+YOUTUBE_API_URL = os.getenv("YOUTUBE_API_URL", "https://www.googleapis.com/youtube/v3").rstrip("/")
+
+# Music/sound markers YouTube puts in auto-generated captions
+MUSIC_INDICATORS = [
+    '[Music]', '[music]', '[MUSIC]',
+    '[Applause]', '[applause]', '[APPLAUSE]',
+    '[Laughter]', '[laughter]', '[LAUGHTER]',
+    '[Background Music]', '[background music]',
+    '[Instrumental]', '[instrumental]',
+    '[Sound]', '[sound]', '[SOUND]',
+    '[Beat]', '[beat]', '[BEAT]'
+]
+
+_MUSIC_NAMES = sorted({indicator.lower().strip('[]') for indicator in MUSIC_INDICATORS}, key=len, reverse=True)
+
+# Markers and whitespace runs collapse to a single space in one substitution
+_MARKERS_OR_SPACE_RE = re.compile(
+    r'(?:\s|\[(?:' + '|'.join(re.escape(name) for name in _MUSIC_NAMES) + r')\])+',
+    re.IGNORECASE
+)
+# Repeated words (like "Heat Heat Heat")
+_REPEATED_WORD_RE = re.compile(r'\b(\w+)(?: \1)+\b', re.IGNORECASE)
+# A word counts as music-related when it contains one of the marker names
+_MUSIC_WORD_RE = re.compile('|'.join(re.escape(name) for name in _MUSIC_NAMES if ' ' not in name))
+_WORD_PUNCTUATION = '.,!?;:'
+
+
+class TranscriptAnalysis:
+    """Cleaned transcript text plus the statistics the filters need"""
+
+    __slots__ = ("cleaned_text", "word_count", "content_word_count",
+                 "unique_word_count", "music_ratio", "max_word_frequency")
+
+    def __init__(self, cleaned_text="", word_count=0, content_word_count=0,
+                 unique_word_count=0, music_ratio=0.0, max_word_frequency=0.0):
+        self.cleaned_text = cleaned_text
+        self.word_count = word_count                  # all tokens of cleaned_text
+        self.content_word_count = content_word_count  # tokens longer than 2 chars
+        self.unique_word_count = unique_word_count
+        self.music_ratio = music_ratio
+        self.max_word_frequency = max_word_frequency  # share of the most common word
+
+    def is_meaningful(self, min_words=10, min_unique_words=5):
+        if len(self.cleaned_text) < 20:
+            return False
+        if self.content_word_count < min_words:
+            return False
+        if self.unique_word_count < min_unique_words:
+            return False
+        # If more than 30% of words are music-related, reject
+        if self.music_ratio > 0.3:
+            return False
+        # If any single word appears more than 40% of the time, it's likely repetitive
+        if self.max_word_frequency > 0.4:
+            return False
+        return True
+
+
 class EnhancedNewsFilter:
     def __init__(self):
         # Music indicators in transcripts
-        self.music_indicators = [
-            '[Music]', '[music]', '[MUSIC]',
-            '[Applause]', '[applause]', '[APPLAUSE]',
-            '[Laughter]', '[laughter]', '[LAUGHTER]',
-            '[Background Music]', '[background music]',
-            '[Instrumental]', '[instrumental]',
-            '[Sound]', '[sound]', '[SOUND]',
-            '[Beat]', '[beat]', '[BEAT]'
-        ]
+        self.music_indicators = MUSIC_INDICATORS
         
-        # Live news indicators in titles
-        self.live_indicators = [
-            'live', 'LIVE', 'Live',
-            'breaking', 'BREAKING', 'Breaking',
-            'streaming', 'STREAMING', 'Streaming',
-            'पत्रकार सम्मेलन', 'प्रेस कॉन्फ्रेंस',  # Hindi for press conference
-            'सीधा प्रसारण',  # Hindi for live broadcast
-        ]
+        # Live news detection, one compiled pattern per field
+        self.live_detector = LiveDetector()
+    
+    def analyze_transcript(self, transcript_text):
+        """
+        Clean a transcript and compute its content statistics in one go.
+        Two precompiled substitutions produce the cleaned text, then a single
+        pass over its words yields every count the filters use.
+        """
+        if not transcript_text:
+            return TranscriptAnalysis()
+        
+        # Remove music markers and extra whitespace, then repeated words
+        cleaned_text = _MARKERS_OR_SPACE_RE.sub(' ', transcript_text).strip()
+        cleaned_text = _REPEATED_WORD_RE.sub(r'\1', cleaned_text)
+        
+        tokens = cleaned_text.split()
+        # Lowercased words without surrounding punctuation, longer than 2 chars
+        words = [word for word in (token.strip(_WORD_PUNCTUATION).lower() for token in tokens)
+                 if len(word) > 2]
+        if not words:
+            return TranscriptAnalysis(cleaned_text, len(tokens))
+        
+        word_counts = Counter(words)
+        music_words = sum(count for word, count in word_counts.items() if _MUSIC_WORD_RE.search(word))
+        
+        return TranscriptAnalysis(
+            cleaned_text=cleaned_text,
+            word_count=len(tokens),
+            content_word_count=len(words),
+            unique_word_count=len(word_counts),
+            music_ratio=music_words / len(words),
+            max_word_frequency=max(word_counts.values()) / len(words),
+        )
     
     def clean_transcript_text(self, transcript_text):
         """Clean transcript by removing music/sound markers"""
-        if not transcript_text:
-            return ""
-        
-        cleaned_text = transcript_text
-        
-        # Remove music indicators
-        for indicator in self.music_indicators:
-            cleaned_text = cleaned_text.replace(indicator, " ")
-        
-        # Remove repeated words (like "Heat Heat Heat")
-        cleaned_text = re.sub(r'\b(\w+)(\s+\1)+\b', r'\1', cleaned_text, flags=re.IGNORECASE)
-        
-        # Remove extra whitespace
-        cleaned_text = re.sub(r'\s+', ' ', cleaned_text).strip()
-        
-        return cleaned_text
+        return self.analyze_transcript(transcript_text).cleaned_text
     
     def is_meaningful_transcript(self, transcript_text, min_words=10, min_unique_words=5):
         """Check if transcript contains meaningful content"""
-        if not transcript_text:
-            return False
-        
-        # Clean the transcript first
-        cleaned_text = self.clean_transcript_text(transcript_text)
-        
-        if not cleaned_text or len(cleaned_text.strip()) < 20:
-            return False
-        
-        # Split into words and filter out short/meaningless words
-        words = [word.strip('.,!?;:') for word in cleaned_text.split() 
-                if len(word.strip('.,!?;:')) > 2]
-        
-        # Check if we have enough words
-        if len(words) < min_words:
-            return False
-        
-        # Check for unique words (avoid repetitive content)
-        unique_words = set(word.lower() for word in words)
-        if len(unique_words) < min_unique_words:
-            return False
-        
-        # Check if it's mostly music/sound effects
-        music_word_count = sum(1 for word in words if any(
-            indicator.lower().replace('[', '').replace(']', '') in word.lower() 
-            for indicator in self.music_indicators
-        ))
-        
-        # If more than 30% of words are music-related, reject
-        if music_word_count / len(words) > 0.3:
-            return False
-        
-        # Check for repetitive patterns (like "Heat Heat Heat")
-        word_counts = {}
-        for word in words:
-            word_lower = word.lower()
-            word_counts[word_lower] = word_counts.get(word_lower, 0) + 1
-        
-        # If any single word appears more than 40% of the time, it's likely repetitive
-        max_word_frequency = max(word_counts.values()) if word_counts else 0
-        if max_word_frequency / len(words) > 0.4:
-            return False
-        
-        return True
+        return self.analyze_transcript(transcript_text).is_meaningful(min_words, min_unique_words)
     
     def is_live_news(self, title, description=""):
         """Check if video is live news/streaming"""
-        title_lower = title.lower()
-        description_lower = description.lower()
-        
-        # Check for live indicators in title
-        for indicator in self.live_indicators:
-            if indicator.lower() in title_lower:
-                return True
-        
-        # Additional patterns for live content
-        live_patterns = [
-            r'\blive\b',
-            r'\bstreaming\b',
-            r'\bpress conference\b',
-            r'\bpress meet\b',
-            r'\bसीधा\b.*?प्रसारण',
-            r'\bलाइव\b',
-        ]
-        
-        for pattern in live_patterns:
-            if re.search(pattern, title_lower, re.IGNORECASE):
-                return True
-            if description and re.search(pattern, description_lower, re.IGNORECASE):
-                return True
-        
-        return False
+        return self.live_detector.is_live(title, description)
 
 
 class EnhancedNewsTranscriptCacher:
     def __init__(self, 
                  mongo_uri=os.getenv("MONGO_URI"), 
                  database_name="NewsByte_AI", 
-                 collection_name="news"):
-        
-        self.client = MongoClient(mongo_uri)
+                 collection_name="news",
+                 feed_index=None,
+                 story_index=None,
+                 semantic_index=None,
+                 client=None,
+                 pace_requests=True):
+        
+        self.client = client if client is not None else MongoClient(mongo_uri)
         self.db = self.client[database_name]
         self.collection = self.db[collection_name]
         self.request_count = 0
         self.last_request_time = 0
         self.content_filter = EnhancedNewsFilter()  # Initialize filter
+        self.genre_classifier = GenreClassifier()
+        self.language_negotiator = LanguageNegotiator()
+        self.negative_cache = NegativeCache(self.db)
+        self.transcript_store = TranscriptStore(self.db)
+        self.last_transcript_rejection = None  # reason code of the last failed transcript fetch
+        self.stats = NewsStatsTracker(self.db, news_collection_name=collection_name)
+        self.feed_index = feed_index  # Optional in-process hot feed index
+        self.story_index = story_index  # Optional near-duplicate story index
+        self.semantic_index = semantic_index  # Optional embedding index for semantic search
+        self.pace_requests = pace_requests  # Sleeps between YouTube requests; off only for local stand-ins
         
         # Create indexes for better performance
         try:
@@ -153,46 +176,59 @@ class EnhancedNewsTranscriptCacher:
             self.collection.create_index("video_id")  # Add video_id index
             self.collection.create_index("channel_id")  # Add channel_id index
             self.collection.create_index([("cached_at", -1), ("genre", 1)])
-            print(f"Connected to MongoDB: {database_name}.{collection_name}")
+            self.collection.create_index([("channel_id", 1), ("cached_at", -1)])  # Per-channel feeds
+            self.collection.create_index("story_id")
+            logger.info(f"Connected to MongoDB: {database_name}.{collection_name}")
         except Exception as e:
-            print(f"Warning: Could not create indexes: {e}")
+            logger.warning(f"Warning: Could not create indexes: {e}")
     
-    def detect_genre(self, text):
-        text = text.lower()
-        if any(word in text for word in ['election', 'minister', 'bjp', 'congress', 'parliament','cm','pm']):
-            return 'politics'
-        elif any(word in text for word in ['match', 'team', 'player', 'tournament']):
-            return 'sports'
-        elif any(word in text for word in ['ai', 'technology', 'smartphone', 'internet']):
-            return 'technology'
-        elif any(word in text for word in ['movie', 'film', 'actor', 'celebrity', 'music']):
-            return 'entertainment'
-        elif any(word in text for word in ['attack', 'murder', 'crime', 'terror', 'raid']):
-            return 'crime'
-        else:
-            return 'general'
+    def detect_genre(self, text, title=""):
+        """Primary genre of a transcript (see GenreClassifier for all labels)"""
+        return self.genre_classifier.classify(text, title).primary
     
-    def is_short(self, video_id, API_KEY):
+    def assign_story(self, video_id, cleaned_transcript):
+        """
+        story_id/minhash fields for a transcript: the story of its closest
+        near-duplicate already cached, or a new story named after the video.
+        """
+        if self.story_index is None:
+            return {}
+        signature = self.story_index.signature(cleaned_transcript)
+        if signature is None:
+            return {}
+        story_id, similarity = self.story_index.find_story(video_id, signature)
+        if similarity is not None and story_id != video_id:
+            logger.info(f"[story] {video_id} duplicates story {story_id} (similarity {similarity})")
+        return {"story_id": story_id, "minhash": signature_to_binary(signature)}
+    
+    def video_duration(self, video_id, API_KEY):
+        """Duration in seconds, or None when it could not be determined"""
         try:
             video_url = (
-                f"https://www.googleapis.com/youtube/v3/videos?part=contentDetails"
+                f"{YOUTUBE_API_URL}/videos?part=contentDetails"
                 f"&id={video_id}&key={API_KEY}"
             )
-            res = requests.get(video_url)
+            with track_stage("duration_check", video_id=video_id) as stage:
+                res = requests.get(video_url)
+                spend_quota("videos.list")
+                stage.failed = res.status_code != 200
             if res.status_code != 200:
-                print(f"[is_short] failed to fetch contentDetails for {video_id}")
-                return True
+                logger.warning(f"[is_short] failed to fetch contentDetails for {video_id}")
+                return None
 
             items = res.json().get("items", [])
             if not items:
-                return True
+                return None
 
             duration = items[0]["contentDetails"].get("duration", "")
-            parsed_duration = isodate.parse_duration(duration)
-            return parsed_duration.total_seconds() < 60
+            return isodate.parse_duration(duration).total_seconds()
         except Exception as e:
-            print(f"Error checking video duration: {e}")
-            return True
+            logger.warning(f"Error checking video duration: {e}")
+            return None
+    
+    def is_short(self, video_id, API_KEY):
+        duration = self.video_duration(video_id, API_KEY)
+        return duration is None or duration < 60
     
     def get_video_id_from_url(self, video_url):
         """Extract video ID from YouTube URL"""
@@ -217,6 +253,9 @@ class EnhancedNewsTranscriptCacher:
         if not cached_at:
             return False, cached_doc
             
+        if cached_at.tzinfo is None:
+            # MongoDB hands back naive UTC datetimes
+            cached_at = cached_at.replace(tzinfo=timezone.utc)
         cache_age = datetime.now(timezone.utc) - cached_at
         if cache_age.total_seconds() > (cache_hours * 3600):
             return False, cached_doc
@@ -226,84 +265,91 @@ class EnhancedNewsTranscriptCacher:
     def get_transcript_with_fallbacks(self, video_id, delay=2):
         """Enhanced transcript fetching with music/live filtering"""
         current_time = time.time()
-        if current_time - self.last_request_time < delay:
+        if self.pace_requests and current_time - self.last_request_time < delay:
             sleep_time = delay - (current_time - self.last_request_time)
             time.sleep(sleep_time)
         
         self.last_request_time = time.time()
         self.request_count += 1
-        time.sleep(random.uniform(0.5, 1.5))
+        self.last_transcript_rejection = None
+        if self.pace_requests:
+            time.sleep(random.uniform(0.5, 1.5))
         
         try:
-            # Try English first
-            transcript_data = YouTubeTranscriptApi.get_transcript(video_id, languages=['en'])
-            transcript_text = " ".join(segment.get("text", "") for segment in transcript_data).strip()
-            
-            # Check if transcript is meaningful
-            if self.content_filter.is_meaningful_transcript(transcript_text):
-                cleaned_text = self.content_filter.clean_transcript_text(transcript_text)
-                return transcript_data, 'en', cleaned_text
-            else:
-                print(f"[skip] Transcript mostly music/repetitive: {video_id}")
-                return None, None, None
-                
-        except:
-            # Try any available language
-            try:
-                transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-                for transcript in transcript_list:
-                    try:
-                        transcript_data = transcript.fetch()
-                        transcript_text = " ".join(segment.get("text", "") for segment in transcript_data).strip()
-                        
-                        if self.content_filter.is_meaningful_transcript(transcript_text):
-                            cleaned_text = self.content_filter.clean_transcript_text(transcript_text)
-                            return transcript_data, transcript.language_code, cleaned_text
-                    except:
-                        continue
-                        
-                # Try translation to English
-                for transcript in transcript_list:
-                    try:
-                        if transcript.is_translatable:
-                            translated = transcript.translate('en')
-                            transcript_data = translated.fetch()
-                            transcript_text = " ".join(segment.get("text", "") for segment in transcript_data).strip()
-                            
-                            if self.content_filter.is_meaningful_transcript(transcript_text):
-                                cleaned_text = self.content_filter.clean_transcript_text(transcript_text)
-                                return transcript_data, f'{transcript.language_code}-to-en', cleaned_text
-                    except:
-                        continue
-            except:
-                pass
+            # One (cached) listing, then only the best ranked transcript is downloaded
+            with track_stage("transcript_fetch", video_id=video_id):
+                transcript_data, language = self.language_negotiator.fetch_best(video_id)
+        except Exception as e:
+            logger.warning(f"[transcript] listing failed for {video_id}: {e}")
+            return None, None, None
+        
+        if not transcript_data:
+            self.last_transcript_rejection = self.language_negotiator.failure_reason(video_id)
+            return None, None, None
+        
+        transcript_text = " ".join(segment.get("text", "") for segment in transcript_data).strip()
         
+        # Clean and check the transcript in a single analysis
+        with track_stage("cleaning", video_id=video_id):
+            analysis = self.content_filter.analyze_transcript(transcript_text)
+        if analysis.is_meaningful():
+            return transcript_data, language, analysis.cleaned_text
+        
+        logger.info(f"[skip] Transcript mostly music/repetitive: {video_id} ({language})")
+        self.last_transcript_rejection = "music"
         return None, None, None
     
     def cache_video_data(self, video_data):
-        """Store or update video data in MongoDB"""
+        """Store or update video data in MongoDB, returns the stored document or None"""
         try:
+            # Add caching metadata and enforce the canonical document shape
+            video_data = normalize_news_document(
+                dict(video_data, cached_at=datetime.now(timezone.utc))
+            )
+            full_transcript = video_data.get("transcript") or ""
+            video_data = self._externalize_transcript(video_data)
+            
             # Use video_url as unique identifier
             filter_query = {"video_url": video_data["video_url"]}
             
-            # Add caching metadata
-            video_data["cached_at"] = datetime.now(timezone.utc)
-            video_data["cache_version"] = "1.0"
-            
-            # Upsert (update if exists, insert if not)
-            result = self.collection.replace_one(
-                filter_query, 
-                video_data, 
-                upsert=True
-            )
+            # Upsert (update if exists, insert if not), keeping the previous
+            # version so the stats counters can be adjusted by the difference
+            with track_stage("mongo_write", video_id=video_data.get("video_id")):
+                previous = self.collection.find_one_and_replace(
+                    filter_query, 
+                    video_data, 
+                    upsert=True,
+                    return_document=ReturnDocument.BEFORE
+                )
+            self.stats.apply_change(previous, video_data)
+            if previous and previous.get("transcript_external") and not video_data["transcript_external"]:
+                self.transcript_store.delete_many([video_data["video_id"]])
+            if self.feed_index is not None:
+                self.feed_index.upsert(video_data)
+            if self.story_index is not None and video_data.get("minhash"):
+                self.story_index.add(
+                    video_data["video_id"], video_data["story_id"],
+                    signature_from_binary(video_data["minhash"]), video_data["cached_at"]
+                )
+            if self.semantic_index is not None:
+                self.semantic_index.add(video_data["video_id"], document_text(video_data, full_transcript))
             
-            action = "updated" if result.matched_count > 0 else "inserted"
-            print(f"[cache] {action} video: {video_data.get('title', 'Unknown')[:50]}...")
+            action = "updated" if previous else "inserted"
+            logger.debug(f"[cache] {action} video: {video_data.get('title', 'Unknown')[:50]}...")
             
-            return True
+            return video_data
         except Exception as e:
-            print(f"[cache] error storing video data: {e}")
-            return False
+            logger.error(f"[cache] error storing video data: {e}")
+            return None
+    
+    def _externalize_transcript(self, video_data):
+        """Move a long transcript to the transcript store, keeping a preview inline"""
+        text = video_data.get("transcript") or ""
+        if video_data.get("transcript_external") or len(text) <= TRANSCRIPT_PREVIEW_CHARS:
+            return video_data
+        # Written before the news document so a reference never points at nothing
+        self.transcript_store.put(video_data["video_id"], text)
+        return dict(video_data, transcript=make_preview(text), transcript_external=True)
     
     def get_cached_news(self, 
                        hours_old=24, 
@@ -328,21 +374,18 @@ class EnhancedNewsTranscriptCacher:
             query["genre"] = {"$in": genres}
         
         try:
-            cursor = self.collection.find(query).sort("cached_at", -1).limit(limit)
-            results = []
-            
-            for item in cursor:
-                # Remove MongoDB ObjectId
-                item.pop('_id', None)
-                results.append(item)
+            # Documents are normalized on write, only the ObjectId is left out
+            cursor = self.collection.find(query, LIST_PROJECTION).sort("cached_at", -1).limit(limit)
+            results = list(cursor)
             
-            print(f"[cache] Retrieved {len(results)} cached news items")
+            logger.debug(f"[cache] Retrieved {len(results)} cached news items")
             return results
             
         except Exception as e:
-            print(f"[cache] error retrieving cached data: {e}")
+            logger.error(f"[cache] error retrieving cached data: {e}")
             return []
     
+    @timed_stage("crawl")
     def get_latest_news_with_caching(self,
                                    query: str = 'NDTV latest news',
                                    num_videos_to_fetch: int = 10,
@@ -368,10 +411,10 @@ class EnhancedNewsTranscriptCacher:
                 channel_id=channel_id
             )
             if len(cached_results) >= num_videos_to_fetch:
-                print(f"[cache] Using {len(cached_results)} cached results")
+                logger.info(f"[cache] Using {len(cached_results)} cached results")
                 return cached_results
             else:
-                print(f"[cache] Only found {len(cached_results)} cached items, fetching fresh data")
+                logger.info(f"[cache] Only found {len(cached_results)} cached items, fetching fresh data")
         
         # Search for new videos
         time_threshold = datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)
@@ -390,10 +433,13 @@ class EnhancedNewsTranscriptCacher:
         if channel_id:
             params["channelId"] = channel_id
 
-        search_url = "https://www.googleapis.com/youtube/v3/search"
-        resp = requests.get(search_url, params=params)
+        search_url = f"{YOUTUBE_API_URL}/search"
+        with track_stage("youtube_search", channel_id=channel_id) as stage:
+            resp = requests.get(search_url, params=params)
+            spend_quota("search.list")
+            stage.failed = resp.status_code != 200
         if resp.status_code != 200:
-            print(f"[search] failed: {resp.status_code}")
+            logger.warning(f"[search] failed: {resp.status_code}")
             return self.get_cached_news(hours_old=24, limit=num_videos_to_fetch, channel_id=channel_id)
 
         data = resp.json()
@@ -401,8 +447,18 @@ class EnhancedNewsTranscriptCacher:
         new_results = []
         processed_count = 0
         api_calls_made = 0
+        fresh_ids = set()  # videos fetched and stored by this crawl
         skipped_live = 0
         skipped_music = 0
+        skipped_known = 0
+        requests_saved = 0
+        
+        # Videos rejected by earlier crawls, looked up once for the whole page
+        known_rejections = self.negative_cache.lookup_many(
+            [item.get("id", {}).get("videoId") for item in items if item.get("id", {}).get("videoId")]
+        )
+        # Live broadcasts of the page, mostly from the snippets' broadcast status
+        live_videos = self.content_filter.live_detector.classify_page(items) if exclude_live else {}
 
         for item in items:
             if len(new_results) >= num_videos_to_fetch:
@@ -422,27 +478,48 @@ class EnhancedNewsTranscriptCacher:
             published_at = snippet.get("publishedAt", "")
             video_url = f"https://www.youtube.com/watch?v={video_id}"
             
-            print(f"Processing {processed_count}: {title[:50]}...")
+            logger.debug(f"Processing {processed_count}: {title[:50]}...")
 
             # Check if already cached and fresh
-            is_fresh, cached_data = self.is_cached_and_fresh(video_url, cache_hours)
+            with track_stage("freshness_lookup", video_id=video_id):
+                is_fresh, cached_data = self.is_cached_and_fresh(video_url, cache_hours)
             
             if is_fresh:
-                print(f"[cache] Using cached data for {video_id}")
+                logger.debug(f"[cache] Using cached data for {video_id}")
                 # Remove _id if present
                 cached_data.pop('_id', None)
                 new_results.append(cached_data)
+                CRAWL_VIDEOS.inc(outcome="from_cache")
+                continue
+
+            rejection = known_rejections.get(video_id)
+            if rejection and not (rejection == "live" and not exclude_live):
+                logger.debug(f"[skip] Known rejection ({rejection}): {video_id}")
+                self.negative_cache.record_skip(rejection)
+                skipped_known += 1
+                requests_saved += REQUESTS_SAVED.get(rejection, 0)
+                CRAWL_VIDEOS.inc(outcome="known_rejection")
+                # Videos without a transcript were still cached, reuse that copy
+                if cached_data:
+                    cached_data.pop('_id', None)
+                    new_results.append(cached_data)
                 continue
 
             # Filter out live news if requested
-            if exclude_live and self.content_filter.is_live_news(title, description):
-                print(f"[skip] Live news detected: {video_id}")
+            if live_videos.get(video_id):
+                logger.debug(f"[skip] Live news detected: {video_id}")
+                self.negative_cache.record(video_id, "live", channel_id)
                 skipped_live += 1
+                CRAWL_VIDEOS.inc(outcome="live")
                 continue
 
             # Skip shorts
-            if self.is_short(video_id, API_KEY):
-                print(f"[skip] Short video: {video_id}")
+            duration = self.video_duration(video_id, API_KEY)
+            if duration is None or duration < 60:
+                logger.debug(f"[skip] Short video: {video_id}")
+                if duration is not None:
+                    self.negative_cache.record(video_id, "short", channel_id)
+                CRAWL_VIDEOS.inc(outcome="short")
                 continue
 
             # Fetch transcript with enhanced filtering
@@ -450,7 +527,14 @@ class EnhancedNewsTranscriptCacher:
             api_calls_made += 1
             
             if not transcript_data or not cleaned_transcript:
-                # Create result without transcript but with all required fields
+                if self.last_transcript_rejection:
+                    self.negative_cache.record(video_id, self.last_transcript_rejection, channel_id)
+                if self.last_transcript_rejection == "music":
+                    skipped_music += 1
+                # Create result without transcript but with all required fields,
+                # the genre then comes from the title and description
+                with track_stage("genre_detection", video_id=video_id):
+                    classification = self.genre_classifier.classify(description, title)
                 result = {
                     "video_id": video_id,
                     "title": title,
@@ -461,25 +545,32 @@ class EnhancedNewsTranscriptCacher:
                     "channel_name": channel_title,
                     "channel_url": f"https://www.youtube.com/channel/{channel_id}" if channel_id else "",
                     "published_at": published_at,
-                    "genre": "general",
+                    "genre": classification.primary,
+                    "genres": classification.labels,
                     "transcript": "No meaningful transcript available",
                     "transcript_language": "none",
                     "word_count": 0
                 }
                 
                 # Still cache it for future reference
-                if self.cache_video_data(result):
-                    new_results.append(result)
-                    print(f"[cached] {video_id} (no transcript) - Total: {len(new_results)}")
+                stored = self.cache_video_data(result)
+                if stored:
+                    new_results.append(stored)
+                    fresh_ids.add(video_id)
+                    logger.debug(f"[cached] {video_id} (no transcript) - Total: {len(new_results)}")
+                CRAWL_VIDEOS.inc(outcome="no_transcript")
                 continue
 
             # Final word count check
             word_count = len(cleaned_transcript.split())
             if word_count < min_transcript_words:
-                print(f"[skip] Transcript too short ({word_count} words): {video_id}")
+                logger.debug(f"[skip] Transcript too short ({word_count} words): {video_id}")
+                self.negative_cache.record(video_id, "too_short", channel_id, f"{word_count} words")
+                CRAWL_VIDEOS.inc(outcome="too_short")
                 continue
 
-            genre = self.detect_genre(cleaned_transcript)
+            with track_stage("genre_detection", video_id=video_id):
+                classification = self.genre_classifier.classify(cleaned_transcript, title)
             
             # Create result object with cleaned transcript
             result = {
@@ -492,19 +583,30 @@ class EnhancedNewsTranscriptCacher:
                 "channel_name": channel_title,
                 "channel_url": f"https://www.youtube.com/channel/{channel_id}" if channel_id else "",
                 "published_at": published_at,
-                "genre": genre,
+                "genre": classification.primary,
+                "genres": classification.labels,
                 "transcript": cleaned_transcript,  # Use cleaned transcript
+                # Caption timings as packed arrays aligned to the cleaned text
+                "transcript_segments": pack_segments(
+                    transcript_data, cleaned_transcript, self.content_filter.clean_transcript_text
+                ),
                 "transcript_language": language,
                 "word_count": word_count
             }
+            # Cluster near-duplicate uploads of the same story
+            result.update(self.assign_story(video_id, cleaned_transcript))
             
             # Cache the result
-            if self.cache_video_data(result):
-                new_results.append(result)
-                print(f"[success] Cached {video_id} ({language}, {word_count} words) - Total: {len(new_results)}")
+            stored = self.cache_video_data(result)
+            if stored:
+                new_results.append(stored)
+                fresh_ids.add(video_id)
+                CRAWL_VIDEOS.inc(outcome="cached")
+                logger.debug(f"[success] Cached {video_id} ({language}, {word_count} words) - Total: {len(new_results)}")
             
             # Rate limiting
-            time.sleep(random.uniform(2, 4))
+            if self.pace_requests:
+                time.sleep(random.uniform(2, 4))
 
         # Combine with existing cache if needed
         if len(new_results) < num_videos_to_fetch:
@@ -519,69 +621,275 @@ class EnhancedNewsTranscriptCacher:
                 if cached_item.get("video_url") not in existing_urls:
                     new_results.append(cached_item)
 
-        print(f"\n=== ENHANCED FILTERING SUMMARY ===")
-        print(f"✅ Total results: {len(new_results)}")
-        print(f"🆕 New API calls made: {api_calls_made}")
-        print(f"💾 Used cached data: {len(new_results) - api_calls_made}")
-        print(f"🎵 Skipped music/repetitive: {skipped_music}")
-        print(f"📡 Skipped live news: {skipped_live}")
-        print(f"🎯 Cache efficiency: {((len(new_results) - api_calls_made) / max(len(new_results), 1) * 100):.1f}%")
+        # Only what is returned counts; transcript fetches that were rejected
+        # cost requests but are not results, so they cannot be subtracted
+        returned = new_results[:num_videos_to_fetch]
+        from_cache = sum(1 for r in returned if r.get("video_id") not in fresh_ids)
+        if returned:
+            CRAWL_CACHE_RATIO.set(from_cache / len(returned))
+
+        logger.info(
+            f"[crawl] {len(returned)} results, {from_cache} from cache "
+            f"({from_cache / max(len(returned), 1) * 100:.1f}% cache efficiency), {api_calls_made} transcript fetches, "
+            f"skipped {skipped_music} music, {skipped_live} live, {skipped_known} known rejections "
+            f"({requests_saved} requests saved)",
+            extra={"channel_id": channel_id, "results": len(returned), "from_cache": from_cache,
+                   "transcript_fetches": api_calls_made, "skipped_music": skipped_music,
+                   "skipped_live": skipped_live, "skipped_known": skipped_known, "requests_saved": requests_saved}
+        )
         
-        return new_results[:num_videos_to_fetch]
+        return returned
     
     def cleanup_old_cache(self, days_old=7):
         """Remove old cached entries to keep database clean"""
         cutoff_time = datetime.now(timezone.utc) - timedelta(days=days_old)
         
+        external = self.collection.distinct(
+            "video_id", {"cached_at": {"$lt": cutoff_time}, "transcript_external": True}
+        )
+        self.stats.subtract({"cached_at": {"$lt": cutoff_time}})
         result = self.collection.delete_many({
             "cached_at": {"$lt": cutoff_time}
         })
-        
-        print(f"[cleanup] Removed {result.deleted_count} old cache entries")
+        if external:
+            self.transcript_store.delete_many(external)
+        
+        logger.info(f"[cleanup] Removed {result.deleted_count} old cache entries")
+        if result.deleted_count:
+            if self.feed_index is not None:
+                self.feed_index.drop_older_than(cutoff_time)
+            if self.story_index is not None:
+                self.story_index.drop_older_than(cutoff_time)
         return result.deleted_count
     
+    def backfill_schema(self, batch_size=500):
+        """
+        Rewrite documents written before the current SCHEMA_VERSION into the
+        canonical shape. Documents that cannot be normalized (missing
+        video_id/title/video_url) are moved to <collection>_invalid.
+
+        Only the fields normalization changed are written, and only while
+        those fields and cache_version still hold the values they were read
+        with; a document another writer changed meanwhile (a summary or a
+        genre stored) is left for the next run instead of being reverted.
+        """
+        invalid_collection = self.db[f"{self.collection.name}_invalid"]
+        normalized = 0
+        invalid = 0
+        batch = []
+        invalid_batch = []
+        written = 0
+
+        def flush():
+            nonlocal written
+            if batch:
+                written += self.collection.bulk_write(batch, ordered=False).matched_count
+                batch.clear()
+            if invalid_batch:
+                invalid_collection.bulk_write(
+                    [ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in invalid_batch], ordered=False
+                )
+                self.collection.delete_many({
+                    "_id": {"$in": [doc["_id"] for doc in invalid_batch]},
+                    "cache_version": {"$ne": SCHEMA_VERSION},
+                })
+                invalid_batch.clear()
+
+        cursor = self.collection.find({"cache_version": {"$ne": SCHEMA_VERSION}})
+        for doc in cursor:
+            try:
+                fixed = normalize_news_document(doc)
+            except ValueError as e:
+                invalid_batch.append(dict(doc, invalid_reason=str(e)))
+                invalid += 1
+            else:
+                changed = {key: value for key, value in fixed.items()
+                           if key != "_id" and (key not in doc or doc[key] != value)}
+                dropped = {key: "" for key in doc if key not in fixed and key != "_id"}
+                update = {"$set": changed}
+                if dropped:
+                    update["$unset"] = dropped
+                # Matches only while every written field is as it was read
+                fence = {"_id": doc["_id"], "cache_version": doc.get("cache_version")}
+                for key in changed:
+                    fence[key] = doc[key] if key in doc else {"$exists": False}
+                batch.append(UpdateOne(fence, update))
+                normalized += 1
+            if len(batch) + len(invalid_batch) >= batch_size:
+                flush()
+        flush()
+
+        if written or invalid:
+            self.stats.rebuild()
+
+        skipped = normalized - written
+        logger.info(f"[backfill] Normalized {written} documents, moved {invalid} invalid documents, "
+                    f"left {skipped} changed meanwhile for the next run")
+        return {"normalized": written, "skipped_changed": skipped, "invalid": invalid,
+                "schema_version": SCHEMA_VERSION}
+
+    def reclassify_genres(self, batch_size=500):
+        """
+        Re-run the genre classifier over the whole collection and write back
+        only the documents whose labels changed, in bulk.
+        """
+        projection = {"video_id": 1, "title": 1, "description": 1, "transcript": 1,
+                      "transcript_external": 1, "genre": 1, "genres": 1}
+        scanned = 0
+        changed = 0
+        distribution = {}
+
+        def flush(docs):
+            nonlocal changed
+            ops = []
+            # Classify the full text, not the inline preview
+            full_texts = self.transcript_store.get_many(
+                [doc["video_id"] for doc in docs if doc.get("transcript_external")]
+            )
+            for doc in docs:
+                if doc.get("video_id") in full_texts:
+                    doc["transcript"] = full_texts[doc["video_id"]]
+            for doc in docs:
+                classification = self.genre_classifier.classify_document(doc)
+                distribution[classification.primary] = distribution.get(classification.primary, 0) + 1
+                if doc.get("genre") != classification.primary or doc.get("genres") != classification.labels:
+                    ops.append(UpdateOne(
+                        {"_id": doc["_id"]},
+                        {"$set": {"genre": classification.primary, "genres": classification.labels}}
+                    ))
+            if ops:
+                self.collection.bulk_write(ops, ordered=False)
+                changed += len(ops)
+
+        docs = []
+        for doc in self.collection.find({}, projection):
+            docs.append(doc)
+            scanned += 1
+            if len(docs) >= batch_size:
+                flush(docs)
+                docs = []
+        flush(docs)
+
+        if changed:
+            self.stats.rebuild()
+
+        logger.info(f"[genre] Reclassified {scanned} documents, {changed} changed: {distribution}")
+        return {"scanned": scanned, "changed": changed, "genre_distribution": distribution}
+
+    def assign_story_ids(self, batch_size=500):
+        """
+        Compute signatures and story ids for transcripts inside the story
+        window that were cached before near-duplicate detection, oldest
+        first so every story is named after its earliest upload.
+        """
+        if self.story_index is None:
+            return {"error": "Story index not configured"}
+
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=self.story_index.window_hours)
+        query = {"minhash": None, "word_count": {"$gt": 0}, "cached_at": {"$gte": cutoff}}
+        projection = {"video_id": 1, "transcript": 1, "transcript_external": 1, "cached_at": 1}
+        scanned = 0
+        assigned = 0
+        duplicates = 0
+        ops = []
+
+        for doc in self.collection.find(query, projection).sort("cached_at", 1):
+            scanned += 1
+            fields = self.assign_story(doc["video_id"], self.transcript_store.load(doc))
+            if not fields:
+                continue
+            self.story_index.add(
+                doc["video_id"], fields["story_id"],
+                signature_from_binary(fields["minhash"]), doc.get("cached_at")
+            )
+            ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": fields}))
+            assigned += 1
+            if fields["story_id"] != doc["video_id"]:
+                duplicates += 1
+            if len(ops) >= batch_size:
+                self.collection.bulk_write(ops, ordered=False)
+                ops = []
+        if ops:
+            self.collection.bulk_write(ops, ordered=False)
+
+        logger.info(f"[story] Scanned {scanned} transcripts, assigned {assigned}, {duplicates} near-duplicates")
+        return {"scanned": scanned, "assigned": assigned, "duplicates": duplicates}
+
+    def build_semantic_index(self, sample_size=2000, batch_size=256):
+        """Fit the embedder if needed and embed every cached document"""
+        if self.semantic_index is None:
+            return {"error": "Semantic index not configured"}
+        return self.semantic_index.build(
+            self.collection, self.transcript_store, sample_size=sample_size, batch_size=batch_size
+        )
+
+    def externalize_transcripts(self, batch_size=500):
+        """
+        Move the inline transcripts of existing documents to the transcript
+        store and report the bytes saved in db.news.
+        """
+        query = {"transcript_external": {"$ne": True}}
+        projection = {"video_id": 1, "transcript": 1}
+        scanned = 0
+        moved = 0
+        inline_bytes_before = 0
+        inline_bytes_after = 0
+        stored_bytes = 0
+        ops = []
+
+        for doc in self.collection.find(query, projection):
+            scanned += 1
+            text = doc.get("transcript") or ""
+            if len(text) <= TRANSCRIPT_PREVIEW_CHARS or not doc.get("video_id"):
+                continue
+            stored = self.transcript_store.put(doc["video_id"], text)
+            preview = make_preview(text)
+            ops.append(UpdateOne(
+                {"_id": doc["_id"]},
+                {"$set": {"transcript": preview, "transcript_external": True}}
+            ))
+            moved += 1
+            inline_bytes_before += stored["raw_bytes"]
+            inline_bytes_after += len(preview.encode("utf-8"))
+            stored_bytes += stored["stored_bytes"]
+            if len(ops) >= batch_size:
+                self.collection.bulk_write(ops, ordered=False)
+                ops = []
+        if ops:
+            self.collection.bulk_write(ops, ordered=False)
+
+        logger.info(f"[transcripts] Moved {moved} of {scanned} transcripts out of line")
+        return {
+            "scanned": scanned,
+            "moved": moved,
+            "inline_bytes_before": inline_bytes_before,
+            "inline_bytes_after": inline_bytes_after,
+            "compressed_bytes": stored_bytes,
+            "news_bytes_saved": inline_bytes_before - inline_bytes_after,
+        }
+
     def get_cache_stats(self):
         """Get statistics about cached data"""
         try:
-            total_docs = self.collection.count_documents({})
-            
-            # Count by genre
-            pipeline = [
-                {"$group": {"_id": "$genre", "count": {"$sum": 1}}},
-                {"$sort": {"count": -1}}
-            ]
-            genre_stats = list(self.collection.aggregate(pipeline))
-            
-            # Recent cache entries (last 24 hours)
-            recent_cutoff = datetime.now(timezone.utc) - timedelta(hours=24)
-            recent_count = self.collection.count_documents({
-                "cached_at": {"$gte": recent_cutoff}
-            })
-            
-            # Count by channel
-            channel_pipeline = [
-                {"$group": {"_id": "$channel_id", "count": {"$sum": 1}, "channel_name": {"$first": "$channel_name"}}},
-                {"$sort": {"count": -1}}
-            ]
-            channel_stats = list(self.collection.aggregate(channel_pipeline))
+            overview = self.stats.get_global()
+            channel_stats = self.stats.get_channels()
             
             stats = {
-                "total_cached_videos": total_docs,
-                "recent_cache_entries": recent_count,
-                "genre_distribution": {item["_id"]: item["count"] for item in genre_stats},
-                "channel_distribution": {f"{item['_id']} ({item.get('channel_name', 'Unknown')})": item["count"] for item in channel_stats}
+                "total_cached_videos": overview["total_items"],
+                "recent_cache_entries": overview["recent_cached_items"],
+                "genre_distribution": self.stats.get_genres(),
+                "channel_distribution": {f"{item['channel_id']} ({item.get('channel_name') or 'Unknown'})": item["total_items"] for item in channel_stats},
+                "transcript_negotiation": self.language_negotiator.stats(),
+                "live_detection": self.content_filter.live_detector.stats()
             }
             
-            print(f"=== CACHE STATS ===")
-            print(f"Total cached videos: {stats['total_cached_videos']}")
-            print(f"Recent entries (24h): {stats['recent_cache_entries']}")
-            print(f"Genre distribution: {stats['genre_distribution']}")
-            print(f"Channel distribution: {stats['channel_distribution']}")
+            logger.debug(f"[stats] {stats['total_cached_videos']} cached videos, "
+                         f"{stats['recent_cache_entries']} in the last 24h")
             
             return stats
             
         except Exception as e:
-            print(f"Error getting cache stats: {e}")
+            logger.error(f"Error getting cache stats: {e}")
             return {}
 
 
@@ -1,33 +1,41 @@
 import requests
 from datetime import datetime, timedelta, timezone
-from youtube_transcript_api import YouTubeTranscriptApi
-from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound, VideoUnavailable
 import os
+import logging
 
 # Import the correct cacher class from cache_transcripts.py
-from Transcripts.cache_transcripts import EnhancedNewsTranscriptCacher
+from Transcripts.cache_transcripts import EnhancedNewsTranscriptCacher, YOUTUBE_API_URL
+from models.news_document import normalize_news_document
+from utils.feed_index import hot_feed_index
+from Transcripts.story_dedup import story_index
+from Transcripts.semantic_index import semantic_index
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Initialize with proper error handling
 def initialize_cacher():
     mongo_uri = os.getenv("MONGO_URI")
     if not mongo_uri:
         # Fallback to default local MongoDB
         mongo_uri = "mongodb://localhost:27017"
-        print("Warning: MONGO_URI not found, using default localhost")
+        logger.warning("Warning: MONGO_URI not found, using default localhost")
     
     try:
         cacher = EnhancedNewsTranscriptCacher(
             mongo_uri=mongo_uri,
-            database_name="NewsByte_AI", 
-            collection_name="news"
+            database_name=os.getenv("MONGO_DB_NAME", "NewsByte_AI"), 
+            collection_name="news",
+            feed_index=hot_feed_index,
+            story_index=story_index,
+            semantic_index=semantic_index
         )
-        print("Cache system initialized successfully")
+        logger.info("Cache system initialized successfully")
         return cacher
     except Exception as e:
-        print(f"Failed to initialize cache: {e}")
+        logger.error(f"Failed to initialize cache: {e}")
         return None
                     
 # Global cacher instance
@@ -47,7 +55,7 @@ def get_latest_news_with_caching(
     """
 
     if not cacher:
-        print("Cache system not available, falling back to direct fetch")
+        logger.warning("Cache system not available, falling back to direct fetch")
         return get_latest_news_direct(query, num_videos_to_fetch, minutes_ago, channel_id)
         
     try:
@@ -64,8 +72,7 @@ def get_latest_news_with_caching(
         return results
         
     except Exception as e:
-        print(f"Cache system failed: {e}")
-        print("Falling back to direct fetch...")
+        logger.warning(f"Cache system failed: {e}, falling back to direct fetch")
         return get_latest_news_direct(query, num_videos_to_fetch, minutes_ago, channel_id)
 
 def get_latest_news_direct(
@@ -83,7 +90,7 @@ def get_latest_news_direct(
     if not API_KEY:
         raise ValueError("Missing YouTube API Key. Check your .env file.")
     
-    print("Using direct fetch (no caching)")
+    logger.info("Using direct fetch (no caching)")
     
     time_threshold = datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)
     published_after = time_threshold.isoformat(timespec="seconds").replace("+00:00", "Z")
@@ -101,10 +108,10 @@ def get_latest_news_direct(
     if channel_id:
         params["channelId"] = channel_id
 
-    search_url = "https://www.googleapis.com/youtube/v3/search"
+    search_url = f"{YOUTUBE_API_URL}/search"
     resp = requests.get(search_url, params=params)
     if resp.status_code != 200:
-        print(f"[search] failed: {resp.status_code}")
+        logger.warning(f"[search] failed: {resp.status_code}")
         return []
 
     data = resp.json()
@@ -139,12 +146,16 @@ def get_latest_news_direct(
             "genre": "general",  # Default genre
             "transcript": "Transcript not available (direct mode)",
             "transcript_language": "none",
-            "cached_at": datetime.utcnow(),  # Add timestamp
+            "word_count": 0,
+            "cached_at": datetime.now(timezone.utc),  # Add timestamp
             "source": "direct_fetch"  # Mark as direct fetch
         }
-        results.append(result)
+        try:
+            results.append(normalize_news_document(result))
+        except ValueError as e:
+            logger.warning(f"[direct] skipping invalid item {video_id}: {e}")
         
-    print(f"Direct fetch retrieved {len(results)} items with all required fields")
+    logger.info(f"Direct fetch retrieved {len(results)} items with all required fields")
     return results
 
 def get_cache_stats():
@@ -160,15 +171,85 @@ def get_cache_stats():
 def cleanup_cache(days_old=7):
     """Clean up old cache entries"""
     if not cacher:
-        print("Cache not available for cleanup")
+        logger.warning("Cache not available for cleanup")
         return 0
     
     try:
         return cacher.cleanup_old_cache(days_old=days_old)
     except Exception as e:
-        print(f"Cache cleanup failed: {e}")
+        logger.error(f"Cache cleanup failed: {e}")
         return 0
 
+def backfill_news_schema(batch_size=500):
+    """Normalize cached documents written before the current schema version"""
+    if not cacher:
+        return {"error": "Cache not available"}
+    
+    try:
+        return cacher.backfill_schema(batch_size=batch_size)
+    except Exception as e:
+        return {"error": f"Backfill failed: {e}"}
+
+def reclassify_genres(batch_size=500):
+    """Re-run genre detection over every cached document"""
+    if not cacher:
+        return {"error": "Cache not available"}
+    
+    try:
+        return cacher.reclassify_genres(batch_size=batch_size)
+    except Exception as e:
+        return {"error": f"Reclassification failed: {e}"}
+
+def assign_story_ids(batch_size=500):
+    """Detect near-duplicate stories among transcripts cached before detection existed"""
+    if not cacher:
+        return {"error": "Cache not available"}
+    
+    try:
+        return cacher.assign_story_ids(batch_size=batch_size)
+    except Exception as e:
+        return {"error": f"Story assignment failed: {e}"}
+
+def build_semantic_index(sample_size=2000, batch_size=256):
+    """Embed every cached document for semantic search, fitting the embedder if needed"""
+    if not cacher:
+        return {"error": "Cache not available"}
+    
+    try:
+        return cacher.build_semantic_index(sample_size=sample_size, batch_size=batch_size)
+    except Exception as e:
+        return {"error": f"Semantic index build failed: {e}"}
+
+def get_negative_cache_stats():
+    """Stored rejections by reason and the crawl work they saved"""
+    if not cacher:
+        return {"error": "Cache not available"}
+    
+    try:
+        return cacher.negative_cache.stats()
+    except Exception as e:
+        return {"error": f"Failed to get negative cache stats: {e}"}
+
+def clear_negative_cache(reason=None):
+    """Forget stored rejections (all, or those of one reason) so they are re-checked"""
+    if not cacher:
+        return {"error": "Cache not available"}
+    
+    try:
+        return {"deleted": cacher.negative_cache.clear(reason)}
+    except Exception as e:
+        return {"error": f"Failed to clear negative cache: {e}"}
+
+def externalize_transcripts(batch_size=500):
+    """Move inline transcripts of cached documents to the compressed transcript store"""
+    if not cacher:
+        return {"error": "Cache not available"}
+    
+    try:
+        return cacher.externalize_transcripts(batch_size=batch_size)
+    except Exception as e:
+        return {"error": f"Moving transcripts failed: {e}"}
+
 def force_refresh_cache(query="NDTV latest news", num_videos=5, channel_id="UC6RJ7-PaXg6TIH2BzZfTV7w"):
     """Force refresh cache for testing"""
     return get_latest_news_with_caching(
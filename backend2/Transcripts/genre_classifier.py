@@ -0,0 +1,125 @@
+# genre_classifier.py
+import re
+from collections import defaultdict
+
+# Weighted keyword table. Ambiguous short tokens ('cm', 'pm', 'ai') only match
+# as whole words and carry less weight than unambiguous terms.
+GENRE_KEYWORDS = {
+    'politics': {
+        'election': 2.0, 'elections': 2.0, 'minister': 2.0, 'parliament': 2.0,
+        'bjp': 2.0, 'congress': 1.5, 'lok sabha': 2.0, 'rajya sabha': 2.0,
+        'opposition': 1.0, 'government': 1.0, 'prime minister': 2.0,
+        'chief minister': 2.0, 'cm': 0.5, 'pm': 0.5, 'mla': 1.5, 'mp': 0.5,
+        'vote': 1.0, 'voters': 1.5, 'campaign': 1.0, 'policy': 1.0,
+        'चुनाव': 2.0, 'मंत्री': 2.0, 'सरकार': 1.0, 'संसद': 2.0,
+    },
+    'sports': {
+        'match': 1.5, 'team': 1.0, 'player': 1.5, 'players': 1.5,
+        'tournament': 2.0, 'cricket': 2.0, 'football': 2.0, 'wicket': 2.0,
+        'innings': 2.0, 'goal': 1.0, 'olympics': 2.0, 'ipl': 2.0,
+        'world cup': 2.0, 'coach': 1.0, 'stadium': 1.0, 'medal': 1.5,
+        'क्रिकेट': 2.0, 'मैच': 1.5, 'खिलाड़ी': 1.5,
+    },
+    'technology': {
+        'ai': 1.0, 'artificial intelligence': 2.0, 'technology': 2.0,
+        'smartphone': 2.0, 'internet': 1.5, 'software': 1.5, 'startup': 1.0,
+        'chip': 1.0, 'semiconductor': 2.0, 'cyber': 1.5, 'app': 0.5,
+        'iphone': 2.0, 'google': 1.0, 'satellite': 1.0, 'isro': 1.5,
+        'तकनीक': 2.0,
+    },
+    'entertainment': {
+        'movie': 2.0, 'film': 2.0, 'actor': 2.0, 'actress': 2.0,
+        'celebrity': 2.0, 'music': 1.0, 'bollywood': 2.0, 'box office': 2.0,
+        'trailer': 1.5, 'singer': 1.5, 'web series': 2.0,
+        'फिल्म': 2.0, 'अभिनेता': 2.0,
+    },
+    'crime': {
+        'attack': 1.0, 'murder': 2.0, 'crime': 2.0, 'terror': 2.0,
+        'terrorist': 2.0, 'raid': 1.5, 'arrested': 2.0, 'police': 1.0,
+        'accused': 1.5, 'fir': 1.5, 'shot dead': 2.0, 'robbery': 2.0,
+        'हत्या': 2.0, 'पुलिस': 1.0, 'गिरफ्तार': 2.0,
+    },
+}
+
+# Word characters including Devanagari vowel signs, which \w does not cover
+_WORD_CHARS = r'\w\u0900-\u097F'
+
+
+class GenreClassification:
+    """Scored genres of one document"""
+
+    __slots__ = ("primary", "labels", "scores")
+
+    def __init__(self, primary, labels, scores):
+        self.primary = primary  # single genre kept in the `genre` field
+        self.labels = labels    # every genre above the threshold, best first
+        self.scores = scores    # genre -> score
+
+    def to_dict(self):
+        return {"genre": self.primary, "genres": self.labels, "genre_scores": self.scores}
+
+
+class GenreClassifier:
+    """
+    Multi-label genre classifier over a weighted keyword table.
+
+    All keywords are compiled into one case-insensitive alternation with
+    Unicode word boundaries, so each document is scanned once regardless of
+    the number of keywords. Title matches count double.
+    """
+
+    def __init__(self, keywords=GENRE_KEYWORDS, min_score=3.0, secondary_ratio=0.5, title_weight=2.0):
+        self.min_score = min_score
+        self.secondary_ratio = secondary_ratio
+        self.title_weight = title_weight
+
+        self._weights = defaultdict(list)  # keyword -> [(genre, weight)]
+        for genre, table in keywords.items():
+            for keyword, weight in table.items():
+                self._weights[keyword.lower()].append((genre, weight))
+
+        # Longest first so 'prime minister' wins over 'minister'
+        alternation = '|'.join(re.escape(keyword) for keyword in sorted(self._weights, key=len, reverse=True))
+        self._pattern = re.compile(
+            rf'(?<![{_WORD_CHARS}])(?:{alternation})(?![{_WORD_CHARS}])',
+            re.IGNORECASE
+        )
+
+    def score(self, text, title=""):
+        scores = defaultdict(float)
+        for source, multiplier in ((text, 1.0), (title, self.title_weight)):
+            if not source:
+                continue
+            for match in self._pattern.finditer(source):
+                for genre, weight in self._weights[match.group(0).lower()]:
+                    scores[genre] += weight * multiplier
+        return dict(scores)
+
+    def classify(self, text, title=""):
+        scores = self.score(text, title)
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        if not ranked or ranked[0][1] < self.min_score:
+            return GenreClassification('general', ['general'], {g: round(s, 2) for g, s in ranked})
+
+        top_score = ranked[0][1]
+        labels = [genre for genre, genre_score in ranked
+                  if genre_score >= self.min_score and genre_score >= top_score * self.secondary_ratio]
+        return GenreClassification(labels[0], labels, {g: round(s, 2) for g, s in ranked})
+
+    def classify_document(self, doc):
+        """
+        Classify a news document by its transcript (its description when the
+        transcript is a placeholder) and title.
+        """
+        return self.classify(_classifiable_text(doc), doc.get("title", ""))
+
+
+# Placeholder transcripts written for videos without captions
+_PLACEHOLDER_PREFIXES = ("No meaningful transcript", "No transcript available", "Transcript not available")
+
+
+def _classifiable_text(doc):
+    transcript = doc.get("transcript") or ""
+    if transcript.startswith(_PLACEHOLDER_PREFIXES):
+        return doc.get("description") or ""
+    return transcript
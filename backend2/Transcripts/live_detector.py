@@ -0,0 +1,114 @@
+# live_detector.py
+import re
+from bisect import bisect_right
+
+# Phrases marking live news in a title; the description is only checked
+# for LIVE_DESCRIPTION_PHRASES. Entries are regex fragments.
+LIVE_TITLE_PHRASES = [
+    r'live(?:news|stream|updates?)?', r'breaking(?:news)?', r'streaming',
+    r'press conference', r'press meet',
+    r'पत्रकार सम्मेलन', r'प्रेस कॉन्फ्रेंस',  # Hindi for press conference
+    r'सीधा.*?प्रसारण',  # Hindi for live broadcast
+    r'लाइव',
+]
+LIVE_DESCRIPTION_PHRASES = [
+    r'live', r'streaming', r'press conference', r'press meet',
+    r'सीधा.*?प्रसारण', r'लाइव',
+]
+
+# snippet.liveBroadcastContent of search results: "live" and "upcoming"
+# are streams (or premieres) with no finished transcript, "none" is a
+# regular upload or a stream that has ended
+LIVE_BROADCAST_STATES = {"live": True, "upcoming": True, "none": False}
+
+# \b treats Devanagari vowel signs as non-word characters, so "सीधा" would
+# never end at a boundary; these lookarounds count them as part of words
+_WORD_START = r'(?<![\w\u0900-\u097F])'
+_WORD_END = r'(?![\w\u0900-\u097F])'
+
+
+def _combined_pattern(phrases):
+    return re.compile(_WORD_START + '(?:' + '|'.join(phrases) + ')' + _WORD_END, re.IGNORECASE)
+
+
+class LiveDetector:
+    """
+    Decides which search results are live news.
+
+    The YouTube search snippet already says whether a video is a live or
+    upcoming broadcast (liveBroadcastContent), which settles nearly every
+    item without looking at its text. Items without that field fall back
+    to one precompiled pattern per field: the titles (and descriptions) of
+    the whole page are joined with newlines and scanned once, and match
+    positions are mapped back to their items. `.` never crosses the
+    newlines, so a phrase cannot span two items.
+    """
+
+    def __init__(self, title_phrases=LIVE_TITLE_PHRASES, description_phrases=LIVE_DESCRIPTION_PHRASES,
+                 trust_broadcast_status=True):
+        self.title_pattern = _combined_pattern(title_phrases)
+        self.description_pattern = _combined_pattern(description_phrases)
+        self.trust_broadcast_status = trust_broadcast_status
+        self.decided_by_status = 0
+        self.decided_by_pattern = 0
+
+    def _matching(self, pattern, texts):
+        """Indexes of the texts the pattern matches, with one scan over all of them"""
+        if not texts:
+            return set()
+        starts, position = [], 0
+        for text in texts:
+            starts.append(position)
+            position += len(text) + 1
+        joined = '\n'.join(texts)
+        return {bisect_right(starts, match.start()) - 1 for match in pattern.finditer(joined)}
+
+    def classify(self, titles, descriptions=None):
+        """Live flag of every (title, description) pair, by their text alone"""
+        titles = [title.replace('\n', ' ') for title in titles]
+        live = self._matching(self.title_pattern, titles)
+        if descriptions:
+            # Descriptions only matter for titles that did not match already
+            rest = [i for i in range(len(titles)) if i not in live and descriptions[i]]
+            matched = self._matching(self.description_pattern, [descriptions[i].replace('\n', ' ') for i in rest])
+            live.update(rest[i] for i in matched)
+        return [i in live for i in range(len(titles))]
+
+    def classify_page(self, items):
+        """
+        {video_id: is_live} for a page of search results. The broadcast
+        status decides wherever the snippet has it; the rest go through
+        `classify` together.
+        """
+        result = {}
+        undecided = []
+        for item in items:
+            video_id = item.get("id", {}).get("videoId")
+            if not video_id:
+                continue
+            snippet = item.get("snippet", {})
+            status = LIVE_BROADCAST_STATES.get(snippet.get("liveBroadcastContent"))
+            if status is not None and (status or self.trust_broadcast_status):
+                result[video_id] = status
+            else:
+                undecided.append((video_id, snippet))
+
+        self.decided_by_status += len(result)
+        self.decided_by_pattern += len(undecided)
+        if undecided:
+            flags = self.classify(
+                [snippet.get("title", "") for _, snippet in undecided],
+                [snippet.get("description", "") for _, snippet in undecided],
+            )
+            result.update((video_id, flag) for (video_id, _), flag in zip(undecided, flags))
+        return result
+
+    def is_live(self, title, description=""):
+        return self.classify([title], [description])[0]
+
+    def stats(self):
+        return {
+            "decided_by_broadcast_status": self.decided_by_status,
+            "decided_by_pattern": self.decided_by_pattern,
+            "trust_broadcast_status": self.trust_broadcast_status,
+        }
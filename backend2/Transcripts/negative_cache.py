@@ -0,0 +1,117 @@
+# negative_cache.py
+import logging
+from datetime import datetime, timedelta, timezone
+
+logger = logging.getLogger(__name__)
+
+# How long a rejection is trusted before the video is looked at again.
+# None means never: a short stays a short.
+REJECTION_TTL_HOURS = {
+    "short": None,
+    "live": 6,                    # becomes a regular upload once the stream ends
+    "transcripts_disabled": 24,
+    "no_transcript": 6,           # auto-generated captions often appear later
+    "unavailable": 24 * 7,
+    "music": 24 * 30,
+    "too_short": 24 * 30,
+}
+
+# Requests a crawl would spend before reaching each rejection again:
+# the contentDetails duration check, the transcript listing and the fetch
+REQUESTS_SAVED = {
+    "short": 1,
+    "live": 0,
+    "transcripts_disabled": 2,
+    "no_transcript": 2,
+    "unavailable": 2,
+    "music": 3,
+    "too_short": 3,
+}
+
+
+class NegativeCache:
+    """
+    Videos the ingest loop rejected, with a reason code and an expiry.
+
+    One document per video in the news_rejections collection; a TTL index
+    on expires_at lets MongoDB delete expired rejections, and documents
+    without expires_at (permanent rejections) are never deleted. Lookups
+    also check expires_at since the TTL monitor only runs once a minute.
+    """
+
+    def __init__(self, db, collection_name="news_rejections", ttl_hours=REJECTION_TTL_HOURS):
+        self.collection = db[collection_name]
+        self.ttl_hours = ttl_hours
+        self.skipped = {}        # reason -> videos skipped since start
+        self.requests_saved = 0
+        try:
+            self.collection.create_index("expires_at", expireAfterSeconds=0)
+            self.collection.create_index("reason")
+        except Exception as e:
+            logger.warning(f"[negative] could not create indexes: {e}")
+
+    def record(self, video_id, reason, channel_id=None, detail=""):
+        if reason not in self.ttl_hours:
+            raise ValueError(f"Unknown rejection reason: {reason}")
+        now = datetime.now(timezone.utc)
+        ttl = self.ttl_hours[reason]
+        update = {
+            "$set": {
+                "reason": reason,
+                "channel_id": channel_id,
+                "detail": detail,
+                "rejected_at": now,
+            },
+            "$inc": {"times_rejected": 1},
+        }
+        if ttl is None:
+            update["$unset"] = {"expires_at": ""}
+        else:
+            update["$set"]["expires_at"] = now + timedelta(hours=ttl)
+        try:
+            self.collection.update_one({"_id": video_id}, update, upsert=True)
+        except Exception as e:
+            logger.error(f"[negative] error recording {video_id} ({reason}): {e}")
+
+    def lookup_many(self, video_ids):
+        """{video_id: reason} of the unexpired rejections among video_ids, one query"""
+        if not video_ids:
+            return {}
+        now = datetime.now(timezone.utc)
+        try:
+            cursor = self.collection.find(
+                {
+                    "_id": {"$in": list(video_ids)},
+                    "$or": [{"expires_at": {"$exists": False}}, {"expires_at": {"$gt": now}}],
+                },
+                {"reason": 1}
+            )
+            return {doc["_id"]: doc["reason"] for doc in cursor}
+        except Exception as e:
+            logger.error(f"[negative] error looking up rejections: {e}")
+            return {}
+
+    def record_skip(self, reason):
+        """Count a video a crawl skipped thanks to a stored rejection"""
+        self.skipped[reason] = self.skipped.get(reason, 0) + 1
+        self.requests_saved += REQUESTS_SAVED.get(reason, 0)
+
+    def stats(self):
+        try:
+            by_reason = {
+                doc["_id"]: doc["count"]
+                for doc in self.collection.aggregate([{"$group": {"_id": "$reason", "count": {"$sum": 1}}}])
+            }
+        except Exception as e:
+            logger.error(f"[negative] error reading stats: {e}")
+            by_reason = {}
+        return {
+            "rejections_by_reason": by_reason,
+            "ttl_hours": self.ttl_hours,
+            "skipped_since_start": dict(self.skipped),
+            "requests_saved_since_start": self.requests_saved,
+        }
+
+    def clear(self, reason=None):
+        query = {"reason": reason} if reason else {}
+        return self.collection.delete_many(query).deleted_count
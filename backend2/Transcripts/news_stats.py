@@ -0,0 +1,383 @@
+# news_stats.py
+import logging
+import secrets
+from datetime import datetime, timedelta, timezone
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+
+def _hour_bucket(dt):
+    """Bucket key for a UTC datetime (naive or aware), e.g. '2025081713'"""
+    if not isinstance(dt, datetime):
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc)
+    return dt.strftime("%Y%m%d%H")
+
+
+def _has_summary(doc):
+    return doc.get("summary") is not None
+
+
+def _has_transcript(doc):
+    return doc.get("transcript") is not None
+
+
+class NewsStatsTracker:
+    """
+    Incrementally maintained counters for the news collection.
+
+    One document per channel ("channel:<id>"), one per genre ("genre:<name>")
+    and one global document ("global") live in the news_stats collection.
+    Every write path reports the document before and after the write and the
+    difference is applied with atomic $inc updates, so the read endpoints
+    never have to scan db.news.
+
+    Time-windowed counts ("last 24h") are kept as hourly buckets inside each
+    document and summed on read. Only buckets within BUCKET_RETENTION_HOURS
+    are counted; every write also unsets the day of buckets just past it,
+    so reads never write.
+    """
+
+    GLOBAL_ID = "global"
+    SAMPLE_TITLES = 3
+    BUCKET_RETENTION_HOURS = 48
+    PRUNE_SWEEP_HOURS = 24
+    REBUILD_LEASE = "stats:rebuild"
+
+    def __init__(self, db, collection_name="news_stats", news_collection_name="news"):
+        self.stats = db[collection_name]
+        self.news = db[news_collection_name]
+
+    # ------------------------------------------------------------------ writes
+
+    def _retention_cutoff(self, now):
+        return _hour_bucket(now - timedelta(hours=self.BUCKET_RETENTION_HOURS))
+
+    def _contribution(self, doc, cutoff):
+        """Counters a single news document adds to its stats documents"""
+        if not doc:
+            return {}
+
+        counters = {
+            "total_items": 1,
+            "items_with_summaries": 1 if _has_summary(doc) else 0,
+            "items_with_transcripts": 1 if _has_transcript(doc) else 0,
+        }
+        # Buckets past the retention window are never counted (nor uncounted)
+        cached_bucket = _hour_bucket(doc.get("cached_at"))
+        if cached_bucket and cached_bucket >= cutoff:
+            counters[f"hourly_cached.{cached_bucket}"] = 1
+        if _has_summary(doc):
+            summary_bucket = _hour_bucket(doc.get("summary_created_at"))
+            if summary_bucket and summary_bucket >= cutoff:
+                counters[f"hourly_summaries.{summary_bucket}"] = 1
+        return counters
+
+    def _expired_buckets(self, now):
+        """$unset of the buckets of the day just past the retention window"""
+        expired = {}
+        for hours in range(self.BUCKET_RETENTION_HOURS + 1, self.BUCKET_RETENTION_HOURS + self.PRUNE_SWEEP_HOURS + 1):
+            bucket = _hour_bucket(now - timedelta(hours=hours))
+            expired[f"hourly_cached.{bucket}"] = ""
+            expired[f"hourly_summaries.{bucket}"] = ""
+        return expired
+
+    def _keys_for(self, doc):
+        if not doc:
+            return []
+        return [
+            self.GLOBAL_ID,
+            f"channel:{doc.get('channel_id')}",
+            f"genre:{doc.get('genre') or 'general'}",
+        ]
+
+    def apply_change(self, before, after):
+        """
+        Apply the counter delta of replacing `before` with `after`.
+        Either side may be None (insert / delete).
+        """
+        try:
+            now = datetime.now(timezone.utc)
+            cutoff = self._retention_cutoff(now)
+            deltas = {}
+            for doc, sign in ((before, -1), (after, 1)):
+                contribution = self._contribution(doc, cutoff)
+                for key in self._keys_for(doc):
+                    target = deltas.setdefault(key, {})
+                    for field, value in contribution.items():
+                        target[field] = target.get(field, 0) + sign * value
+
+            after_keys = set(self._keys_for(after))
+            expired = self._expired_buckets(now)
+            ops = []
+            for key, inc in deltas.items():
+                inc = {field: value for field, value in inc.items() if value}
+                update = {}
+                if inc:
+                    update["$inc"] = inc
+                if key in after_keys:
+                    update.update(self._metadata_update(key, before, after))
+                if update:
+                    update["$unset"] = expired
+                    ops.append(UpdateOne({"_id": key}, update, upsert=True))
+
+            if ops:
+                self.stats.bulk_write(ops, ordered=False)
+            return True
+        except Exception as e:
+            logger.error(f"[stats] error applying stats change: {e}")
+            return False
+
+    def _metadata_update(self, key, before, after):
+        """Non-counter fields refreshed from the newest write"""
+        if not after:
+            return {}
+
+        update = {}
+        set_fields = {}
+        if key.startswith("channel:"):
+            set_fields["kind"] = "channel"
+            set_fields["channel_id"] = after.get("channel_id")
+            if after.get("channel_name"):
+                set_fields["channel_name"] = after["channel_name"]
+            if after.get("channel_url"):
+                set_fields["channel_url"] = after["channel_url"]
+            # Only documents new to the channel join the samples; re-caching or
+            # summarizing a video must not push its title again
+            new_here = not before or before.get("channel_id") != after.get("channel_id")
+            if after.get("title") and new_here:
+                update["$push"] = {"sample_titles": {"$each": [after["title"]], "$slice": -self.SAMPLE_TITLES}}
+        elif key.startswith("genre:"):
+            set_fields["kind"] = "genre"
+            set_fields["genre"] = after.get("genre") or "general"
+        else:
+            set_fields["kind"] = "global"
+
+        if set_fields:
+            update["$set"] = set_fields
+
+        max_fields = {}
+        if isinstance(after.get("cached_at"), datetime):
+            max_fields["latest_cached_at"] = after["cached_at"]
+        if _has_summary(after) and isinstance(after.get("summary_created_at"), datetime):
+            max_fields["latest_summary_at"] = after["summary_created_at"]
+        if max_fields:
+            update["$max"] = max_fields
+        return update
+
+    # ------------------------------------------------------------------ reads
+
+    def _recent(self, buckets, hours=24, now=None):
+        if not buckets:
+            return 0
+        now = now or datetime.now(timezone.utc)
+        cutoff = _hour_bucket(now - timedelta(hours=hours - 1))
+        return sum(count for bucket, count in buckets.items() if bucket >= cutoff)
+
+    def _format(self, doc, now=None):
+        return {
+            "total_items": doc.get("total_items", 0),
+            "items_with_summaries": doc.get("items_with_summaries", 0),
+            "items_with_transcripts": doc.get("items_with_transcripts", 0),
+            "recent_cached_items": self._recent(doc.get("hourly_cached"), now=now),
+            "recent_summaries": self._recent(doc.get("hourly_summaries"), now=now),
+            "latest_cached_at": doc.get("latest_cached_at"),
+            "latest_summary_at": doc.get("latest_summary_at"),
+        }
+
+    def get_global(self):
+        doc = self.stats.find_one({"_id": self.GLOBAL_ID}) or {"_id": self.GLOBAL_ID}
+        return self._format(doc)
+
+    def get_channels(self):
+        docs = list(self.stats.find({"kind": "channel", "total_items": {"$gt": 0}}))
+        now = datetime.now(timezone.utc)
+        channels = []
+        for doc in docs:
+            stat = self._format(doc, now=now)
+            stat.update({
+                "channel_id": doc.get("channel_id"),
+                "channel_name": doc.get("channel_name"),
+                "channel_url": doc.get("channel_url"),
+                "sample_titles": doc.get("sample_titles", []),
+            })
+            channels.append(stat)
+        channels.sort(key=lambda c: c["total_items"], reverse=True)
+        return channels
+
+    def get_genres(self):
+        docs = self.stats.find({"kind": "genre", "total_items": {"$gt": 0}})
+        genres = {doc.get("genre"): doc.get("total_items", 0) for doc in docs}
+        return dict(sorted(genres.items(), key=lambda g: g[1], reverse=True))
+
+    # ------------------------------------------------------------------ maintenance
+
+    def _aggregate(self, match=None, now=None):
+        """
+        Counters of the news documents matching `match`, per (channel, genre):
+        one $group over the matching documents for the totals and one over
+        the retention window for each kind of hourly bucket. Presence of a
+        summary or transcript is tested on the server, the text never leaves it.
+        """
+        match = match or {}
+        now = now or datetime.now(timezone.utc)
+        since = (now - timedelta(hours=self.BUCKET_RETENTION_HOURS)).replace(minute=0, second=0, microsecond=0)
+        has_summary = {"$ne": [{"$ifNull": ["$summary", None]}, None]}
+        has_transcript = {"$ne": [{"$ifNull": ["$transcript", None]}, None]}
+        group_id = {
+            "channel_id": "$channel_id",
+            "genre": {"$ifNull": [{"$cond": [{"$eq": ["$genre", ""]}, None, "$genre"]}, "general"]},
+        }
+
+        totals = self.news.aggregate([
+            {"$match": match},
+            {"$group": {
+                "_id": group_id,
+                "total_items": {"$sum": 1},
+                "items_with_summaries": {"$sum": {"$cond": [has_summary, 1, 0]}},
+                "items_with_transcripts": {"$sum": {"$cond": [has_transcript, 1, 0]}},
+                "latest_cached_at": {"$max": "$cached_at"},
+                "latest_summary_at": {"$max": {"$cond": [has_summary, "$summary_created_at", None]}},
+                "channel_name": {"$max": "$channel_name"},
+                "channel_url": {"$max": "$channel_url"},
+            }},
+        ])
+        buckets = {}
+        for field, window in (
+            ("hourly_cached", {"cached_at": {"$gte": since}}),
+            ("hourly_summaries", {"summary_created_at": {"$gte": since}, "summary": {"$ne": None}}),
+        ):
+            date_field = "$cached_at" if field == "hourly_cached" else "$summary_created_at"
+            buckets[field] = self.news.aggregate([
+                {"$match": {"$and": [match, window]}},
+                {"$group": {
+                    "_id": {**group_id, "bucket": {"$dateToString": {"format": "%Y%m%d%H", "date": date_field}}},
+                    "count": {"$sum": 1},
+                }},
+            ])
+        return list(totals), {field: list(rows) for field, rows in buckets.items()}
+
+    def _documents(self, totals, buckets):
+        """Stats documents (global, channel:*, genre:*) of aggregated rows"""
+        docs = {}
+
+        def targets(group):
+            channel_id, genre = group.get("channel_id"), group.get("genre") or "general"
+            for key, fields in (
+                (self.GLOBAL_ID, {"kind": "global"}),
+                (f"channel:{channel_id}", {"kind": "channel", "channel_id": channel_id}),
+                (f"genre:{genre}", {"kind": "genre", "genre": genre}),
+            ):
+                if key not in docs:
+                    docs[key] = {"_id": key, **fields, "total_items": 0, "items_with_summaries": 0,
+                                 "items_with_transcripts": 0, "hourly_cached": {}, "hourly_summaries": {}}
+                yield docs[key]
+
+        for row in totals:
+            for doc in targets(row["_id"]):
+                for field in ("total_items", "items_with_summaries", "items_with_transcripts"):
+                    doc[field] += row[field]
+                for field in ("latest_cached_at", "latest_summary_at"):
+                    value = row.get(field)
+                    if isinstance(value, datetime) and (doc.get(field) is None or value > doc[field]):
+                        doc[field] = value
+                if doc["kind"] == "channel":
+                    for field in ("channel_name", "channel_url"):
+                        if row.get(field):
+                            doc[field] = row[field]
+        for field, rows in buckets.items():
+            for row in rows:
+                bucket = row["_id"]["bucket"]
+                for doc in targets(row["_id"]):
+                    doc[field][bucket] = doc[field].get(bucket, 0) + row["count"]
+        return docs
+
+    def rebuild(self):
+        """
+        Recompute every stats document from db.news into a temporary
+        collection and swap it in with renameCollection, so readers see
+        the old counters until the new ones are complete. Counter updates
+        written while it runs are lost. Only used on first boot and after
+        bulk changes, never on the read path.
+        """
+        try:
+            totals, buckets = self._aggregate()
+            docs = self._documents(totals, buckets)
+            docs.setdefault(self.GLOBAL_ID, {"_id": self.GLOBAL_ID, "kind": "global"})
+            for doc in docs.values():
+                if doc["kind"] == "channel":
+                    titles = self.news.find(
+                        {"channel_id": doc["channel_id"], "title": {"$nin": [None, ""]}}, {"_id": 0, "title": 1}
+                    ).sort("cached_at", -1).limit(self.SAMPLE_TITLES)
+                    doc["sample_titles"] = [item["title"] for item in titles][::-1]
+
+            temp = self.stats.database[f"{self.stats.name}_rebuild_{secrets.token_hex(4)}"]
+            temp.insert_many(list(docs.values()))
+            temp.create_index("kind")
+            temp.rename(self.stats.name, dropTarget=True)
+            count = docs[self.GLOBAL_ID].get("total_items", 0)
+            logger.info(f"[stats] Rebuilt stats from {count} news documents")
+            return count
+        except Exception as e:
+            logger.error(f"[stats] error rebuilding stats: {e}")
+            return 0
+
+    def subtract(self, match, summaries_only=False):
+        """
+        Take the news documents matching `match` out of the counters; called
+        right before they are deleted (or, with summaries_only, before their
+        summaries are removed) instead of a full rebuild.
+        """
+        try:
+            totals, buckets = self._aggregate(match)
+            if summaries_only:
+                fields, buckets = ("items_with_summaries",), {"hourly_summaries": buckets["hourly_summaries"]}
+            else:
+                fields = ("total_items", "items_with_summaries", "items_with_transcripts")
+            ops = []
+            for key, doc in self._documents(totals, buckets).items():
+                inc = {field: -doc[field] for field in fields if doc[field]}
+                for field in buckets:
+                    for bucket, count in doc[field].items():
+                        inc[f"{field}.{bucket}"] = -count
+                if inc:
+                    ops.append(UpdateOne({"_id": key}, {"$inc": inc}))
+            if ops:
+                self.stats.bulk_write(ops, ordered=False)
+            return True
+        except Exception as e:
+            logger.error(f"[stats] error subtracting documents: {e}")
+            return False
+
+    def delete_channel(self, channel_id):
+        """Drop the (by then zeroed) stats document of a cleared channel"""
+        try:
+            self.stats.delete_one({"_id": f"channel:{channel_id}"})
+        except Exception as e:
+            logger.error(f"[stats] error deleting channel stats: {e}")
+
+    def ensure_initialized(self, leases=None):
+        """
+        Build the stats documents once if they do not exist yet. With a
+        LeaseManager only one of several workers starting together builds
+        them; the others start right away and see the counters once the
+        build is swapped in.
+        """
+        try:
+            self.stats.create_index("kind")
+            if self.stats.find_one({"_id": self.GLOBAL_ID}, {"_id": 1}):
+                return
+            if leases is None:
+                self.rebuild()
+                return
+            with leases.hold(self.REBUILD_LEASE) as lease:
+                if lease is None:
+                    logger.info("[stats] another worker is building the stats")
+                    return
+                # Another worker may have finished while we were checking
+                if not self.stats.find_one({"_id": self.GLOBAL_ID}, {"_id": 1}):
+                    self.rebuild()
+        except Exception as e:
+            logger.error(f"[stats] error initializing stats: {e}")
@@ -0,0 +1,367 @@
+# sentence_segmenter.py
+import re
+
+import numpy as np
+
+# Characters ending a sentence, and closers that may follow them ("...end.")
+TERMINAL_CHARS = ".?!…।"
+CLOSING_CHARS = "\"')]”’"
+_TERMINALS = np.array([ord(c) for c in TERMINAL_CHARS], dtype=np.uint32)
+_CLOSERS = np.array([ord(c) for c in CLOSING_CHARS], dtype=np.uint32)
+_PAUSES = np.array([ord(c) for c in ",;:"], dtype=np.uint32)
+
+# A period ending one of these is not a sentence end
+_ABBREVIATION_RE = re.compile(r"(?:[A-Za-z]\.){2,}|(?:Mr|Mrs|Ms|Dr|St|Jr|Sr|Prof|Gen|Gov|Sen|Rep|Lt|Col|No|vs|etc)\.")
+
+# Spoken discourse markers that open a new sentence, with the evidence they add.
+# Strong markers nearly always start one; weak ones only with a pause behind them.
+DISCOURSE_MARKERS = {
+    "in other news": 0.8, "moving on": 0.8, "and now": 0.7, "meanwhile": 0.7,
+    "however": 0.7, "on the other hand": 0.7, "at the same time": 0.6,
+    "first of all": 0.6, "coming to": 0.6, "let's": 0.5, "let us": 0.5,
+    "according to": 0.5, "finally": 0.6, "also": 0.35, "so": 0.35, "now": 0.35,
+    "but": 0.35, "okay": 0.45, "well": 0.3, "today": 0.3,
+    "अब": 0.5, "लेकिन": 0.5, "तो": 0.35, "वहीं": 0.6, "इसके अलावा": 0.7,
+}
+
+# Polynomial word hashes (mod 2^64) and the multiplier folding them into n-gram keys
+_HASH_BASE = np.uint64(0x100000001B3)
+_HASH_INVERSE = np.uint64(pow(0x100000001B3, -1, 1 << 64))
+_NGRAM_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+# Evidence weights of the other boundary signals
+TERMINAL_WEIGHT = 1.0
+CLAUSE_WEIGHT = 0.25        # comma, semicolon or colon before the word
+CAPTION_BREAK_WEIGHT = 0.15  # the word starts a new caption segment
+PAUSE_WEIGHT = 0.85         # a pause reaching the document's pause threshold, less below it
+
+
+def _grouped_median(values, groups, count, default):
+    """Median of values per group id in [0, count), default for empty groups"""
+    medians = np.full(count, default, dtype=np.float64)
+    if len(values):
+        order = np.lexsort((values, groups))
+        values, groups = values[order], groups[order]
+        present, first, sizes = np.unique(groups, return_index=True, return_counts=True)
+        medians[present] = values[first + sizes // 2]
+    return medians
+
+
+def _tokenize(text):
+    """Code points of a text and the (start, end) offsets of its words"""
+    points = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    space = (points <= 32) | (points == 0xA0) | (points == 0x3000)
+    word_starts = np.flatnonzero(~space & np.r_[True, space[:-1]])
+    word_ends = np.flatnonzero(~space & np.r_[space[1:], True]) + 1
+    return points, word_starts, word_ends
+
+
+def _word_hashes(points, word_starts, word_ends):
+    """Case-insensitive hash of every word, trailing , ; : . ? ! ignored"""
+    with np.errstate(over="ignore"):
+        folded = points.astype(np.uint64)
+        upper = (points >= 65) & (points <= 90)
+        folded[upper] += np.uint64(32)
+
+        powers = np.full(len(points) + 1, _HASH_BASE, dtype=np.uint64)
+        powers[0] = 1
+        np.cumprod(powers, out=powers)
+        inverses = np.full(len(points) + 1, _HASH_INVERSE, dtype=np.uint64)
+        inverses[0] = 1
+        np.cumprod(inverses, out=inverses)
+        prefix = np.zeros(len(points) + 1, dtype=np.uint64)
+        np.cumsum(folded * powers[:-1], out=prefix[1:])
+
+        trailing = np.isin(points[word_ends - 1], np.array([ord(c) for c in ",;:.?!"], dtype=np.uint32))
+        ends = np.where(trailing & (word_ends - 1 > word_starts), word_ends - 1, word_ends)
+        return (prefix[ends] - prefix[word_starts]) * inverses[word_starts]
+
+
+def _ngram_keys(hashes, n):
+    """Key of the n words starting at every word"""
+    with np.errstate(over="ignore"):
+        keys = hashes[:len(hashes) - n + 1].copy()
+        for i in range(1, n):
+            keys = keys * _NGRAM_MIX + hashes[i:len(hashes) - n + 1 + i]
+        return keys
+
+
+def _marker_table(markers):
+    """{n: (sorted keys, weights)} of the n-word markers"""
+    table = {}
+    for marker, weight in markers.items():
+        points, starts, ends = _tokenize(marker)
+        key = _ngram_keys(_word_hashes(points, starts, ends), len(starts))[0]
+        table.setdefault(len(starts), {})[int(key)] = weight
+    result = {}
+    for n, entries in table.items():
+        keys = np.array(sorted(entries), dtype=np.uint64)
+        result[n] = (keys, np.array([entries[int(key)] for key in keys]))
+    return result
+
+
+_MARKERS = _marker_table(DISCOURSE_MARKERS)
+
+
+class SentenceSegmenter:
+    """
+    Sentence boundaries for caption text, punctuated or not.
+
+    Auto-generated captions rarely have punctuation, so besides sentence
+    punctuation every gap between two words collects evidence from the
+    caption timings and the words themselves:
+
+      * a pause before the word's caption segment: the time between two
+        segment starts minus the time the previous segment's words take at
+        the video's median speaking rate (auto-caption durations overlap,
+        so their end times alone say little), or the explicit gap between
+        segments when durations are exact. It counts fully once it stands
+        out from the video's own timing noise, and never below
+        `pause_seconds`
+      * a caption segment starting at the word
+      * a discourse marker ("meanwhile", "in other news", "अब", ...) at the word
+      * a comma, semicolon or colon before the word
+
+    A gap becomes a boundary when its evidence reaches the document's
+    threshold: 1.0 for punctuated or timed transcripts, 0.7 for plain
+    unpunctuated text where markers are all there is. Sentences are kept
+    between `min_words` and `max_words`; an overlong run is cut at its
+    strongest gap.
+
+    Everything up to the final boundary pass is computed with numpy over
+    the whole batch at once (the texts are joined and scanned as one code
+    point array), so segmenting a batch costs a few passes over its
+    characters rather than Python work per word.
+    """
+
+    def __init__(self, min_words=4, max_words=40, pause_seconds=0.3):
+        self.min_words = min_words
+        self.max_words = max_words
+        self.pause_seconds = pause_seconds
+
+    # ------------------------------------------------------------ evidence
+
+    def _pause_evidence(self, segments, bases, word_starts, word_docs, evidence):
+        """Add caption break and pause evidence for the documents with timings"""
+        timed = [(doc, seg) for doc, seg in enumerate(segments or []) if seg is not None and len(seg)]
+        if not timed:
+            return np.zeros(len(bases), dtype=bool)
+
+        seg_docs = np.concatenate([np.full(len(seg), doc, dtype=np.int64) for doc, seg in timed])
+        seg_starts = np.concatenate([np.frombuffer(seg.starts, dtype=np.float32) for _, seg in timed]).astype(np.float64)
+        seg_durations = np.concatenate([np.frombuffer(seg.durations, dtype=np.float32) for _, seg in timed]).astype(np.float64)
+        seg_offsets = np.concatenate([np.frombuffer(seg.offsets, dtype=np.uint32) for _, seg in timed]).astype(np.int64)
+        seg_offsets += bases[seg_docs]
+
+        # Segment of every word, when that segment belongs to the word's document
+        word_segs = np.searchsorted(seg_offsets, word_starts, side="right") - 1
+        valid = word_segs >= 0
+        valid[valid] = seg_docs[word_segs[valid]] == word_docs[valid]
+        words_per_seg = np.bincount(word_segs[valid], minlength=len(seg_docs))
+
+        # Time between a segment and the next one of the same document
+        same_doc = np.r_[False, seg_docs[1:] == seg_docs[:-1]]
+        delta = np.r_[0.0, np.diff(seg_starts)]
+        prev_words = np.r_[0, words_per_seg[:-1]]
+        usable = same_doc & (delta > 0) & (prev_words > 0)
+
+        # Median speaking rate (words/second) of every document
+        rates = _grouped_median(prev_words[usable] / delta[usable], seg_docs[usable], len(bases), 2.5)
+        expected = prev_words / rates[seg_docs]
+        gap = seg_starts - np.r_[0.0, seg_starts[:-1] + seg_durations[:-1]]
+        pause = np.maximum(delta - expected, gap)
+
+        # A pause counts fully once it stands out from the document's timing
+        # noise (median + 6 MADs), and never below pause_seconds
+        center = _grouped_median(pause[usable], seg_docs[usable], len(bases), 0.0)
+        spread = _grouped_median(np.abs(pause - center[seg_docs])[usable], seg_docs[usable], len(bases), 0.0)
+        thresholds = np.maximum(center + 6 * spread, self.pause_seconds)[seg_docs]
+        pause_score = np.where(usable, np.clip(pause / thresholds, 0.0, 1.0), 0.0)
+        seg_evidence = CAPTION_BREAK_WEIGHT + PAUSE_WEIGHT * pause_score
+
+        # Evidence goes to the first word of each segment
+        starts_segment = valid & np.r_[True, word_segs[1:] != word_segs[:-1]]
+        evidence[starts_segment] += seg_evidence[word_segs[starts_segment]]
+
+        has_timing = np.zeros(len(bases), dtype=bool)
+        has_timing[[doc for doc, _ in timed]] = True
+        return has_timing
+
+    def _word_evidence(self, texts, segments):
+        joined = "\n".join(texts)
+        lengths = np.fromiter((len(text) + 1 for text in texts), dtype=np.int64, count=len(texts))
+        bases = np.r_[0, np.cumsum(lengths)[:-1]]
+
+        points, word_starts, word_ends = _tokenize(joined)
+        word_docs = np.searchsorted(bases, word_starts, side="right") - 1
+
+        # Evidence of a boundary right before each word
+        evidence = np.zeros(len(word_starts))
+        if len(word_starts) > 1:
+            last = points[word_ends[:-1] - 1]
+            before_last = points[np.maximum(word_ends[:-1] - 2, word_starts[:-1])]
+            terminal = np.isin(last, _TERMINALS) | (np.isin(last, _CLOSERS) & np.isin(before_last, _TERMINALS))
+            # Abbreviations are short words ending in a period, few enough to check one by one
+            short = np.flatnonzero(terminal & (last == ord(".")) & (word_ends[:-1] - word_starts[:-1] <= 6))
+            for i in short:
+                if _ABBREVIATION_RE.fullmatch(joined, word_starts[i], word_ends[i]):
+                    terminal[i] = False
+            evidence[1:] += np.where(terminal, TERMINAL_WEIGHT, np.where(np.isin(last, _PAUSES), CLAUSE_WEIGHT, 0.0))
+        else:
+            terminal = np.zeros(0, dtype=bool)
+
+        # Discourse markers, longest first, never spanning two documents
+        hashes = _word_hashes(points, word_starts, word_ends)
+        marked = np.zeros(len(word_starts), dtype=bool)
+        for n in sorted(_MARKERS, reverse=True):
+            if len(hashes) < n:
+                continue
+            keys, weights = _MARKERS[n]
+            ngrams = _ngram_keys(hashes, n)
+            slots = np.minimum(np.searchsorted(keys, ngrams), len(keys) - 1)
+            found = (keys[slots] == ngrams) & ~marked[:len(ngrams)]
+            found &= word_docs[:len(ngrams)] == word_docs[n - 1:]
+            evidence[:len(ngrams)][found] += weights[slots[found]]
+            marked[:len(ngrams)] |= found
+
+        has_timing = self._pause_evidence(segments, bases, word_starts, word_docs, evidence)
+
+        # Documents with sentence punctuation (one per 60 words) or timings need
+        # full evidence; plain unpunctuated text splits on markers alone
+        words = np.bincount(word_docs, minlength=len(texts))
+        terminals = np.bincount(word_docs[:-1][terminal], minlength=len(texts)) if len(terminal) else np.zeros(len(texts))
+        thresholds = np.where((terminals * 60 >= np.maximum(words, 1)) | has_timing, 1.0, 0.7)
+
+        # Documents always start a sentence
+        doc_starts = np.r_[True, word_docs[1:] != word_docs[:-1]] if len(word_docs) else np.zeros(0, dtype=bool)
+        evidence[doc_starts] = np.inf
+        return bases, word_starts, word_ends, word_docs, evidence, thresholds[word_docs]
+
+    # ----------------------------------------------------------- boundaries
+
+    def _cut(self, evidence, begin, end):
+        """Strongest gap cutting the overlong run [begin, end)"""
+        low, high = begin + self.min_words, min(begin + self.max_words, end - 1)
+        if high <= low:
+            return min(begin + self.max_words, end)
+        window = evidence[low:high + 1]
+        best = int(np.argmax(window))
+        return low + best if window[best] > 0 else begin + self.max_words
+
+    def _boundaries(self, evidence, thresholds, count):
+        """Word indexes starting a sentence, over the whole batch"""
+        candidates = np.flatnonzero(evidence >= thresholds)
+        forced = np.isinf(evidence)
+        starts = []
+        last = 0
+        for position in np.append(candidates, count):
+            position = int(position)
+            # Runs reaching a document start or the end are closed regardless of length
+            closing = position == count or forced[position]
+            while position - last > self.max_words:
+                last = self._cut(evidence, last, position)
+                starts.append(last)
+            if position == count:
+                break
+            if closing or position - last >= self.min_words:
+                if position != last or not starts:
+                    starts.append(position)
+                last = position
+        return starts
+
+    # ------------------------------------------------------------------ API
+
+    def split_batch(self, texts, segments=None):
+        """
+        (begin, end) character spans of the sentences of every text.
+        `segments` is an optional list, aligned with texts, of
+        TranscriptSegments (or None) whose offsets index the same text.
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+        bases, word_starts, word_ends, word_docs, evidence, thresholds = self._word_evidence(texts, segments)
+        spans = [[] for _ in texts]
+        starts = np.array(self._boundaries(evidence, thresholds, len(word_starts)), dtype=np.int64)
+        if not len(starts):
+            return spans
+        last_words = np.r_[starts[1:], len(word_starts)] - 1
+        docs = word_docs[starts]
+        begins = (word_starts[starts] - bases[docs]).tolist()
+        ends = (word_ends[last_words] - bases[docs]).tolist()
+        for doc, begin, end in zip(docs.tolist(), begins, ends):
+            spans[doc].append((begin, end))
+        return spans
+
+    def split(self, text, segments=None):
+        """Sentences of one text"""
+        spans = self.split_batch([text], [segments])[0]
+        return [text[begin:end] for begin, end in spans]
+
+
+def finish_sentence(sentence):
+    """Capitalized and terminated, for sentences cut from unpunctuated captions"""
+    sentence = sentence.strip()
+    if not sentence:
+        return sentence
+    if not sentence.rstrip(CLOSING_CHARS).endswith(tuple(TERMINAL_CHARS)):
+        sentence = sentence.rstrip(",;:") + "."
+    return sentence[0].upper() + sentence[1:]
+
+
+def chunk_text(text, max_chars, segments=None, segmenter=None):
+    """
+    Consecutive sentences of a text packed into chunks of at most
+    max_chars; a single sentence longer than that is cut at a word.
+    """
+    spans = (segmenter or sentence_segmenter).split_batch([text], [segments])[0]
+    chunks, begin, end = [], None, None
+    for span_begin, span_end in spans:
+        if begin is not None and span_end - begin > max_chars:
+            chunks.append(text[begin:end])
+            begin = None
+        if begin is None:
+            begin = span_begin
+        end = span_end
+        while end - begin > max_chars:
+            cut = text.rfind(" ", begin, begin + max_chars)
+            cut = cut if cut > begin else begin + max_chars
+            chunks.append(text[begin:cut])
+            begin = cut + 1 if text[cut:cut + 1] == " " else cut
+    if begin is not None and end > begin:
+        chunks.append(text[begin:end])
+    return chunks
+
+
+# Text after max_chars that truncate_at_sentence segments as context
+TRUNCATE_LOOKAHEAD_CHARS = 400
+
+
+def truncate_at_sentence(text, max_chars, min_chars=0, segments=None):
+    """
+    The longest run of leading sentences within max_chars, or a hard cut
+    with "..." when those sentences are shorter than min_chars.
+    """
+    if len(text) <= max_chars:
+        return text
+    # Only the head of the text is segmented; the lookahead lets a boundary
+    # right at max_chars be recognized, and the window's last span (possibly
+    # a sentence cut by the window) is never used
+    window = text[:max_chars + TRUNCATE_LOOKAHEAD_CHARS]
+    if segments is not None:
+        segments = segments.head(len(window))
+    spans = sentence_segmenter.split_batch([window], [segments])[0]
+    if len(window) < len(text):
+        spans = spans[:-1]
+    end = 0
+    for _, span_end in spans:
+        if span_end > max_chars:
+            break
+        end = span_end
+    if end > min_chars:
+        return text[:end]
+    return text[:max_chars] + "..."
+
+
+# Shared by the summarizers
+sentence_segmenter = SentenceSegmenter()
@@ -0,0 +1,303 @@
+# story_dedup.py
+import logging
+import os
+import re
+import threading
+import zlib
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from bson.binary import Binary
+
+logger = logging.getLogger(__name__)
+
+# Mersenne prime 2^31 - 1: (a * crc32 + b) stays below 2^63 in uint64 arithmetic
+_PRIME = np.uint64((1 << 31) - 1)
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def _as_naive_utc(dt):
+    """Mongo returns naive UTC datetimes, the cacher writes aware ones"""
+    if isinstance(dt, datetime) and dt.tzinfo is not None:
+        return dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def shingle_hashes(text, shingle_size=3):
+    """Stable 32-bit hashes of the distinct word n-grams of a transcript"""
+    words = _TOKEN_RE.findall(text.lower())
+    if len(words) < shingle_size:
+        return np.empty(0, dtype=np.uint64)
+    shingles = {' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)}
+    return np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+
+class MinHasher:
+    """
+    MinHash signatures over word shingles.
+
+    Each of the `num_perm` hash functions is a universal hash
+    (a * x + b) mod p applied to the crc32 of every shingle; the signature
+    keeps the minimum per function. Seeds are fixed, so signatures written
+    by one process compare with those of any other.
+    """
+
+    def __init__(self, num_perm=128, shingle_size=3, seed=1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+
+    def signature(self, text, min_shingles=20):
+        """uint32 signature of a cleaned transcript, or None when it is too short"""
+        hashes = shingle_hashes(text or "", self.shingle_size)
+        if len(hashes) < min_shingles:
+            return None
+        values = (np.outer(hashes, self._a) + self._b) % _PRIME
+        return values.min(axis=0).astype(np.uint32)
+
+
+def signature_to_binary(signature):
+    return Binary(signature.astype('<u4').tobytes())
+
+
+def signature_from_binary(data):
+    if not data:
+        return None
+    return np.frombuffer(bytes(data), dtype='<u4').astype(np.uint32)
+
+
+def estimated_similarity(first, second):
+    """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+    return float(np.count_nonzero(first == second)) / len(first)
+
+
+class StoryIndex:
+    """
+    LSH table of MinHash signatures for near-duplicate story detection.
+
+    Signatures are cut into `bands` bands of `num_perm / bands` rows and
+    every band is reduced to a 64-bit key; two transcripts become candidates
+    when any band key is equal, and a candidate joins the story when its
+    estimated similarity reaches `threshold`.
+
+    Storage is columnar: one uint32 signature matrix and one uint64 band-key
+    matrix, plus a sorted copy of all keys (each band is salted differently,
+    so one array serves every band). A lookup is a single vectorized binary
+    search over the sorted keys and a linear scan of the small
+    unsorted tail of recent additions, so it stays well under a millisecond
+    with hundreds of thousands of transcripts (about 1.2 KB each). The tail
+    is merged into the sorted arrays, and removed rows are compacted away,
+    once it grows past `merge_every` rows.
+
+    Only transcripts cached within the last `window_hours` are indexed:
+    copies of one wire story are uploaded within hours of each other.
+    Each process keeps its own table; story ids are stored on the news
+    documents, so a rebuild picks up what other processes assigned.
+    """
+
+    def __init__(self,
+                 num_perm=128,
+                 bands=32,
+                 threshold=float(os.getenv("STORY_DUP_THRESHOLD", "0.5")),
+                 window_hours=int(os.getenv("STORY_WINDOW_HOURS", "72")),
+                 merge_every=4096):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.hasher = MinHasher(num_perm=num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.window_hours = window_hours
+        self.merge_every = merge_every
+        # Odd multipliers folding the rows of a band into one uint64 key,
+        # plus a per-band salt so keys of different bands never meet
+        rng = np.random.default_rng(2)
+        self._band_mix = rng.integers(1, 1 << 63, size=self.rows, dtype=np.uint64) | np.uint64(1)
+        self._band_salt = rng.integers(0, 1 << 63, size=self.bands, dtype=np.uint64)
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.duplicates = 0
+        self._reset()
+
+    def _reset(self, capacity=1024):
+        self._signatures = np.zeros((capacity, self.hasher.num_perm), dtype=np.uint32)
+        self._keys = np.zeros((capacity, self.bands), dtype=np.uint64)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._video_ids = []
+        self._story_ids = []
+        self._cached_at = []
+        self._row_of = {}     # video_id -> row
+        self._size = 0        # rows in use, alive or not
+        self._merged = 0      # rows [0, _merged) are covered by the sorted arrays
+        self._sorted_keys = np.zeros(0, dtype=np.uint64)
+        self._sorted_rows = np.zeros(0, dtype=np.int32)
+
+    def signature(self, text):
+        return self.hasher.signature(text)
+
+    def _band_keys(self, signatures):
+        """(n, bands) band keys of an (n, num_perm) signature matrix"""
+        banded = signatures.reshape(len(signatures), self.bands, self.rows).astype(np.uint64)
+        return (banded * self._band_mix).sum(axis=2, dtype=np.uint64) + self._band_salt
+
+    # ------------------------------------------------------------------ reads
+
+    def _candidates(self, keys):
+        rows = []
+        lows = np.searchsorted(self._sorted_keys, keys, side="left")
+        highs = np.searchsorted(self._sorted_keys, keys, side="right")
+        for lo, hi in zip(lows[highs > lows], highs[highs > lows]):
+            rows.append(self._sorted_rows[lo:hi])
+        tail = self._keys[self._merged:self._size]
+        if len(tail):
+            rows.append(np.flatnonzero((tail == keys).any(axis=1)) + self._merged)
+        if not rows:
+            return rows
+        candidates = np.unique(np.concatenate(rows))
+        return candidates[self._alive[candidates]]
+
+    def find_story(self, video_id, signature):
+        """
+        (story_id, similarity) of the closest indexed story, or
+        (video_id, None) when the transcript starts a new story.
+        """
+        with self._lock:
+            self.lookups += 1
+            row = self._row_of.get(video_id)
+            if row is not None:
+                return self._story_ids[row], 1.0
+
+            candidates = self._candidates(self._band_keys(signature[np.newaxis])[0])
+            if len(candidates) == 0:
+                return video_id, None
+
+            similarities = (self._signatures[candidates] == signature).mean(axis=1)
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.threshold:
+                self.duplicates += 1
+                return self._story_ids[int(candidates[best])], round(float(similarities[best]), 3)
+            return video_id, None
+
+    def stats(self):
+        with self._lock:
+            alive = len(self._row_of)
+            nbytes = (self._signatures.nbytes + self._keys.nbytes + self._alive.nbytes
+                      + self._sorted_keys.nbytes + self._sorted_rows.nbytes)
+            return {
+                "indexed_transcripts": alive,
+                "stories": len({self._story_ids[row] for row in self._row_of.values()}),
+                "unmerged_rows": self._size - self._merged,
+                "bands": self.bands,
+                "rows_per_band": self.rows,
+                "threshold": self.threshold,
+                "window_hours": self.window_hours,
+                "approx_array_bytes": nbytes,
+                "lookups": self.lookups,
+                "duplicates_found": self.duplicates,
+            }
+
+    # ------------------------------------------------------------------ writes
+
+    def add(self, video_id, story_id, signature, cached_at=None):
+        keys = self._band_keys(signature[np.newaxis])[0]
+        with self._lock:
+            self._remove(video_id)
+            if self._size == len(self._signatures):
+                self._grow()
+            row = self._size
+            self._signatures[row] = signature
+            self._keys[row] = keys
+            self._alive[row] = True
+            self._video_ids.append(video_id)
+            self._story_ids.append(story_id)
+            self._cached_at.append(_as_naive_utc(cached_at) or datetime.utcnow())
+            self._row_of[video_id] = row
+            self._size += 1
+            if self._size - self._merged >= self.merge_every:
+                self._merge()
+
+    def _grow(self):
+        capacity = len(self._signatures) * 2
+        for name in ("_signatures", "_keys", "_alive"):
+            old = getattr(self, name)
+            grown = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            grown[:len(old)] = old
+            setattr(self, name, grown)
+
+    def _remove(self, video_id):
+        row = self._row_of.pop(video_id, None)
+        if row is not None:
+            self._alive[row] = False
+
+    def _merge(self):
+        """Compact removed rows away and re-sort every band over all rows"""
+        alive = np.flatnonzero(self._alive[:self._size])
+        if len(alive) < self._size:
+            count = len(alive)
+            self._signatures[:count] = self._signatures[alive]
+            self._keys[:count] = self._keys[alive]
+            self._alive[:count] = True
+            self._alive[count:] = False
+            self._video_ids = [self._video_ids[row] for row in alive]
+            self._story_ids = [self._story_ids[row] for row in alive]
+            self._cached_at = [self._cached_at[row] for row in alive]
+            self._row_of = {video_id: row for row, video_id in enumerate(self._video_ids)}
+            self._size = count
+
+        flat_keys = self._keys[:self._size].ravel()
+        order = np.argsort(flat_keys)
+        self._sorted_keys = flat_keys[order]
+        self._sorted_rows = (order // self.bands).astype(np.int32)
+        self._merged = self._size
+
+    def drop_older_than(self, cutoff):
+        cutoff = _as_naive_utc(cutoff)
+        with self._lock:
+            for video_id, row in list(self._row_of.items()):
+                if self._cached_at[row] < cutoff:
+                    self._remove(video_id)
+            self._merge()
+
+    def rebuild(self, collection):
+        """Load the signatures of every transcript inside the window"""
+        cutoff = datetime.utcnow() - timedelta(hours=self.window_hours)
+        cursor = collection.find(
+            {"minhash": {"$ne": None}, "cached_at": {"$gte": cutoff}},
+            {"_id": 0, "video_id": 1, "story_id": 1, "minhash": 1, "cached_at": 1}
+        )
+        with self._lock:
+            self._reset()
+        count = 0
+        for doc in cursor:
+            signature = signature_from_binary(doc.get("minhash"))
+            if signature is None or len(signature) != self.hasher.num_perm:
+                continue
+            self.add(doc["video_id"], doc.get("story_id") or doc["video_id"], signature, doc.get("cached_at"))
+            count += 1
+        with self._lock:
+            self._merge()
+        logger.info(f"[story] Indexed {count} transcript signatures")
+        return count
+
+
+def collapse_stories(items, seen=None):
+    """
+    Keep the first item of every story (feeds are newest first) and drop
+    the near-duplicate copies that follow it. Pass the same `seen` set to
+    collapse across several feeds.
+    """
+    seen = set() if seen is None else seen
+    collapsed = []
+    for item in items:
+        story_id = item.get("story_id") or item.get("video_id")
+        if story_id in seen:
+            continue
+        seen.add(story_id)
+        collapsed.append(item)
+    return collapsed
+
+
+# Shared by the ingest write path (cacher) and the admin endpoints (main)
+story_index = StoryIndex()
@@ -0,0 +1,178 @@
+# transcript_languages.py
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from youtube_transcript_api import YouTubeTranscriptApi
+from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound, VideoUnavailable
+
+logger = logging.getLogger(__name__)
+
+# Negative cache reason codes of videos without a usable transcript track
+_LISTING_FAILURES = {
+    TranscriptsDisabled: "transcripts_disabled",
+    NoTranscriptFound: "no_transcript",
+    VideoUnavailable: "unavailable",
+}
+
+# Preferred transcript languages, best first (base codes: 'en' also covers 'en-GB')
+TRANSCRIPT_LANGUAGES = [code.strip() for code in os.getenv("TRANSCRIPT_LANGUAGES", "en,hi").split(",") if code.strip()]
+
+
+def _base_code(language_code):
+    return (language_code or "").split("-")[0].lower()
+
+
+class TranscriptCandidate:
+    """One transcript we could fetch for a video, native or translated"""
+
+    __slots__ = ("transcript", "language_code", "source_language", "is_generated", "is_translation", "rank")
+
+    def __init__(self, transcript, language_code, source_language, is_generated, is_translation, rank):
+        self.transcript = transcript
+        self.language_code = language_code      # language of the text we would get
+        self.source_language = source_language  # language of the caption track
+        self.is_generated = is_generated
+        self.is_translation = is_translation
+        self.rank = rank
+
+    @property
+    def label(self):
+        """Value stored as transcript_language"""
+        if self.is_translation:
+            return f"{self.source_language}-to-{self.language_code}"
+        return self.language_code
+
+    def fetch(self):
+        transcript = self.transcript.translate(self.language_code) if self.is_translation else self.transcript
+        return transcript.fetch().to_raw_data()
+
+
+def rank_candidates(transcript_list, preferences=TRANSCRIPT_LANGUAGES):
+    """
+    Every fetchable transcript of a listing, best first: native tracks
+    before translations, preferred languages in preference order before
+    any other language, manual captions before auto-generated ones.
+    """
+    def preference(code):
+        base = _base_code(code)
+        return preferences.index(base) if base in preferences else len(preferences)
+
+    candidates = []
+    for transcript in transcript_list:
+        source = transcript.language_code
+        candidates.append(TranscriptCandidate(
+            transcript, source, source, transcript.is_generated, False,
+            (0, preference(source), transcript.is_generated)
+        ))
+        # A native track in a preferred language is never beaten by a translation
+        if not transcript.is_translatable or preference(source) < len(preferences):
+            continue
+        available = {item.language_code for item in transcript.translation_languages}
+        for target in preferences:
+            if target in available:
+                candidates.append(TranscriptCandidate(
+                    transcript, target, source, transcript.is_generated, True,
+                    (1, preference(target), transcript.is_generated)
+                ))
+    candidates.sort(key=lambda candidate: candidate.rank)
+    return candidates
+
+
+class TranscriptListingCache:
+    """
+    Per-video transcript listings with a TTL, least recently used evicted.
+    Videos without any transcript are cached too, as an empty listing
+    together with the reason code.
+    """
+
+    def __init__(self,
+                 ttl_seconds=int(os.getenv("TRANSCRIPT_LISTING_TTL_HOURS", "6")) * 3600,
+                 max_entries=2048):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # video_id -> (expires_at, (candidates, reason))
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, video_id):
+        with self._lock:
+            entry = self._entries.get(video_id)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(video_id, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(video_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, video_id, candidates, reason=None):
+        with self._lock:
+            self._entries[video_id] = (time.monotonic() + self.ttl_seconds, (candidates, reason))
+            self._entries.move_to_end(video_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class LanguageNegotiator:
+    """
+    Picks the transcript to download for a video with one listing request
+    (cached, so retries cost nothing) and fetches only the best candidate.
+    The next candidate is tried only when downloading the best one fails.
+    """
+
+    def __init__(self, preferences=TRANSCRIPT_LANGUAGES, listing_cache=None, api=None, max_attempts=2):
+        self.preferences = [_base_code(code) for code in preferences]
+        self.listing_cache = listing_cache or TranscriptListingCache()
+        self.api = api or YouTubeTranscriptApi()
+        self.max_attempts = max_attempts
+        self.listing_requests = 0
+        self.fetch_requests = 0
+
+    def _listing(self, video_id):
+        listing = self.listing_cache.get(video_id)
+        if listing is not None:
+            return listing
+
+        self.listing_requests += 1
+        reason = None
+        try:
+            candidates = rank_candidates(self.api.list(video_id), self.preferences)
+        except tuple(_LISTING_FAILURES) as e:
+            candidates = []
+            reason = next(code for error, code in _LISTING_FAILURES.items() if isinstance(e, error))
+        # Other errors (network, rate limiting) propagate and are not cached
+        if not candidates and reason is None:
+            reason = "no_transcript"
+        self.listing_cache.put(video_id, candidates, reason)
+        return candidates, reason
+
+    def candidates(self, video_id):
+        """Ranked candidates of a video, [] when it has no transcripts"""
+        return self._listing(video_id)[0]
+
+    def failure_reason(self, video_id):
+        """Negative cache reason code of a video without candidates, else None"""
+        return self._listing(video_id)[1]
+
+    def fetch_best(self, video_id):
+        """(raw segments, transcript_language) of the best transcript, or (None, None)"""
+        for candidate in self.candidates(video_id)[:self.max_attempts]:
+            self.fetch_requests += 1
+            try:
+                return candidate.fetch(), candidate.label
+            except Exception as e:
+                logger.debug(f"[transcript] {candidate.label} fetch failed for {video_id}: {e}")
+        return None, None
+
+    def stats(self):
+        return {
+            "preferences": self.preferences,
+            "listing_requests": self.listing_requests,
+            "fetch_requests": self.fetch_requests,
+            "listing_cache_hits": self.listing_cache.hits,
+            "listing_cache_misses": self.listing_cache.misses,
+        }
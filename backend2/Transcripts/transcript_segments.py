@@ -0,0 +1,137 @@
+# transcript_segments.py
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+from bson.binary import Binary
+
+SEGMENTS_VERSION = 1
+
+
+def _segment_fields(segment):
+    """(text, start, duration) of a dict segment or a FetchedTranscriptSnippet"""
+    if isinstance(segment, dict):
+        return segment.get("text", ""), segment.get("start", 0.0), segment.get("duration", 0.0)
+    return getattr(segment, "text", ""), getattr(segment, "start", 0.0), getattr(segment, "duration", 0.0)
+
+
+def _to_binary(values):
+    # Stored little-endian regardless of the host
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return Binary(values.tobytes())
+
+
+def _from_binary(typecode, data):
+    values = array(typecode)
+    values.frombytes(bytes(data))
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+class TranscriptSegments:
+    """
+    Segment timings of a transcript in columnar form.
+
+    starts/durations are float32 arrays (seconds) and offsets is a uint32
+    array of character offsets into the cleaned transcript text, one entry
+    per caption segment, all sorted ascending. Lookups are binary searches
+    over the arrays; no per-segment objects are created.
+    """
+
+    __slots__ = ("starts", "durations", "offsets")
+
+    def __init__(self, starts, durations, offsets):
+        self.starts = starts
+        self.durations = durations
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.starts)
+
+    @classmethod
+    def from_transcript(cls, segments, cleaned_text, clean_text=str.strip):
+        """
+        Build from fetched caption segments and the cleaned transcript;
+        `clean_text` is the cleaner that produced it, applied per segment.
+        Each cleaned segment is located at or after the end of the previous
+        one (falling back to its first words when cleaning merged text across
+        a boundary), so offsets stay monotonic.
+        """
+        starts, durations, offsets = array("f"), array("f"), array("I")
+        cursor = 0
+        for segment in segments:
+            text, start, duration = _segment_fields(segment)
+            segment_text = clean_text(text)
+            window_end = cursor + 2 * len(segment_text) + 64
+            position = cursor
+            found = cleaned_text.find(segment_text, cursor, window_end) if segment_text else -1
+            if found != -1:
+                position = found
+                cursor = found + len(segment_text)
+            else:
+                for word in segment_text.split()[:3]:
+                    found = cleaned_text.find(word, cursor, window_end)
+                    if found != -1:
+                        position = found
+                        cursor = found + len(word)
+                        break
+            starts.append(float(start or 0.0))
+            durations.append(float(duration or 0.0))
+            offsets.append(position)
+        return cls(starts, durations, offsets)
+
+    @classmethod
+    def from_document(cls, packed):
+        if not packed or packed.get("version") != SEGMENTS_VERSION:
+            return None
+        return cls(
+            _from_binary("f", packed["start"]),
+            _from_binary("f", packed["duration"]),
+            _from_binary("I", packed["offset"]),
+        )
+
+    def to_document(self):
+        """BSON-ready form stored as transcript_segments on the news document"""
+        return {
+            "version": SEGMENTS_VERSION,
+            "count": len(self),
+            "start": _to_binary(self.starts),
+            "duration": _to_binary(self.durations),
+            "offset": _to_binary(self.offsets),
+        }
+
+    def head(self, char_limit):
+        """The segments starting before char_limit, for a prefix of the text"""
+        count = bisect_left(self.offsets, char_limit)
+        return TranscriptSegments(self.starts[:count], self.durations[:count], self.offsets[:count])
+
+    def segment_at_offset(self, char_offset):
+        """Index of the segment containing a character offset of the cleaned text"""
+        return max(bisect_right(self.offsets, char_offset) - 1, 0) if len(self) else None
+
+    def segment_at_time(self, seconds):
+        """Index of the segment playing at `seconds`"""
+        return max(bisect_right(self.starts, seconds) - 1, 0) if len(self) else None
+
+    def time_at_offset(self, char_offset):
+        index = self.segment_at_offset(char_offset)
+        return None if index is None else float(self.starts[index])
+
+    def offset_at_time(self, seconds):
+        index = self.segment_at_time(seconds)
+        return None if index is None else int(self.offsets[index])
+
+    def text_span(self, index, text_length):
+        """(begin, end) character span of a segment in the cleaned text"""
+        end = self.offsets[index + 1] if index + 1 < len(self) else text_length
+        return int(self.offsets[index]), int(end)
+
+
+def pack_segments(segments, cleaned_text, clean_text=str.strip):
+    """transcript_segments value for a news document, or None without timings"""
+    if not segments or not cleaned_text:
+        return None
+    return TranscriptSegments.from_transcript(segments, cleaned_text, clean_text).to_document()
@@ -0,0 +1,129 @@
+# transcript_store.py
+import os
+import zlib
+from datetime import datetime, timezone
+
+import gridfs
+from bson.binary import Binary
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional, zlib is always available
+    zstandard = None
+
+# Characters of the transcript kept inline on the news document for feeds
+TRANSCRIPT_PREVIEW_CHARS = int(os.getenv("TRANSCRIPT_PREVIEW_CHARS", "280"))
+
+# Compressed blobs above this size go to GridFS (documents are capped at 16 MB)
+GRIDFS_THRESHOLD_BYTES = 8 * 1024 * 1024
+
+
+def _compress(data):
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=10).compress(data)
+    return "zlib", zlib.compress(data, 9)
+
+
+def _decompress(codec, data):
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Transcript stored with zstd but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == "zlib":
+        return zlib.decompress(data)
+    raise ValueError(f"Unknown transcript codec: {codec}")
+
+
+def make_preview(text, limit=TRANSCRIPT_PREVIEW_CHARS):
+    """Leading words of a transcript, cut at a word boundary"""
+    if len(text) <= limit:
+        return text
+    cut = text.rfind(" ", 0, limit)
+    return text[:cut if cut > 0 else limit].rstrip() + "..."
+
+
+class TranscriptStore:
+    """
+    Full transcripts stored compressed outside db.news.
+
+    One document per video in news_transcripts ({_id: video_id, codec,
+    data}); blobs too large for a document are written to the
+    news_transcripts GridFS bucket and referenced by gridfs_id. The news
+    document keeps a short preview in `transcript` and sets
+    transcript_external, so feed queries never read the full text. Only the
+    summarizer, the detail endpoints and the maintenance jobs load it.
+    """
+
+    def __init__(self, db, collection_name="news_transcripts"):
+        self.collection = db[collection_name]
+        self.bucket = gridfs.GridFSBucket(db, bucket_name=collection_name)
+
+    def put(self, video_id, text):
+        raw = text.encode("utf-8")
+        codec, compressed = _compress(raw)
+        doc = {
+            "_id": video_id,
+            "codec": codec,
+            "raw_bytes": len(raw),
+            "stored_bytes": len(compressed),
+            "stored_at": datetime.now(timezone.utc),
+        }
+        previous = self.collection.find_one({"_id": video_id}, {"gridfs_id": 1})
+        if len(compressed) > GRIDFS_THRESHOLD_BYTES:
+            doc["gridfs_id"] = self.bucket.upload_from_stream(video_id, compressed)
+        else:
+            doc["data"] = Binary(compressed)
+        self.collection.replace_one({"_id": video_id}, doc, upsert=True)
+        if previous and previous.get("gridfs_id"):
+            self.bucket.delete(previous["gridfs_id"])
+        return doc
+
+    def _text(self, doc):
+        if doc.get("gridfs_id"):
+            data = self.bucket.open_download_stream(doc["gridfs_id"]).read()
+        else:
+            data = doc["data"]
+        return _decompress(doc["codec"], bytes(data)).decode("utf-8")
+
+    def get(self, video_id):
+        doc = self.collection.find_one({"_id": video_id})
+        return self._text(doc) if doc else None
+
+    def get_many(self, video_ids):
+        """{video_id: text} for the stored transcripts among video_ids"""
+        if not video_ids:
+            return {}
+        return {doc["_id"]: self._text(doc) for doc in self.collection.find({"_id": {"$in": list(video_ids)}})}
+
+    def load(self, news_item):
+        """Full transcript of a news document, wherever it is stored"""
+        if news_item.get("transcript_external"):
+            text = self.get(news_item.get("video_id"))
+            if text is not None:
+                return text
+        return news_item.get("transcript", "")
+
+    def delete_many(self, video_ids=None):
+        """Delete the transcripts of video_ids, or every transcript when None"""
+        query = {} if video_ids is None else {"_id": {"$in": list(video_ids)}}
+        for doc in self.collection.find(dict(query, gridfs_id={"$exists": True}), {"gridfs_id": 1}):
+            self.bucket.delete(doc["gridfs_id"])
+        return self.collection.delete_many(query).deleted_count
+
+    def stats(self):
+        totals = list(self.collection.aggregate([{"$group": {
+            "_id": "$codec",
+            "transcripts": {"$sum": 1},
+            "raw_bytes": {"$sum": "$raw_bytes"},
+            "stored_bytes": {"$sum": "$stored_bytes"},
+        }}]))
+        raw = sum(item["raw_bytes"] for item in totals)
+        stored = sum(item["stored_bytes"] for item in totals)
+        return {
+            "transcripts": sum(item["transcripts"] for item in totals),
+            "by_codec": {item["_id"]: item["transcripts"] for item in totals},
+            "raw_bytes": raw,
+            "stored_bytes": stored,
+            "compression_ratio": round(raw / stored, 2) if stored else 0,
+            "preview_chars": TRANSCRIPT_PREVIEW_CHARS,
+        }
@@ -0,0 +1,238 @@
+"""
+Micro-benchmarks of the pure-CPU hot functions, pytest-benchmark style.
+
+Every benchmark runs on the fixture corpus of benchmarks.corpus (short,
+10-minute and 1-hour caption tracks, English and Hindi): rounds repeat
+until --min-time has passed (at least --min-rounds), and min / median /
+mean / stddev per call are kept. `run` saves the results as JSON named
+after the commit, `compare` flags benchmarks whose fastest call (or
+--stat) got slower by more than --threshold and exits with status 1 when
+any did.
+
+    cd backend2
+    python -m benchmarks.bench_hot_functions run
+    git checkout other-branch && python -m benchmarks.bench_hot_functions run
+    python -m benchmarks.bench_hot_functions compare        # two latest runs
+    python -m benchmarks.bench_hot_functions compare OLD.json NEW.json --threshold 0.1
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from benchmarks.corpus import LENGTHS, captions_text, transcript_corpus
+from models.news_document import normalize_news_document
+from Summarizer.summary_text import (
+    prepare_summary_input, simple_extractive_summary, summary_length_bounds, summary_metrics,
+)
+from Transcripts.cache_transcripts import EnhancedNewsFilter
+from Transcripts.genre_classifier import GenreClassifier
+from Transcripts.transcript_segments import TranscriptSegments
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".benchmarks")
+
+LIVE_TITLES = [
+    "LIVE: Parliament session on the budget", "Evening bulletin: top stories of the day",
+    "Breaking News: flood alert in Assam", "लाइव: संसद में बजट पर चर्चा", "आज की बड़ी खबरें",
+    "PM press conference on trade deal", "Cricket: India vs Australia highlights",
+    "सीधा प्रसारण: चुनाव परिणाम", "Markets close higher on IT stocks", "Weather update for the weekend",
+]
+
+BENCHMARKS = []
+
+
+def benchmark(group, params=None):
+    """Register `fn(param)` as a benchmark, once per param (or once without)"""
+    def decorator(fn):
+        for param in (params or [None]):
+            BENCHMARKS.append((group, fn.__name__, param, fn))
+        return fn
+    return decorator
+
+
+class Fixtures:
+    """Corpus inputs, built once so their cost stays out of the timings"""
+
+    def __init__(self):
+        self.tracks = transcript_corpus()
+        self.texts = {name: captions_text(segments) for name, segments in self.tracks.items()}
+        self.segments = {name: TranscriptSegments.from_transcript(segments, self.texts[name])
+                         for name, segments in self.tracks.items()}
+        self.news_filter = EnhancedNewsFilter()
+        self.genre_classifier = GenreClassifier()
+        self.documents = {name: {
+            "video_id": f"bench{i:03d}", "title": f"Bulletin {name}", "description": "Top stories",
+            "video_url": f"https://www.youtube.com/watch?v=bench{i:03d}", "channel_id": "UCbench",
+            "published_at": "2025-01-01T00:00:00Z", "transcript": text, "transcript_language": name[-2:],
+            "word_count": len(text.split()), "genre": "general",
+        } for i, (name, text) in enumerate(self.texts.items())}
+
+
+CORPUS = [f"{name}-{language}" for name in LENGTHS for language in ("en", "hi")]
+fixtures = None
+
+
+@benchmark("filter", CORPUS)
+def clean_transcript_text(name):
+    fixtures.news_filter.clean_transcript_text(fixtures.texts[name])
+
+
+@benchmark("filter", CORPUS)
+def is_meaningful_transcript(name):
+    fixtures.news_filter.is_meaningful_transcript(fixtures.texts[name])
+
+
+@benchmark("filter")
+def is_live_news(_):
+    for title in LIVE_TITLES:
+        fixtures.news_filter.is_live_news(title)
+
+
+@benchmark("genre", CORPUS)
+def detect_genre(name):
+    fixtures.genre_classifier.classify(fixtures.texts[name], "Evening bulletin").primary
+
+
+@benchmark("summary", CORPUS)
+def extractive_summary(name):
+    simple_extractive_summary(fixtures.texts[name])
+
+
+@benchmark("summary", CORPUS)
+def extractive_summary_with_timings(name):
+    simple_extractive_summary(fixtures.texts[name], segments=fixtures.segments[name])
+
+
+@benchmark("summary", CORPUS)
+def falcon_preprocess(name):
+    news_text, _ = prepare_summary_input(fixtures.texts[name], fixtures.segments[name])
+    summary_length_bounds(news_text)
+
+
+@benchmark("summary", CORPUS)
+def falcon_postprocess(name):
+    text = fixtures.texts[name]
+    summary_metrics(len(text), text[:1024], text[:300])
+
+
+@benchmark("document", CORPUS)
+def normalize_document(name):
+    normalize_news_document(fixtures.documents[name])
+
+
+def measure(fn, param, min_time, min_rounds):
+    """Per-call seconds of at least `min_rounds` calls spread over `min_time`"""
+    fn(param)  # warm-up
+    samples, spent = [], 0.0
+    while len(samples) < min_rounds or spent < min_time:
+        start = time.perf_counter()
+        fn(param)
+        elapsed = time.perf_counter() - start
+        samples.append(elapsed)
+        spent += elapsed
+    return {
+        "min": min(samples),
+        "max": max(samples),
+        "mean": statistics.fmean(samples),
+        "median": statistics.median(samples),
+        "stddev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "rounds": len(samples),
+    }
+
+
+def commit_info():
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return ""
+    return {"id": git("rev-parse", "HEAD") or "unknown", "dirty": bool(git("status", "--porcelain", "--", "."))}
+
+
+def run(args):
+    global fixtures
+    fixtures = Fixtures()
+    results = []
+    for group, name, param, fn in BENCHMARKS:
+        fullname = f"{name}[{param}]" if param else name
+        if args.filter and args.filter not in fullname:
+            continue
+        stats = measure(fn, param, args.min_time, args.min_rounds)
+        results.append({"group": group, "name": fullname, "param": param, "stats": stats})
+        print(f"{group:9s} {fullname:44s} median {stats['median'] * 1e6:11.1f} us  "
+              f"min {stats['min'] * 1e6:11.1f} us  rounds {stats['rounds']:6d}")
+
+    info = commit_info()
+    output = {
+        "machine_info": {"python": platform.python_version(), "machine": platform.machine(),
+                         "processor": platform.processor(), "system": platform.system()},
+        "commit_info": info,
+        "datetime": datetime.now(timezone.utc).isoformat(),
+        "benchmarks": results,
+    }
+    path = args.save or os.path.join(
+        RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}_{info['id'][:10]}{'-dirty' if info['dirty'] else ''}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(output, f, indent=2)
+    print(f"\nsaved {path}")
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(args):
+    paths = args.files or sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")))[-2:]
+    if len(paths) != 2:
+        sys.exit("compare needs two result files (or two saved runs in .benchmarks)")
+    old, new = [load_results(path) for path in paths]
+    print(f"old: {paths[0]} ({old['commit_info']['id'][:10]})\nnew: {paths[1]} ({new['commit_info']['id'][:10]})\n")
+
+    baseline = {result["name"]: result["stats"] for result in old["benchmarks"]}
+    slower = []
+    for result in new["benchmarks"]:
+        before = baseline.get(result["name"])
+        if before is None:
+            continue
+        change = result["stats"][args.stat] / before[args.stat] - 1
+        flag = ""
+        if change > args.threshold:
+            flag = "  SLOWER"
+            slower.append(result["name"])
+        elif change < -args.threshold:
+            flag = "  faster"
+        before_us, after_us = before[args.stat] * 1e6, result["stats"][args.stat] * 1e6
+        print(f"{result['name']:44s} {before_us:11.1f} -> {after_us:11.1f} us {change:+7.1%}{flag}")
+
+    if slower:
+        print(f"\n{len(slower)} benchmarks slower by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the benchmarks and save the results")
+    run_parser.add_argument("--filter", help="only benchmarks whose name contains this")
+    run_parser.add_argument("--min-time", type=float, default=0.2, help="seconds spent per benchmark")
+    run_parser.add_argument("--min-rounds", type=int, default=5)
+    run_parser.add_argument("--save", help="result file (default .benchmarks/<time>_<commit>.json)")
+    compare_parser = commands.add_parser("compare", help="flag slowdowns between two saved runs")
+    compare_parser.add_argument("files", nargs="*", help="OLD.json NEW.json (default: the two latest runs)")
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="relative slowdown to flag")
+    compare_parser.add_argument("--stat", choices=["min", "median", "mean"], default="min",
+                                help="statistic compared (min is the least noisy)")
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+    else:
+        compare(args)
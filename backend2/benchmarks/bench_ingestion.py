@@ -0,0 +1,337 @@
+"""
+Benchmark: end-to-end ingestion against local stand-ins.
+
+Starts a fake YouTube Data API on localhost (search.list and videos.list,
+served over HTTP to the real request code), a fake transcript source
+serving caption payloads (generated, or recorded ones from --payloads)
+and stores into an in-memory Mongo (mongomock) or a throwaway database
+on --mongo-uri. Every synthetic channel is then crawled twice:
+  * cold: every upload is new
+  * warm: the same crawl again, answered by the cache and negative cache
+Each pass reports videos/sec, per-stage latency from utils.metrics and
+the API calls made. For the workload recorded in
+benchmarks/ingestion_thresholds.json (the defaults) the numbers are
+checked against its thresholds and any breach exits with status 1.
+
+Channels mix regular uploads with shorts, live streams, videos without
+captions, music-only captions and Hindi captions. The crawl reads one
+search page, so at most 50 videos per channel are ever seen.
+
+    cd backend2
+    pip install mongomock
+    python -m benchmarks.bench_ingestion --channels 5 --videos 50
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from youtube_transcript_api._errors import TranscriptsDisabled
+
+from benchmarks.corpus import make_captions
+from utils.metrics import STAGE_SECONDS, YOUTUBE_QUOTA, registry
+
+try:
+    import mongomock
+    import mongomock.gridfs
+except ImportError:
+    mongomock = None
+
+THRESHOLDS = os.path.join(os.path.dirname(__file__), "ingestion_thresholds.json")
+
+# Every n-th upload of a channel is of this kind, checked in this order
+VIDEO_KINDS = [(20, "live"), (10, "short"), (9, "no_captions"), (13, "music"), (7, "hindi")]
+
+
+def make_channels(channels, videos, minutes):
+    """{channel_id: [video]} with deterministic kinds and captions"""
+    catalog = {}
+    for c in range(channels):
+        channel_id = f"UCbench{c:04d}"
+        uploads = []
+        for v in range(min(videos, 50)):
+            kind = next((name for every, name in VIDEO_KINDS if v % every == every - 1), "regular")
+            video_id = f"c{c:03d}v{v:03d}"
+            uploads.append({
+                "video_id": video_id,
+                "kind": kind,
+                "title": f"Channel {c} bulletin {v}",
+                "duration": "PT45S" if kind == "short" else f"PT{minutes}M",
+                "captions": None if kind in ("live", "short", "no_captions") else make_captions(
+                    minutes, "hi" if kind == "hindi" else "en", seed=c * 1000 + v,
+                    music_share=0.9 if kind == "music" else 0.0,
+                ),
+            })
+        catalog[channel_id] = uploads
+    return catalog
+
+
+class FakeYouTubeApi(ThreadingHTTPServer):
+    """search.list and videos.list of the Data API for a fixed catalog"""
+
+    daemon_threads = True
+
+    def __init__(self, catalog, latency=0.0):
+        super().__init__(("127.0.0.1", 0), _YouTubeHandler)
+        self.catalog = catalog
+        self.videos = {video["video_id"]: video for uploads in catalog.values() for video in uploads}
+        self.latency = latency
+        self.calls = {"search": 0, "videos": 0}
+        self.items_served = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/youtube/v3"
+
+    def search(self, params):
+        uploads = self.catalog.get(params.get("channelId", [""])[0], [])
+        items = [{
+            "id": {"kind": "youtube#video", "videoId": video["video_id"]},
+            "snippet": {
+                "title": video["title"],
+                "description": "Top stories of the hour",
+                "channelTitle": "Bench channel",
+                "publishedAt": "2025-01-01T00:00:00Z",
+                "liveBroadcastContent": "live" if video["kind"] == "live" else "none",
+                "thumbnails": {"high": {"url": f"https://i.ytimg.com/vi/{video['video_id']}/hqdefault.jpg"}},
+            },
+        } for video in uploads[:int(params.get("maxResults", ["5"])[0])]]
+        with self._lock:
+            self.items_served += len(items)
+        return {"items": items}
+
+    def video_details(self, params):
+        ids = params.get("id", [""])[0].split(",")
+        return {"items": [{"id": video_id, "contentDetails": {"duration": self.videos[video_id]["duration"]}}
+                          for video_id in ids if video_id in self.videos]}
+
+
+class _YouTubeHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        endpoint = url.path.rsplit("/", 1)[-1]
+        if endpoint not in self.server.calls:
+            self.send_error(404)
+            return
+        with self.server._lock:
+            self.server.calls[endpoint] += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        params = parse_qs(url.query)
+        body = self.server.search(params) if endpoint == "search" else self.server.video_details(params)
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _FetchedTranscript:
+    def __init__(self, segments):
+        self.segments = segments
+
+    def to_raw_data(self):
+        return [dict(segment) for segment in self.segments]
+
+
+class _Transcript:
+    is_generated = True
+    is_translatable = False
+    translation_languages = []
+
+    def __init__(self, source, language_code, segments):
+        self.source = source
+        self.language_code = language_code
+        self.segments = segments
+
+    def fetch(self):
+        self.source.count("fetch")
+        return _FetchedTranscript(self.segments)
+
+
+class FakeTranscriptSource:
+    """
+    Stands in for YouTubeTranscriptApi: `list` returns one auto-generated
+    track per video, or raises TranscriptsDisabled for videos without
+    captions. With recorded payloads, those are served round robin
+    instead of the generated captions.
+    """
+
+    def __init__(self, videos, payloads=None, latency=0.0):
+        self.videos = videos
+        self.payloads = payloads
+        self.latency = latency
+        self.calls = {"list": 0, "fetch": 0}
+        self._lock = threading.Lock()
+
+    def count(self, call):
+        with self._lock:
+            self.calls[call] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def list(self, video_id):
+        self.count("list")
+        video = self.videos[video_id]
+        if video["captions"] is None:
+            raise TranscriptsDisabled(video_id)
+        segments = video["captions"]
+        if self.payloads and video["kind"] == "regular":
+            segments = self.payloads[sum(map(ord, video_id)) % len(self.payloads)]
+        return [_Transcript(self, "hi" if video["kind"] == "hindi" else "en", segments)]
+
+
+def mongo_client(args):
+    if args.mongo_uri:
+        from pymongo import MongoClient
+        return MongoClient(args.mongo_uri)
+    if mongomock is None:
+        sys.exit("mongomock is not installed: pip install mongomock, or pass --mongo-uri of a local mongod")
+    mongomock.gridfs.enable_gridfs_integration()
+    return mongomock.MongoClient()
+
+
+def crawl_pass(name, cacher, server, transcripts, channels):
+    registry.clear()
+    server.calls.update(search=0, videos=0)
+    server.items_served = 0
+    transcripts.calls.update(list=0, fetch=0)
+
+    start = time.perf_counter()
+    returned = 0
+    for channel_id in channels:
+        returned += len(cacher.get_latest_news_with_caching(
+            query="news", num_videos_to_fetch=50, channel_id=channel_id,
+            force_refresh=True, cache_hours=6,
+        ))
+    elapsed = time.perf_counter() - start
+
+    videos = max(server.items_served, 1)
+    calls = dict(server.calls, transcript_list=transcripts.calls["list"], transcript_fetch=transcripts.calls["fetch"])
+    stages = {}
+    for (stage,) in STAGE_SECONDS.label_values():
+        count, total = STAGE_SECONDS.summary(stage=stage)
+        stages[stage] = {
+            "count": count,
+            "mean_seconds": total / count,
+            "p95_seconds": STAGE_SECONDS.quantile(0.95, stage=stage),
+        }
+    return {
+        "pass": name,
+        "videos": server.items_served,
+        "returned": returned,
+        "seconds": elapsed,
+        "videos_per_sec": server.items_served / elapsed,
+        "api_calls": calls,
+        "api_calls_per_video": sum(calls.values()) / videos,
+        "quota_units": sum(YOUTUBE_QUOTA.value(endpoint=endpoint) for endpoint in ("search.list", "videos.list")),
+        "stages": stages,
+    }
+
+
+def report(result):
+    print(f"\n{result['pass']}: {result['videos']} videos in {result['seconds']:.2f} s "
+          f"({result['videos_per_sec']:.1f} videos/s), {result['returned']} returned")
+    print("  api calls: " + ", ".join(f"{name} {count}" for name, count in result["api_calls"].items())
+          + f"  ({result['api_calls_per_video']:.2f} per video, {result['quota_units']} quota units)")
+    for stage, numbers in sorted(result["stages"].items()):
+        print(f"  {stage:18s} n={numbers['count']:5d}  mean {numbers['mean_seconds'] * 1000:8.2f} ms  "
+              f"p95 {numbers['p95_seconds'] * 1000:8.2f} ms")
+
+
+def check(result, limits):
+    """Threshold breaches of one pass"""
+    failures = []
+    if result["videos_per_sec"] < limits.get("min_videos_per_sec", 0):
+        failures.append(f"{result['pass']}: {result['videos_per_sec']:.1f} videos/s "
+                        f"< {limits['min_videos_per_sec']}")
+    if result["api_calls_per_video"] > limits.get("max_api_calls_per_video", float("inf")):
+        failures.append(f"{result['pass']}: {result['api_calls_per_video']:.2f} api calls per video "
+                        f"> {limits['max_api_calls_per_video']}")
+    for call, limit in limits.get("max_api_calls", {}).items():
+        if result["api_calls"].get(call, 0) > limit:
+            failures.append(f"{result['pass']}: {result['api_calls'][call]} {call} calls > {limit}")
+    for stage, limit in limits.get("max_stage_p95_seconds", {}).items():
+        p95 = result["stages"].get(stage, {}).get("p95_seconds")
+        if p95 is not None and p95 > limit:
+            failures.append(f"{result['pass']}: {stage} p95 {p95 * 1000:.1f} ms > {limit * 1000:.1f} ms")
+    return failures
+
+
+def main(args):
+    catalog = make_channels(args.channels, args.videos, args.minutes)
+    server = FakeYouTubeApi(catalog, latency=args.api_latency_ms / 1000)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # The request code reads its base URL and key at import time
+    os.environ["YOUTUBE_API_URL"] = server.url
+    os.environ["YOUTUBE_API_KEY"] = "local-benchmark"
+    from Transcripts.cache_transcripts import EnhancedNewsTranscriptCacher
+    from Transcripts.story_dedup import StoryIndex
+    from utils.feed_index import HotFeedIndex
+
+    payloads = None
+    if args.payloads:
+        with open(args.payloads, encoding="utf-8") as f:
+            payloads = json.load(f)
+
+    transcripts = FakeTranscriptSource(server.videos, payloads, latency=args.transcript_latency_ms / 1000)
+    client = mongo_client(args)
+    database = "NewsByte_AI_bench"
+    client.drop_database(database)
+    cacher = EnhancedNewsTranscriptCacher(
+        database_name=database, feed_index=HotFeedIndex(), story_index=StoryIndex(),
+        client=client, pace_requests=False,
+    )
+    cacher.language_negotiator.api = transcripts
+
+    print(f"{args.channels} channels x {min(args.videos, 50)} videos, {args.minutes}-minute captions, "
+          f"api latency {args.api_latency_ms} ms, transcript latency {args.transcript_latency_ms} ms")
+    results = [crawl_pass(name, cacher, server, transcripts, catalog) for name in ("cold", "warm")]
+    server.shutdown()
+    client.drop_database(database)
+
+    for result in results:
+        report(result)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.no_check:
+        return
+    with open(args.thresholds, encoding="utf-8") as f:
+        thresholds = json.load(f)
+    workload = {name: getattr(args, name) for name in thresholds.get("workload", {})}
+    if workload != thresholds.get("workload", {}) or args.payloads:
+        print(f"\nthresholds are calibrated for {thresholds['workload']} without --payloads, not checked")
+        return
+    failures = [failure for result in results for failure in check(result, thresholds.get(result["pass"], {}))]
+    if failures:
+        print("\nREGRESSION:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    print(f"\nwithin thresholds ({os.path.relpath(args.thresholds)})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--channels", type=int, default=5)
+    parser.add_argument("--videos", type=int, default=50, help="uploads per channel (at most 50)")
+    parser.add_argument("--minutes", type=int, default=10, help="caption length in minutes")
+    parser.add_argument("--api-latency-ms", type=float, default=0.0, help="added to every Data API response")
+    parser.add_argument("--transcript-latency-ms", type=float, default=0.0,
+                        help="added to every transcript list and fetch")
+    parser.add_argument("--payloads", help="JSON list of recorded caption tracks (to_raw_data() output)")
+    parser.add_argument("--mongo-uri", help="local mongod to use instead of mongomock")
+    parser.add_argument("--thresholds", default=THRESHOLDS)
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--no-check", action="store_true", help="report only, ignore the thresholds")
+    main(parser.parse_args())
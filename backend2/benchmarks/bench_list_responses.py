@@ -0,0 +1,121 @@
+"""
+Micro-benchmark: response_model=List[NewsItem] vs the fast list response path.
+
+Runs both paths in-process over an ASGI transport (no network, no Mongo) with
+the same synthetic feed and reports requests/sec and latency percentiles.
+
+    cd backend2
+    python -m benchmarks.bench_list_responses --items 50 --requests 2000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timezone
+from typing import List
+
+import httpx
+from fastapi import FastAPI
+
+from models.youtubevid import NewsItem
+from utils.fast_json import NewsListResponse
+
+
+def make_feed(num_items, transcript_chars):
+    """Documents shaped like what db.news returns after popping _id"""
+    words = ("government minister said the match team players today india news report ").split()
+    transcript = " ".join(words[i % len(words)] for i in range(transcript_chars // 6))[:transcript_chars]
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "video_id": f"vid{i:05d}",
+            "title": f"Sample news headline number {i}",
+            "description": "Description text " * 8,
+            "video_url": f"https://www.youtube.com/watch?v=vid{i:05d}",
+            "thumbnail": f"https://i.ytimg.com/vi/vid{i:05d}/hqdefault.jpg",
+            "channel_id": "UCYPvAwZP8pZhSMW8qs7cVCw",
+            "channel_name": "Sample Channel",
+            "channel_url": "https://www.youtube.com/channel/UCYPvAwZP8pZhSMW8qs7cVCw",
+            "published_at": now.isoformat(),
+            "genre": "politics",
+            "transcript": transcript,
+            "transcript_language": "en",
+            "word_count": len(transcript.split()),
+            "cached_at": now,
+            "cache_version": "1.0",
+        }
+        for i in range(num_items)
+    ]
+
+
+def build_app(feed):
+    app = FastAPI()
+
+    @app.get("/model", response_model=List[NewsItem])
+    async def model_path():
+        # The endpoints hand FastAPI fresh dicts on every call
+        return [dict(doc) for doc in feed]
+
+    @app.get("/fast", response_model=List[NewsItem])
+    async def fast_path():
+        return NewsListResponse([dict(doc) for doc in feed])
+
+    return app
+
+
+async def run_path(client, path, num_requests, concurrency):
+    latencies = []
+    queue = asyncio.Queue()
+    for _ in range(num_requests):
+        queue.put_nowait(None)
+
+    async def worker():
+        while not queue.empty():
+            queue.get_nowait()
+            start = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return elapsed, sorted(latencies)
+
+
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def main(args):
+    feed = make_feed(args.items, args.transcript_chars)
+    app = build_app(feed)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Both paths must publish the same body
+        model_body = (await client.get("/model")).json()
+        fast_body = (await client.get("/fast")).json()
+        assert model_body == fast_body, "fast path diverged from the NewsItem schema"
+
+        print(f"items/response={args.items} transcript_chars={args.transcript_chars} "
+              f"requests={args.requests} concurrency={args.concurrency}")
+        print(f"{'path':<8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+        results = {}
+        for path in ("/model", "/fast"):
+            await run_path(client, path, min(100, args.requests), args.concurrency)  # warm-up
+            elapsed, latencies = await run_path(client, path, args.requests, args.concurrency)
+            rps = args.requests / elapsed
+            results[path] = rps
+            print(f"{path:<8}{rps:>10.1f}{statistics.median(latencies) * 1000:>10.2f}"
+                  f"{percentile(latencies, 99) * 1000:>10.2f}")
+        print(f"speedup: {results['/fast'] / results['/model']:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=50, help="news items per response")
+    parser.add_argument("--transcript-chars", type=int, default=4000, help="transcript length per item")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    asyncio.run(main(parser.parse_args()))
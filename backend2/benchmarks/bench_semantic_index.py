@@ -0,0 +1,96 @@
+"""
+Benchmark: semantic index fit, embedding and query latency.
+
+Builds a synthetic topical corpus (each document draws part of its words
+from one of --topics topic vocabularies), fits the hashing + SVD embedder
+on a sample, embeds --docs documents and pads the index to --rows rows
+with perturbed copies, then reports:
+  * fit time and embedding time per document
+  * topic precision of the top 10 results for fresh documents
+  * query latency (p50 / p95) for search and related at --rows rows
+
+    cd backend2
+    python -m benchmarks.bench_semantic_index --rows 100000
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from Transcripts.semantic_index import HashingSVDEmbedder, SemanticIndex
+
+
+def make_corpus(docs, topics, words, seed=0):
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocabulary = ["".join(rng.choice(letters) for _ in range(rng.randint(3, 8))) for _ in range(20000)]
+    topic_words = [rng.sample(vocabulary, 300) for _ in range(topics)]
+
+    def document(topic):
+        return " ".join(rng.choice(topic_words[topic]) if rng.random() < 0.3 else rng.choice(vocabulary)
+                        for _ in range(words))
+
+    return document, [document(i % topics) for i in range(docs)]
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    return statistics.median(ordered), ordered[int(len(ordered) * 0.95)]
+
+
+def main(args):
+    document, texts = make_corpus(args.docs, args.topics, args.words)
+
+    start = time.perf_counter()
+    embedder = HashingSVDEmbedder(dim=args.dim).fit(texts[:args.sample])
+    print(f"fit on {min(args.sample, len(texts))} documents: {time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    vectors = embedder.embed(texts)
+    print(f"embed: {(time.perf_counter() - start) / len(texts) * 1000:.2f} ms per {args.words}-word document")
+
+    precision = []
+    for topic in range(min(args.topics, 50)):
+        scores = vectors @ embedder.embed([document(topic)])[0]
+        top = np.argpartition(-scores, 10)[:10]
+        precision.append(np.mean(top % args.topics == topic))
+    print(f"topic precision@10: {np.mean(precision):.2f}")
+
+    rng = np.random.default_rng(0)
+    padding = max(args.rows - len(vectors), 0)
+    if padding:
+        copies = vectors[rng.integers(0, len(vectors), padding)]
+        copies = copies + rng.normal(0, 0.05, copies.shape).astype(np.float32)
+        vectors = np.concatenate([vectors, copies / np.linalg.norm(copies, axis=1, keepdims=True)])
+
+    index = SemanticIndex(directory=tempfile.mkdtemp(prefix="semantic_bench_"), model_path=None)
+    index.embedder = embedder
+    index._write_files([f"v{i}" for i in range(len(vectors))], vectors)
+    print(f"index: {len(vectors)} rows x {embedder.dim} dims, {vectors.nbytes / 1e6:.0f} MB memory-mapped")
+
+    queries = [document(i % args.topics) for i in range(args.queries)]
+    search_ms, related_ms = [], []
+    for i, query in enumerate(queries):
+        start = time.perf_counter()
+        index.search(query, limit=10)
+        search_ms.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        index.related(f"v{i}", limit=10)
+        related_ms.append((time.perf_counter() - start) * 1000)
+    print("search   p50 {:6.2f} ms  p95 {:6.2f} ms".format(*percentiles(search_ms)))
+    print("related  p50 {:6.2f} ms  p95 {:6.2f} ms".format(*percentiles(related_ms)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=10000, help="documents actually embedded")
+    parser.add_argument("--rows", type=int, default=100000, help="index size after padding")
+    parser.add_argument("--sample", type=int, default=2000, help="documents the embedder is fitted on")
+    parser.add_argument("--topics", type=int, default=50)
+    parser.add_argument("--words", type=int, default=400)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=200)
+    main(parser.parse_args())
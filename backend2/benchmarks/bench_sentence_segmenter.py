@@ -0,0 +1,123 @@
+"""
+Benchmark: sentence segmentation of unpunctuated auto-captions.
+
+Generates caption tracks the way YouTube's auto-captions look (lowercase,
+no punctuation, 4-8 word segments whose durations overlap the next one,
+a pause and a new caption line before most sentences, discourse markers
+opening some) with the true sentence starts known, then reports for the
+old '. ' split and for the segmenter with and without caption timings:
+  * sentences found and boundary precision / recall
+  * throughput, one transcript per call vs the whole batch in one call
+
+    cd backend2
+    python -m benchmarks.bench_sentence_segmenter --transcripts 200 --minutes 10
+"""
+import argparse
+import random
+import time
+
+from Transcripts.sentence_segmenter import SentenceSegmenter
+from Transcripts.transcript_segments import TranscriptSegments
+
+OPENERS = ["meanwhile", "in other news", "and now", "however", "so", "now", "moving on to"]
+
+
+def make_vocabulary(size, seed=0):
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(2, 9))) for _ in range(size)]
+
+
+def make_transcript(minutes, vocabulary, seed, pause_probability=0.7):
+    """(text, TranscriptSegments, true sentence start offsets)"""
+    rng = random.Random(seed)
+    rate = rng.uniform(2.2, 3.0)  # words per second
+    words, sentence_starts, pauses = [], [], {}
+    while len(words) < minutes * 60 * rate:
+        sentence_starts.append(len(words))
+        if rng.random() < 0.25:
+            words.extend(rng.choice(OPENERS).split())
+        words.extend(rng.choices(vocabulary, k=rng.randint(6, 24)))
+        if rng.random() < pause_probability:
+            pauses[len(words)] = rng.uniform(0.6, 1.5)
+
+    segments, clock, i = [], 0.0, 0
+    starts = set(sentence_starts)
+    while i < len(words):
+        n = rng.randint(4, 8)
+        # Caption lines break at pauses, and often at other sentence ends
+        for j in range(i + 1, min(i + n, len(words))):
+            if j in pauses or (j in starts and rng.random() < 0.5):
+                n = j - i
+                break
+        clock += pauses.get(i, 0.0)
+        segments.append({"text": " ".join(words[i:i + n]), "start": clock, "duration": n / rate + 2.0})
+        clock += n / rate + rng.uniform(-0.2, 0.2)
+        i += n
+
+    text = " ".join(words)
+    offsets, position = [], 0
+    for word in words:
+        offsets.append(position)
+        position += len(word) + 1
+    truth = {offsets[i] for i in sentence_starts}
+    return text, TranscriptSegments.from_transcript(segments, text), truth
+
+
+def score(found, truth):
+    hits = len(found & truth)
+    return hits / max(len(found), 1), hits / max(len(truth), 1)
+
+
+def timed(fn, runs):
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(args):
+    vocabulary = make_vocabulary(args.vocabulary)
+    corpus = [make_transcript(args.minutes, vocabulary, seed) for seed in range(args.transcripts)]
+    texts = [text for text, _, _ in corpus]
+    timings = [segments for _, segments, _ in corpus]
+    words = sum(len(text.split()) for text in texts)
+    truth = sum(len(t) for _, _, t in corpus)
+    segmenter = SentenceSegmenter()
+    print(f"{len(texts)} transcripts x {args.minutes} min, {words} words, {truth} true sentences")
+
+    def period_split(text):
+        spans, begin = [], 0
+        for part in text.split(". "):
+            spans.append((begin, begin + len(part)))
+            begin += len(part) + 2
+        return spans
+
+    variants = {
+        "'. ' split": lambda: [period_split(text) for text in texts],
+        "segmenter, text only": lambda: segmenter.split_batch(texts),
+        "segmenter, with timings": lambda: segmenter.split_batch(texts, timings),
+    }
+    for name, run in variants.items():
+        spans = run()
+        found = sum(len(doc) for doc in spans)
+        precision, recall = zip(*(score({begin for begin, _ in doc}, t) for doc, (_, _, t) in zip(spans, corpus)))
+        print(f"{name:24s} {found:7d} sentences  precision {sum(precision) / len(precision):5.2f}  "
+              f"recall {sum(recall) / len(recall):5.2f}")
+
+    per_doc = timed(lambda: [segmenter.split_batch([text], [segments]) for text, segments in zip(texts, timings)],
+                    args.runs)
+    batched = timed(lambda: segmenter.split_batch(texts, timings), args.runs)
+    print(f"one call per transcript: {per_doc * 1000:8.1f} ms  ({words / per_doc / 1e6:.2f} M words/s)")
+    print(f"one call per batch:      {batched * 1000:8.1f} ms  ({words / batched / 1e6:.2f} M words/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transcripts", type=int, default=200)
+    parser.add_argument("--minutes", type=int, default=10, help="transcript length in minutes")
+    parser.add_argument("--vocabulary", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=3)
+    main(parser.parse_args())
@@ -0,0 +1,119 @@
+"""
+Benchmark: legacy transcript cleaning/filtering vs EnhancedNewsFilter.analyze_transcript.
+
+The legacy path is what get_transcript_with_fallbacks used to do for every
+accepted transcript: is_meaningful_transcript (which cleans once) followed by
+clean_transcript_text (which cleans again). The new path analyzes once.
+
+    cd backend2
+    python -m benchmarks.bench_transcript_analyzer --minutes 60 --runs 20
+"""
+import argparse
+import random
+import re
+import time
+
+from Transcripts.cache_transcripts import EnhancedNewsFilter, MUSIC_INDICATORS
+
+
+def legacy_clean(text):
+    cleaned_text = text
+    for indicator in MUSIC_INDICATORS:
+        cleaned_text = cleaned_text.replace(indicator, " ")
+    cleaned_text = re.sub(r'\b(\w+)(\s+\1)+\b', r'\1', cleaned_text, flags=re.IGNORECASE)
+    return re.sub(r'\s+', ' ', cleaned_text).strip()
+
+
+def legacy_is_meaningful(text, min_words=10, min_unique_words=5):
+    cleaned_text = legacy_clean(text)
+    if not cleaned_text or len(cleaned_text.strip()) < 20:
+        return False
+    words = [word.strip('.,!?;:') for word in cleaned_text.split()
+             if len(word.strip('.,!?;:')) > 2]
+    if len(words) < min_words:
+        return False
+    if len(set(word.lower() for word in words)) < min_unique_words:
+        return False
+    music_word_count = sum(1 for word in words if any(
+        indicator.lower().replace('[', '').replace(']', '') in word.lower()
+        for indicator in MUSIC_INDICATORS
+    ))
+    if music_word_count / len(words) > 0.3:
+        return False
+    word_counts = {}
+    for word in words:
+        word_counts[word.lower()] = word_counts.get(word.lower(), 0) + 1
+    if max(word_counts.values()) / len(words) > 0.4:
+        return False
+    return True
+
+
+VOCABULARY = (
+    "the government announced new measures today minister said parliament session "
+    "election results counting police investigation court hearing match team "
+    "players tournament weather monsoon rainfall delhi mumbai india economy market "
+    "सरकार ने आज घोषणा की मंत्री ने कहा चुनाव"
+).split()
+
+
+def make_transcript(minutes, seed=0):
+    """Auto-caption-like text: ~150 words/minute, markers, stutters, no punctuation"""
+    rng = random.Random(seed)
+    words = []
+    for _ in range(minutes * 150):
+        roll = rng.random()
+        if roll < 0.01:
+            words.append(rng.choice(["[Music]", "[Applause]", "[music]", "[Laughter]"]))
+        elif roll < 0.02 and words:
+            words.append(words[-1])
+        else:
+            words.append(rng.choice(VOCABULARY))
+        if rng.random() < 0.05:
+            words.append("\n")
+    return " ".join(words)
+
+
+def timed(fn, texts, runs):
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(args):
+    content_filter = EnhancedNewsFilter()
+    texts = [make_transcript(args.minutes, seed) for seed in range(args.transcripts)]
+
+    # Same cleaned text and the same accept/reject decision
+    for text in texts + ["[Music] Heat Heat Heat [Music] [Applause]"]:
+        analysis = content_filter.analyze_transcript(text)
+        assert analysis.cleaned_text == legacy_clean(text)
+        assert analysis.is_meaningful() == legacy_is_meaningful(text)
+
+    def legacy(text):
+        if legacy_is_meaningful(text):
+            legacy_clean(text)
+
+    def single_pass(text):
+        analysis = content_filter.analyze_transcript(text)
+        if analysis.is_meaningful():
+            analysis.cleaned_text
+
+    words = sum(len(text.split()) for text in texts) // len(texts)
+    legacy_time = timed(legacy, texts, args.runs)
+    new_time = timed(single_pass, texts, args.runs)
+    print(f"{args.transcripts} transcripts x {args.minutes} min (~{words} words each), best of {args.runs}")
+    print(f"legacy clean+filter:   {legacy_time / len(texts) * 1000:8.2f} ms/transcript")
+    print(f"analyze_transcript:    {new_time / len(texts) * 1000:8.2f} ms/transcript")
+    print(f"speedup: {legacy_time / new_time:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=int, default=60, help="transcript length in minutes")
+    parser.add_argument("--transcripts", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=10)
+    main(parser.parse_args())
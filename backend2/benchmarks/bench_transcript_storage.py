@@ -0,0 +1,153 @@
+"""
+Benchmark: inline transcripts vs the compressed out-of-line transcript store.
+
+Reports, for synthetic cleaned transcripts of the given length:
+  * bytes per news document with the transcript inline vs with a preview
+  * compressed transcript size and (de)compression time per codec
+  * time to decode a 50-item feed page of each document shape (what pymongo
+    does for every feed query, on top of WiredTiger reading those bytes)
+
+With --mongo-uri it also inserts both shapes into a scratch database and
+times the real feed query (channel_id + cached_at sort, limit 50) on each.
+
+    cd backend2
+    python -m benchmarks.bench_transcript_storage --minutes 15 --docs 2000
+    python -m benchmarks.bench_transcript_storage --mongo-uri mongodb://localhost:27017
+"""
+import argparse
+import random
+import statistics
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+
+import bson
+
+from Transcripts.transcript_store import make_preview, zstandard
+
+
+def make_vocabulary(size, seed=0):
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(2, 9))) for _ in range(size)]
+
+
+def make_transcript(minutes, vocabulary, seed):
+    """Cleaned caption text, ~150 words/minute, Zipf-like word frequencies"""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    return " ".join(rng.choices(vocabulary, weights=weights, k=minutes * 150))
+
+
+def make_doc(i, transcript, external):
+    now = datetime.now(timezone.utc)
+    return {
+        "video_id": f"vid{i:06d}",
+        "title": f"Sample news headline number {i}",
+        "description": "Description text " * 8,
+        "video_url": f"https://www.youtube.com/watch?v=vid{i:06d}",
+        "thumbnail": f"https://i.ytimg.com/vi/vid{i:06d}/hqdefault.jpg",
+        "channel_id": f"UCchannel{i % 20:02d}",
+        "channel_name": "Sample Channel",
+        "genre": "politics",
+        "transcript": make_preview(transcript) if external else transcript,
+        "transcript_external": external,
+        "word_count": len(transcript.split()),
+        "cached_at": now - timedelta(minutes=i),
+    }
+
+
+def codecs():
+    available = {"zlib-6": (lambda d: zlib.compress(d, 6), zlib.decompress),
+                 "zlib-9": (lambda d: zlib.compress(d, 9), zlib.decompress)}
+    if zstandard is not None:
+        available["zstd-10"] = (zstandard.ZstdCompressor(level=10).compress,
+                                zstandard.ZstdDecompressor().decompress)
+    return available
+
+
+def timed(fn, runs):
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def mongo_feed_latency(uri, inline_docs, external_docs, queries):
+    from pymongo import MongoClient
+
+    client = MongoClient(uri)
+    db = client["NewsByte_AI_bench_transcripts"]
+    try:
+        results = {}
+        for name, docs in (("inline", inline_docs), ("external", external_docs)):
+            collection = db[name]
+            collection.drop()
+            collection.insert_many([dict(doc) for doc in docs])
+            collection.create_index([("channel_id", 1), ("cached_at", -1)])
+            latencies = []
+            for i in range(queries):
+                start = time.perf_counter()
+                list(collection.find({"channel_id": f"UCchannel{i % 20:02d}"}, {"_id": 0})
+                     .sort("cached_at", -1).limit(50))
+                latencies.append((time.perf_counter() - start) * 1000)
+            stats = db.command("collStats", name)
+            results[name] = (statistics.median(latencies), stats.get("size", 0), stats.get("storageSize", 0))
+        return results
+    finally:
+        client.drop_database(db.name)
+
+
+def main(args):
+    vocabulary = make_vocabulary(args.vocabulary)
+    transcripts = [make_transcript(args.minutes, vocabulary, seed) for seed in range(args.distinct)]
+    inline_docs = [make_doc(i, transcripts[i % len(transcripts)], False) for i in range(args.docs)]
+    external_docs = [make_doc(i, transcripts[i % len(transcripts)], True) for i in range(args.docs)]
+
+    raw = [text.encode("utf-8") for text in transcripts]
+    raw_avg = sum(map(len, raw)) / len(raw)
+    inline_size = sum(len(bson.encode(doc)) for doc in inline_docs) / len(inline_docs)
+    external_size = sum(len(bson.encode(doc)) for doc in external_docs) / len(external_docs)
+
+    print(f"{args.distinct} transcripts x {args.minutes} min (~{raw_avg / 1024:.1f} KB raw each)")
+    print(f"news document, transcript inline:  {inline_size / 1024:8.1f} KB")
+    print(f"news document, preview only:       {external_size / 1024:8.1f} KB  "
+          f"({inline_size / external_size:.1f}x smaller)")
+
+    for name, (compress, decompress) in codecs().items():
+        blobs = [compress(data) for data in raw]
+        ratio = sum(map(len, raw)) / sum(map(len, blobs))
+        compress_time = timed(lambda: [compress(data) for data in raw], args.runs) / len(raw)
+        decompress_time = timed(lambda: [decompress(blob) for blob in blobs], args.runs) / len(raw)
+        print(f"{name:8s} ratio {ratio:5.2f}x  compress {compress_time * 1000:6.2f} ms  "
+              f"decompress {decompress_time * 1000:6.2f} ms per transcript")
+
+    page = 50
+    inline_page = [bson.encode(doc) for doc in inline_docs[:page]]
+    external_page = [bson.encode(doc) for doc in external_docs[:page]]
+    inline_decode = timed(lambda: [bson.decode(data) for data in inline_page], args.runs)
+    external_decode = timed(lambda: [bson.decode(data) for data in external_page], args.runs)
+    print(f"decode {page}-item feed page: inline {inline_decode * 1000:.2f} ms, "
+          f"preview {external_decode * 1000:.2f} ms ({inline_decode / external_decode:.1f}x)")
+    print(f"feed page bytes: inline {sum(map(len, inline_page)) / 1024:.0f} KB, "
+          f"preview {sum(map(len, external_page)) / 1024:.0f} KB")
+
+    if args.mongo_uri:
+        results = mongo_feed_latency(args.mongo_uri, inline_docs, external_docs, args.queries)
+        for name, (median_ms, size, storage) in results.items():
+            print(f"mongo {name:8s}: feed query p50 {median_ms:6.2f} ms, "
+                  f"collection {size / 1e6:7.1f} MB, on disk {storage / 1e6:7.1f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=int, default=15, help="transcript length in minutes")
+    parser.add_argument("--distinct", type=int, default=20, help="distinct transcripts generated")
+    parser.add_argument("--docs", type=int, default=2000, help="news documents per shape")
+    parser.add_argument("--vocabulary", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--mongo-uri", default=None, help="run the feed query against this server too")
+    main(parser.parse_args())
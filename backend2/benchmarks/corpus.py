@@ -0,0 +1,71 @@
+"""
+Synthetic caption corpus shared by the benchmarks.
+
+Tracks look like YouTube auto-captions: lowercase, unpunctuated, 4-8 word
+segments at a steady speaking rate, with genre keywords sprinkled in so
+the classifiers have something to find. Everything is seeded, so a run
+on one commit sees exactly the same text as a run on another.
+"""
+import random
+
+from Transcripts.genre_classifier import GENRE_KEYWORDS
+
+ENGLISH_WORDS = (
+    "the a and to of in that is for on it with as was at by this from be have "
+    "are has said people will year new government today about after state more "
+    "city report two first over time also officials country last told week "
+    "according million police minister public back national local since while "
+    "news party could where three health support plan during other market water "
+    "district team issue many still some court leaders power workers price rain "
+    "residents morning evening across region percent rise report statement early"
+).split()
+
+HINDI_WORDS = (
+    "और के में की है को से पर यह भी एक था कि लिए नहीं हैं ने तो जो कर "
+    "सरकार लोग आज देश राज्य शहर पुलिस खबर मामले बाद साथ बारे कहा गया "
+    "रहे बात समय दिन साल अब तक वहां इस उन्होंने बताया जानकारी मौके अधिकारी"
+).split()
+
+MUSIC_LINES = ["[Music]", "[Applause]", "heat heat heat", "[Music] [Music]"]
+
+# Transcript lengths in minutes
+LENGTHS = {"short": 1, "10min": 10, "1h": 60}
+
+_KEYWORDS = {
+    "en": [word for genre in GENRE_KEYWORDS.values() for word in genre if word.isascii()],
+    "hi": [word for genre in GENRE_KEYWORDS.values() for word in genre if not word.isascii()],
+}
+
+
+def make_captions(minutes, language="en", seed=0, music_share=0.0):
+    """Raw caption segments ({"text", "start", "duration"}) of a `minutes` long track"""
+    rng = random.Random(f"{language}-{minutes}-{seed}")
+    vocabulary = HINDI_WORDS if language == "hi" else ENGLISH_WORDS
+    keywords = _KEYWORDS.get(language) or _KEYWORDS["en"]
+    rate = rng.uniform(2.2, 3.0)  # words per second
+    segments, clock = [], 0.0
+    while clock < minutes * 60:
+        n = rng.randint(4, 8)
+        if rng.random() < music_share:
+            text = rng.choice(MUSIC_LINES)
+        else:
+            words = rng.choices(vocabulary, k=n)
+            if rng.random() < 0.3:
+                words[rng.randrange(n)] = rng.choice(keywords)
+            text = " ".join(words)
+        segments.append({"text": text, "start": round(clock, 2), "duration": round(n / rate + 1.5, 2)})
+        clock += n / rate
+    return segments
+
+
+def captions_text(segments):
+    return " ".join(segment["text"] for segment in segments)
+
+
+def transcript_corpus(seed=0):
+    """{name: raw segments} of every length in English and Hindi"""
+    return {
+        f"{name}-{language}": make_captions(minutes, language, seed)
+        for name, minutes in LENGTHS.items()
+        for language in ("en", "hi")
+    }
@@ -0,0 +1,276 @@
+"""
+Load test: mixed read traffic against main.app on one Linux box.
+
+For every scenario (--scenarios 10k,100k,1m) a local MongoDB database
+(--db, never the production one) is seeded with that many news
+documents spread over --channels channels and --days days, `uvicorn
+main:app` is booted against it in a subprocess, and closed-loop clients
+send a weighted mix of requests at each --concurrency level for
+--duration seconds:
+  feed      /get_cached_news (latest items of a channel)
+  channel   /get_news_by_channel/{channel_id}
+  channels  /get_news_by_channels (five channels in one request)
+  summary   /get_summary/{video_id}
+  search    /get_cached_news?query= (title search within a channel)
+  health    /health
+Throughput, p50/p95/p99 latency and error rate (5xx and transport
+errors; 4xx are counted apart) are reported per level and endpoint.
+
+Needs a local mongod; seeding 1M documents takes a few minutes, --reuse
+keeps a database that already holds the scenario's documents.
+
+    cd backend2
+    python -m benchmarks.load_test --scenarios 10k,100k --concurrency 1,8,32,128
+    python -m benchmarks.load_test --scenarios 1m --reuse --workers 4 --json load.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import numpy as np
+from pymongo import MongoClient
+
+from benchmarks.corpus import ENGLISH_WORDS
+from models.news_document import normalize_news_document
+
+GENRES = ["politics", "sports", "technology", "entertainment", "crime", "general"]
+
+# Relative request weights of the traffic mix
+MIX = {"feed": 30, "channel": 20, "channels": 10, "summary": 25, "search": 10, "health": 5}
+
+
+def parse_size(text):
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip("km")) * scale)
+
+
+def channel_ids(channels):
+    return [f"UCload{c:05d}" for c in range(channels)]
+
+
+def make_document(i, channels, now, days, rng):
+    channel_id = channels[i % len(channels)]
+    title = " ".join(rng.choices(ENGLISH_WORDS, k=8)).capitalize()
+    doc = {
+        "video_id": f"load{i:08d}",
+        "title": title,
+        "description": " ".join(rng.choices(ENGLISH_WORDS, k=30)),
+        "video_url": f"https://www.youtube.com/watch?v=load{i:08d}",
+        "thumbnail": f"https://i.ytimg.com/vi/load{i:08d}/hqdefault.jpg",
+        "channel_id": channel_id,
+        "channel_name": f"Channel {channel_id[-5:]}",
+        "published_at": now.isoformat(),
+        "genre": GENRES[i % len(GENRES)],
+        "genres": [GENRES[i % len(GENRES)]],
+        "transcript": " ".join(rng.choices(ENGLISH_WORDS, k=45)),
+        "transcript_language": "en",
+        "word_count": 600,
+        "story_id": f"load{i:08d}",
+        "cached_at": now - timedelta(seconds=rng.uniform(0, days * 86400)),
+    }
+    if i % 3 == 0:
+        doc["summary"] = " ".join(rng.choices(ENGLISH_WORDS, k=60))
+        doc["summary_created_at"] = now
+        doc["summary_status"] = "completed"
+    return normalize_news_document(doc)
+
+
+def seed(client, db_name, docs, channels, days, reuse, batch_size=5000):
+    db = client[db_name]
+    marker = {"_id": "load_test", "docs": docs, "channels": len(channels), "days": days}
+    if reuse and db.load_test_meta.find_one({"_id": "load_test"}) == marker:
+        print(f"reusing {db_name} with {docs} documents")
+        return
+    client.drop_database(db_name)
+    rng = random.Random(0)
+    now = datetime.now(timezone.utc)
+    start = time.perf_counter()
+    for begin in range(0, docs, batch_size):
+        db.news.insert_many(
+            [make_document(i, channels, now, days, rng) for i in range(begin, min(begin + batch_size, docs))],
+            ordered=False,
+        )
+    db.load_test_meta.insert_one(marker)
+    print(f"seeded {docs} documents into {db_name} in {time.perf_counter() - start:.1f} s")
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def boot_server(args, db_name, timeout=600):
+    """uvicorn main:app in a subprocess; returns (process, base_url) once /health answers"""
+    port = free_port()
+    env = dict(os.environ, MONGO_URI=args.mongo_uri, MONGO_DB_NAME=db_name,
+               SEMANTIC_INDEX_DIR=tempfile.mkdtemp(prefix="load_semantic_"), LOG_LEVEL=args.log_level)
+    env.pop("TRACE_FILE", None)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(args.workers), "--log-level", "warning", "--no-access-log"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), env=env,
+        stdout=subprocess.DEVNULL, stderr=None if args.server_output else subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            sys.exit(f"server exited with status {process.returncode} (rerun with --server-output)")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=2).status_code == 200:
+                return process, base_url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    process.terminate()
+    sys.exit(f"server did not answer /health within {timeout} s")
+
+
+class Traffic:
+    """Picks the next request of the weighted mix"""
+
+    def __init__(self, channels, summary_ids, seed=0):
+        self.channels = channels
+        self.summary_ids = summary_ids
+        self.names = list(MIX)
+        self.weights = list(MIX.values())
+        self.rng = random.Random(seed)
+
+    def next(self):
+        rng = self.rng
+        name = rng.choices(self.names, self.weights)[0]
+        channel = rng.choice(self.channels)
+        if name == "feed":
+            return name, "/get_cached_news", {"channel_id": channel, "limit": 20}
+        if name == "channel":
+            return name, f"/get_news_by_channel/{channel}", {"limit": 20}
+        if name == "channels":
+            return name, "/get_news_by_channels", {"channel_ids": ",".join(rng.sample(self.channels, 5)),
+                                                   "per_channel": 10}
+        if name == "summary":
+            return name, f"/get_summary/{rng.choice(self.summary_ids)}", None
+        if name == "search":
+            return name, "/get_cached_news", {"channel_id": channel, "query": rng.choice(ENGLISH_WORDS),
+                                              "limit": 20, "hours_back": 24 * 7}
+        return name, "/health", None
+
+
+async def run_level(client, traffic, concurrency, duration):
+    """{endpoint: {"latencies": [...], "errors": n, "client_errors": n}} of one concurrency level"""
+    results = {name: {"latencies": [], "errors": 0, "client_errors": 0} for name in MIX}
+    deadline = time.perf_counter() + duration
+
+    async def user():
+        while time.perf_counter() < deadline:
+            name, path, params = traffic.next()
+            start = time.perf_counter()
+            try:
+                response = await client.get(path, params=params)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = None
+            elapsed = time.perf_counter() - start
+            entry = results[name]
+            if status is None or status >= 500:
+                entry["errors"] += 1
+            elif status >= 400:
+                entry["client_errors"] += 1
+            else:
+                entry["latencies"].append(elapsed)
+
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    return results
+
+
+def summarize(results, duration):
+    rows = {}
+    for name, entry in results.items():
+        latencies = np.array(entry["latencies"]) * 1000
+        total = len(latencies) + entry["errors"] + entry["client_errors"]
+        if not total:
+            continue
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (float("nan"),) * 3
+        rows[name] = {"requests": total, "rps": total / duration, "p50_ms": float(p50), "p95_ms": float(p95),
+                      "p99_ms": float(p99), "error_rate": entry["errors"] / total,
+                      "client_errors": entry["client_errors"]}
+    total = sum(row["requests"] for row in rows.values())
+    errors = sum(row["error_rate"] * row["requests"] for row in rows.values())
+    latencies = np.concatenate([np.array(entry["latencies"]) * 1000 for entry in results.values()] or [[]])
+    rows["all"] = {"requests": total, "rps": total / duration,
+                   "p50_ms": float(np.percentile(latencies, 50)) if len(latencies) else float("nan"),
+                   "p95_ms": float(np.percentile(latencies, 95)) if len(latencies) else float("nan"),
+                   "p99_ms": float(np.percentile(latencies, 99)) if len(latencies) else float("nan"),
+                   "error_rate": errors / max(total, 1), "client_errors": 0}
+    return rows
+
+
+def report(scenario, concurrency, rows):
+    print(f"\n{scenario} docs, concurrency {concurrency}")
+    print(f"  {'endpoint':9s} {'requests':>9s} {'req/s':>9s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'errors':>7s}")
+    for name, row in rows.items():
+        print(f"  {name:9s} {row['requests']:9d} {row['rps']:9.1f} {row['p50_ms']:9.2f} {row['p95_ms']:9.2f} "
+              f"{row['p99_ms']:9.2f} {row['error_rate']:7.2%}")
+
+
+async def drive(base_url, traffic, levels, duration, scenario, warmup):
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        await run_level(client, traffic, min(levels), warmup)
+        outcome = []
+        for concurrency in levels:
+            rows = summarize(await run_level(client, traffic, concurrency, duration), duration)
+            report(scenario, concurrency, rows)
+            outcome.append({"docs": scenario, "concurrency": concurrency, "endpoints": rows})
+        return outcome
+
+
+def main(args):
+    channels = channel_ids(args.channels)
+    levels = [int(level) for level in args.concurrency.split(",")]
+    client = MongoClient(args.mongo_uri)
+    outcome = []
+    for scenario in args.scenarios.split(","):
+        docs = parse_size(scenario)
+        seed(client, args.db, docs, channels, args.days, args.reuse)
+        summary_ids = [f"load{i:08d}" for i in range(0, docs, 3)]
+        process, base_url = boot_server(args, args.db)
+        try:
+            print(f"server up at {base_url} with {args.workers} worker(s)")
+            traffic = Traffic(channels, summary_ids)
+            outcome += asyncio.run(drive(base_url, traffic, levels, args.duration, docs, args.warmup))
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(outcome, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default="10k", help="comma separated document counts, e.g. 10k,100k,1m")
+    parser.add_argument("--concurrency", default="1,8,32,128", help="comma separated client counts")
+    parser.add_argument("--duration", type=float, default=20, help="seconds per concurrency level")
+    parser.add_argument("--warmup", type=float, default=5, help="seconds of traffic before measuring")
+    parser.add_argument("--channels", type=int, default=50)
+    parser.add_argument("--days", type=int, default=30, help="cached_at spread of the seeded documents")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017")
+    parser.add_argument("--db", default="NewsByte_AI_load", help="database seeded and served (dropped on reseed)")
+    parser.add_argument("--reuse", action="store_true", help="keep an already seeded database")
+    parser.add_argument("--log-level", default="WARNING", help="LOG_LEVEL of the server")
+    parser.add_argument("--server-output", action="store_true", help="show the server's stderr")
+    parser.add_argument("--json", help="also write the results to this file")
+    main(parser.parse_args())
@@ -8,4 +8,4 @@ MONGO_URI =  os.getenv("MONGO_URI")
 client = MongoClient(MONGO_URI)
 
 # Database name
-db = client["NewsByte_AI"]
+db = client[os.getenv("MONGO_DB_NAME", "NewsByte_AI")]
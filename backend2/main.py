@@ -1,36 +1,64 @@
 import os
 import sys
+import time
 from fastapi import Query
 from dotenv import load_dotenv
-from Transcripts.final_youtube_retrieval import get_latest_news_with_caching
+from Transcripts.final_youtube_retrieval import (
+    get_latest_news_with_caching, backfill_news_schema, reclassify_genres, assign_story_ids,
+    get_negative_cache_stats, clear_negative_cache, externalize_transcripts, build_semantic_index
+)
+from Transcripts.news_stats import NewsStatsTracker
+from Summarizer.summary_text import simple_extractive_summary
+from Transcripts.sentence_segmenter import truncate_at_sentence
+from Transcripts.story_dedup import story_index, collapse_stories
+from Transcripts.semantic_index import semantic_index, document_text
+from Transcripts.transcript_segments import TranscriptSegments
+from Transcripts.transcript_store import TranscriptStore
+from models.news_document import LIST_PROJECTION
 from models.youtubevid import NewsItem
-from fastapi import FastAPI, Depends, HTTPException, status, Body
+from utils.fast_json import NewsListResponse, NewsFeedsResponse
+from utils.feed_index import hot_feed_index
+from utils.leases import LeaseManager
+from utils.log_config import configure_logging
+from utils.metrics import registry as metrics_registry, track_stage, FEED_RESPONSES
+from utils.profiling import request_profiler
+from utils.route_latency import route_latency
+from utils.single_flight import SingleFlight
+from utils.tracing import tracer, summarize_spans
+from fastapi import FastAPI, Depends, HTTPException, status, Body, Response, Header
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from typing import Optional, List
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from pymongo import MongoClient
+from pymongo import MongoClient, ReturnDocument
 from bson.objectid import ObjectId
 from models.token import Token
 from models.token_data import TokenData
 from models.user import User, UserInDB
 import logging
+import threading
 from typing import Dict, Any
 import requests
 
 
 load_dotenv()
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+# Set up logging: JSON lines written by a background thread (see utils/log_config.py)
+configure_logging()
 logger = logging.getLogger(__name__)
+access_logger = logging.getLogger("main.access")
 
 # MongoDB Configuration
 MONGO_URI = os.getenv("MONGO_URI")
+MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "NewsByte_AI")  # the load test points this at a seeded copy
 client = MongoClient(MONGO_URI)
-db = client["NewsByte_AI"]
+db = client[MONGO_DB_NAME]
 users_collection = db["users"]
+news_stats = NewsStatsTracker(db)
+transcript_store = TranscriptStore(db)
+lease_manager = LeaseManager(db)  # one worker cluster-wide crawls a feed or summarizes a video
 
 # JWT Configuration
 SECRET_KEY = os.getenv("SECRET_KEY")
@@ -40,6 +68,36 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 # FastAPI App
 app = FastAPI()
 
+@app.on_event("startup")
+def initialize_news_stats():
+    # One-time aggregation when the stats documents do not exist yet,
+    # built by whichever worker takes the stats:rebuild lease
+    news_stats.ensure_initialized(lease_manager)
+
+@app.on_event("startup")
+def load_hot_feed_index():
+    # Newest items per channel, served by the channel read endpoints
+    try:
+        hot_feed_index.rebuild(db.news)
+    except Exception as e:
+        logger.error(f"Could not load hot feed index, channel reads will use MongoDB: {e}")
+
+@app.on_event("startup")
+def load_story_index():
+    # Signatures of recent transcripts for near-duplicate story detection
+    try:
+        story_index.rebuild(db.news)
+    except Exception as e:
+        logger.error(f"Could not load story index, new uploads start new stories: {e}")
+
+@app.on_event("startup")
+def load_semantic_index():
+    # Memory-mapped document embeddings for semantic search
+    try:
+        semantic_index.load()
+    except Exception as e:
+        logger.error(f"Could not load semantic index, semantic search is unavailable: {e}")
+
 # Security & Models
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
@@ -50,78 +108,32 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 HUGGINGFACE_API_KEY = os.getenv("HUGGING_FACE")  # Add this to Render env vars
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")  # Alternative
 
+# Opt-in: serialize list endpoints straight from the stored documents with a
+# fast JSON encoder instead of pydantic validation + jsonable_encoder.
+# The response body keeps the NewsItem schema either way.
+FAST_LIST_RESPONSES = os.getenv("FAST_LIST_RESPONSES", "false").lower() in ("1", "true", "yes")
 
-# Add this validation function to main.py
+# Stale-while-revalidate for /get_latest_news channel feeds: a feed crawled
+# less than FEED_SOFT_TTL_SECONDS ago is served from the cache as is, an
+# older one (up to FEED_MAX_STALE_SECONDS) is served from the cache while a
+# background crawl refreshes it, and beyond that the request crawls.
+FEED_SOFT_TTL_SECONDS = int(os.getenv("FEED_SOFT_TTL_SECONDS", "300"))
+FEED_MAX_STALE_SECONDS = int(os.getenv("FEED_MAX_STALE_SECONDS", "21600"))
 
-# Updated validation function
-def validate_and_fix_news_data(results, expected_channel_id):
-    """
-    Enhanced validation and fix news data before returning
-    """
-    validated_results = []
-    
-    for item in results:
-        if isinstance(item, dict):
-            # Ensure ALL required fields exist with meaningful values
-            required_fields = ['video_id', 'title', 'video_url']
-            
-            # Check if required fields exist and are not empty
-            valid_item = True
-            for field in required_fields:
-                if not item.get(field) or str(item.get(field, '')).strip() == '':
-                    logger.warning(f"Skipping invalid item missing/empty {field}: {item.get('title', 'unknown')}")
-                    valid_item = False
-                    break
-            
-            if not valid_item:
-                continue
-            
-            # Fix missing channel_id
-            if not item.get('channel_id') and expected_channel_id:
-                item['channel_id'] = expected_channel_id
-                logger.info(f"Fixed missing channel_id for video: {item.get('video_id', 'unknown')}")
-            
-            # Ensure optional fields have default values
-            defaults = {
-                'description': item.get('description', ''),
-                'thumbnail': item.get('thumbnail', ''),
-                'channel_name': item.get('channel_name', ''),
-                'channel_url': item.get('channel_url', ''),
-                'published_at': item.get('published_at', ''),
-                'genre': item.get('genre', 'general'),
-                'transcript': item.get('transcript', 'No transcript available'),
-                'transcript_language': item.get('transcript_language', 'none'),
-                'word_count': item.get('word_count', 0),
-                'cached_at': item.get('cached_at', datetime.utcnow()),
-                'source': item.get('source', 'validated')
-            }
-            
-            # Apply defaults for missing fields
-            for field, default_value in defaults.items():
-                if field not in item or item[field] is None:
-                    item[field] = default_value
-            
-            validated_results.append(item)
-    
-    logger.info(f"Validated {len(validated_results)} out of {len(results)} items")
-    return validated_results
 
-# Simple text-based summarization fallback
-def simple_extractive_summary(text: str, max_sentences: int = 3) -> str:
-    """
-    Simple extractive summarization without ML models
-    """
-    sentences = text.split('. ')
-    if len(sentences) <= max_sentences:
-        return text
-    
-    # Take first sentence, middle sentence, and last sentence
-    if len(sentences) >= 3:
-        indices = [0, len(sentences)//2, -1]
-        summary_sentences = [sentences[i] for i in indices]
-        return '. '.join(summary_sentences) + '.'
-    else:
-        return '. '.join(sentences[:max_sentences]) + '.'
+def news_list_response(items: List[dict]):
+    """Return a list endpoint result through the fast path when enabled"""
+    if FAST_LIST_RESPONSES:
+        return NewsListResponse(items)
+    return items
+
+
+def news_feeds_response(feeds: Dict[str, List[dict]]):
+    """Same as news_list_response for {channel_id: [items]} results"""
+    if FAST_LIST_RESPONSES:
+        return NewsFeedsResponse(feeds)
+    return feeds
+
 
 def huggingface_api_summary(text: str, api_key: str) -> Dict[str, Any]:
     """
@@ -134,7 +146,7 @@ def huggingface_api_summary(text: str, api_key: str) -> Dict[str, Any]:
         response = requests.post(
             API_URL,
             headers=headers,
-            json={"inputs": text[:1000]},  # Limit input length
+            json={"inputs": truncate_at_sentence(text, 1000)},  # Limit input length
             timeout=30
         )
         
@@ -174,7 +186,7 @@ def openai_summary(text: str, api_key: str) -> Dict[str, Any]:
             "model": "gpt-3.5-turbo",
             "messages": [
                 {"role": "system", "content": "Summarize the following news transcript in 2-3 sentences."},
-                {"role": "user", "content": text[:2000]}
+                {"role": "user", "content": truncate_at_sentence(text, 2000)}
             ],
             "max_tokens": 150,
             "temperature": 0.3
@@ -209,9 +221,10 @@ def openai_summary(text: str, api_key: str) -> Dict[str, Any]:
             "method": "openai_api"
         }
 
-def Phoenix_Sum(news_text: str = None) -> Dict[str, Any]:
+def Phoenix_Sum(news_text: str = None, segments=None) -> Dict[str, Any]:
     """
-    Memory-efficient summarization using external APIs or simple extraction
+    Memory-efficient summarization using external APIs or simple extraction.
+    `segments` are the transcript's caption timings, when known.
     """
     try:
         if not news_text or len(news_text.strip()) < 50:
@@ -222,12 +235,16 @@ def Phoenix_Sum(news_text: str = None) -> Dict[str, Any]:
             }
 
         original_length = len(news_text)
+        if segments is not None and news_text[:1].isspace():
+            segments = None  # offsets index the unstripped text
         news_text = news_text.strip()
 
         # Try external APIs first
         if HUGGINGFACE_API_KEY:
             logger.info("Attempting Hugging Face API summarization")
-            result = huggingface_api_summary(news_text, HUGGINGFACE_API_KEY)
+            with track_stage("summarize_huggingface_api") as stage:
+                result = huggingface_api_summary(news_text, HUGGINGFACE_API_KEY)
+                stage.failed = result["status"] != "success"
             if result["status"] == "success":
                 result.update({
                     "timestamp": datetime.utcnow().isoformat(),
@@ -241,7 +258,9 @@ def Phoenix_Sum(news_text: str = None) -> Dict[str, Any]:
 
         if OPENAI_API_KEY:
             logger.info("Attempting OpenAI API summarization")
-            result = openai_summary(news_text, OPENAI_API_KEY)
+            with track_stage("summarize_openai_api") as stage:
+                result = openai_summary(news_text, OPENAI_API_KEY)
+                stage.failed = result["status"] != "success"
             if result["status"] == "success":
                 result.update({
                     "timestamp": datetime.utcnow().isoformat(),
@@ -255,7 +274,8 @@ def Phoenix_Sum(news_text: str = None) -> Dict[str, Any]:
 
         # Fallback to simple extractive summary
         logger.info("Using simple extractive summarization as fallback")
-        simple_summary = simple_extractive_summary(news_text)
+        with track_stage("summarize_extractive"):
+            simple_summary = simple_extractive_summary(news_text, segments=segments)
         
         return {
             "status": "success",
@@ -362,13 +382,20 @@ async def get_current_active_user(current_user: UserInDB = Depends(get_current_u
 def get_cached_news_from_db(channel_id: str = None, query: str = None, limit: int = 50, hours_back: int = 24) -> List[dict]:
     """Retrieve cached news from MongoDB with STRICT channel_id filtering and better error handling"""
     try:
+        # Plain channel feeds are served from the in-process hot feed index
+        if channel_id and not query:
+            cutoff_time = datetime.utcnow() - timedelta(hours=hours_back)
+            indexed = hot_feed_index.get_feed(channel_id, limit, cutoff=cutoff_time)
+            if indexed is not None:
+                return indexed
+        
         filter_query = {}
         
         # STRICT Channel ID filtering - this is the key fix
         if channel_id:
             # Make sure we're filtering exactly by channel_id
             filter_query["channel_id"] = {"$eq": channel_id}  # Exact match
-            logger.info(f"STRICT filtering by channel_id: {channel_id}")
+            logger.debug(f"STRICT filtering by channel_id: {channel_id}")
         
         # Time-based filter
         cutoff_time = datetime.utcnow() - timedelta(hours=hours_back)
@@ -414,37 +441,18 @@ def get_cached_news_from_db(channel_id: str = None, query: str = None, limit: in
             # Neither channel_id nor query provided
             filter_query = time_filter
         
-        # Execute query with error handling
+        # Execute query with error handling. Documents are normalized on
+        # write, so only the ObjectId has to be left out.
         try:
-            cursor = db.news.find(filter_query).sort("cached_at", -1).limit(limit)
-            results = []
-            
-            for item in cursor:
-                # Remove MongoDB ObjectId and validate basic structure
-                if '_id' in item:
-                    item.pop('_id', None)
-                
-                # Ensure item has basic required fields
-                if item.get('video_id') and item.get('title') and item.get('video_url'):
-                    results.append(item)
-                else:
-                    logger.warning(f"Skipping cached item with missing required fields: {item.get('title', 'unknown')}")
-            
+            cursor = db.news.find(filter_query, LIST_PROJECTION).sort("cached_at", -1).limit(limit)
+            results = list(cursor)
         except Exception as query_error:
             logger.error(f"Error executing database query: {query_error}")
             return []
         
         # Debug logging
-        logger.info(f"Filter query used: {filter_query}")
-        logger.info(f"Found {len(results)} items")
-        
-        # Log what channels we actually got
-        channels_found = set()
-        for item in results:
-            if 'channel_id' in item:
-                channels_found.add(item['channel_id'])
-        
-        logger.info(f"Channels in results: {channels_found}")
+        logger.debug(f"Filter query used: {filter_query}")
+        logger.debug(f"Found {len(results)} items")
         
         return results
         
@@ -452,37 +460,68 @@ def get_cached_news_from_db(channel_id: str = None, query: str = None, limit: in
         logger.error(f"Error retrieving cached news from DB: {e}")
         return []
     
+# Helper function to get the latest items of several channels in one query
+def get_cached_news_for_channels(channel_ids: List[str], per_channel: int = 10, hours_back: int = 24) -> Dict[str, List[dict]]:
+    """
+    Latest `per_channel` items for each channel from a single aggregation.
+    The sort matches the (channel_id, cached_at) index and the window stage
+    numbers documents inside each channel partition, so only the top-k of
+    every channel leave the server.
+    """
+    feeds = {channel_id: [] for channel_id in channel_ids}
+    if not channel_ids:
+        return feeds
+    
+    cutoff_time = datetime.utcnow() - timedelta(hours=hours_back)
+    
+    # Channels the hot feed index can answer never reach MongoDB
+    missing = []
+    for channel_id in channel_ids:
+        indexed = hot_feed_index.get_feed(channel_id, per_channel, cutoff=cutoff_time)
+        if indexed is None:
+            missing.append(channel_id)
+        else:
+            feeds[channel_id] = indexed
+    if not missing:
+        return feeds
+    
+    pipeline = [
+        {"$match": {"channel_id": {"$in": missing}, "cached_at": {"$gte": cutoff_time}}},
+        {"$sort": {"channel_id": 1, "cached_at": -1}},
+        {"$setWindowFields": {
+            "partitionBy": "$channel_id",
+            "sortBy": {"cached_at": -1},
+            "output": {"feed_rank": {"$documentNumber": {}}}
+        }},
+        {"$match": {"feed_rank": {"$lte": per_channel}}},
+        {"$project": dict(LIST_PROJECTION, feed_rank=0)}
+    ]
+    
+    try:
+        for item in db.news.aggregate(pipeline):
+            feeds[item["channel_id"]].append(item)
+    except Exception as e:
+        logger.error(f"Error retrieving feeds for channels {channel_ids}: {e}")
+    
+    return feeds
+
 # Helper function to get unique channels from cache
 def get_cached_channels() -> List[dict]:
     """Get list of unique channels available in cache"""
     try:
-        # Aggregate unique channels with their info
-        pipeline = [
-            {"$match": {"cached_at": {"$gte": datetime.utcnow() - timedelta(hours=24)}}},
-            {
-                "$group": {
-                    "_id": "$channel_id",
-                    "channel_name": {"$first": "$channel_name"},
-                    "channel_url": {"$first": "$channel_url"},
-                    "video_count": {"$sum": 1},
-                    "latest_video": {"$max": "$cached_at"}
-                }
-            },
-            {"$sort": {"video_count": -1}}
-        ]
-        
-        results = list(db.news.aggregate(pipeline))
-        
-        # Format results
+        # Read the per-channel stats documents instead of aggregating db.news
         channels = []
-        for result in results:
+        for stat in news_stats.get_channels():
+            if not stat["recent_cached_items"]:
+                continue
             channels.append({
-                "channel_id": result["_id"],
-                "channel_name": result["channel_name"],
-                "channel_url": result["channel_url"],
-                "video_count": result["video_count"],
-                "latest_video": result["latest_video"]
+                "channel_id": stat["channel_id"],
+                "channel_name": stat["channel_name"],
+                "channel_url": stat["channel_url"],
+                "video_count": stat["recent_cached_items"],
+                "latest_video": stat["latest_cached_at"]
             })
+        channels.sort(key=lambda c: c["video_count"], reverse=True)
         
         logger.info(f"Found {len(channels)} unique channels in cache")
         return channels
@@ -554,28 +593,121 @@ async def read_own_items(current_user: User = Depends(get_current_active_user)):
 # Add logging middleware to handle errors gracefully
 @app.middleware("http")
 async def safe_logging_middleware(request, call_next):
-    start_time = datetime.now()
+    start_time = time.perf_counter()
     try:
-        response = await call_next(request)
-        process_time = (datetime.now() - start_time).total_seconds()
-        
-        # Safe logging
-        try:
-            logger.info(f"{request.client.host} - {request.method} {request.url.path} - {response.status_code} - {process_time:.4f}s")
-        except Exception:
-            # If logging fails, continue without logging
-            pass
-            
-        return response
+        # Root span of the request's trace; spans opened while handling it become children
+        with tracer.span("request", method=request.method, path=request.url.path) as span:
+            response = await call_next(request)
+            span.set(route=request_route(request), status=response.status_code)
     except Exception as e:
+        process_time = time.perf_counter() - start_time
+        route_latency.record(request.method, request_route(request), process_time, failed=True)
         # Safe error logging
         try:
-            logger.error(f"Request failed: {request.method} {request.url.path} - {str(e)}")
+            logger.error(f"Request failed: {request.method} {request.url.path} - {str(e)}",
+                         extra={"path": request.url.path, "duration_ms": round(process_time * 1000, 2)})
         except Exception:
             # If logging fails, print to stderr as fallback
             print(f"Request failed: {request.method} {request.url.path} - {str(e)}", file=sys.stderr)
         raise
 
+    process_time = time.perf_counter() - start_time
+    route = request_route(request)
+    route_latency.record(request.method, route, process_time, failed=response.status_code >= 500)
+    # Only enqueued here, the listener thread formats and writes it
+    access_logger.info(
+        "%s %s %s %.4fs", request.method, request.url.path, response.status_code, process_time,
+        extra={"method": request.method, "path": request.url.path, "route": route,
+               "status": response.status_code, "duration_ms": round(process_time * 1000, 2),
+               "client": request.client.host if request.client else None}
+    )
+    return response
+
+
+# Opt-in sampling profiles of single requests (see utils/profiling.py). Only
+# registered when PROFILING_TOKEN is set, so other deployments skip the layer.
+async def profiling_middleware(request, call_next):
+    if not request_profiler.wants(request.headers, request.query_params):
+        return await call_next(request)
+    sampler = request_profiler.start()
+    if sampler is None:
+        return await call_next(request)  # another request is being profiled
+
+    start_time = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        process_time = time.perf_counter() - start_time
+        path = await run_in_threadpool(
+            request_profiler.finish, sampler, request.method, request_route(request), process_time
+        )
+        logger.info(f"Profile of {request.method} {request.url.path} written to {path}")
+    response.headers["X-Profile-File"] = os.path.basename(path)
+    return response
+
+
+if request_profiler.enabled:
+    app.middleware("http")(profiling_middleware)
+
+
+def request_route(request) -> str:
+    """Route template of a request, so per-id paths share one latency series"""
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def find_story_summary(news_item: dict) -> Optional[dict]:
+    """Summary already generated for another upload of the same story, if any"""
+    story_id = news_item.get("story_id")
+    if not story_id:
+        return None
+    return db.news.find_one(
+        {"story_id": story_id, "video_id": {"$ne": news_item.get("video_id")}, "summary": {"$ne": None}},
+        {"_id": 0, "video_id": 1, "summary": 1}
+    )
+
+
+def stored_summary_response(video_id: str) -> Optional[dict]:
+    """The "already exists" response once a summary of the video is stored"""
+    stored = db.news.find_one({"video_id": video_id}, {"summary": 1, "summary_created_at": 1})
+    if not stored or not stored.get("summary"):
+        return None
+    return {
+        "message": "Summary already exists",
+        "video_id": video_id,
+        "summary": stored["summary"],
+        "summary_created_at": stored.get("summary_created_at"),
+        "regenerated": False
+    }
+
+
+def store_summary(video_id: str, fields: dict, lease=None) -> Optional[dict]:
+    """
+    $set summary fields on a news document and move the stats by the change
+    against the document as it was right before this write (not as it was
+    read before summarizing). The updated document, or None when it is gone.
+
+    With the summarize lease given, the write happens only if the lease is
+    still ours: renewing it re-checks the token in the leases collection and
+    gives the write a full TTL, so a worker that stalled past its lease
+    cannot overwrite the summary of the worker that took it over.
+    """
+    if lease is not None and (lease.lost or not lease_manager.renew(lease)):
+        raise HTTPException(
+            status_code=409,
+            detail="Summary lease was lost to another worker; its summary is kept"
+        )
+    before = db.news.find_one_and_update(
+        {"video_id": video_id},
+        {"$set": fields},
+        return_document=ReturnDocument.BEFORE
+    )
+    if before is None:
+        return None
+    updated_item = {**before, **fields}
+    news_stats.apply_change(before, updated_item)
+    return updated_item
+
 
 @app.post("/summarize_news/{video_id}")
 async def summarize_news_by_video_id(
@@ -605,11 +737,14 @@ async def summarize_news_by_video_id(
                 "summary_created_at": news_item.get("summary_created_at"),
                 "regenerated": False
             }
-        # Check if transcript exists
-        transcript = news_item.get("transcript", "")
+        # Check if transcript exists (full text, loaded from the transcript store)
+        with tracer.span("transcript_load", video_id=video_id):
+            transcript = transcript_store.load(news_item)
+        segments = TranscriptSegments.from_document(news_item.get("transcript_segments"))
         if not transcript or len(transcript.strip()) < 50:
             # Try description as fallback
             transcript = news_item.get("description", "")
+            segments = None
             if not transcript or len(transcript.strip()) < 50:
                 raise HTTPException(
                     status_code=400, 
@@ -626,34 +761,59 @@ async def summarize_news_by_video_id(
                 "regenerated": False
             }
         
-        # Generate summary
-        logger.info(f"Generating summary for video_id: {video_id}")
-        summary_result = Phoenix_Sum(transcript)
-        
-        if summary_result["status"] != "success":
+        # One worker cluster-wide summarizes a video; the others return its summary
+        lease_name = f"summarize:{video_id}"
+        lease = await run_in_threadpool(lease_manager.acquire, lease_name)
+        if lease is None:
+            await run_in_threadpool(lease_manager.wait_released, lease_name)
+            stored = stored_summary_response(video_id)
+            if stored:
+                return stored
             raise HTTPException(
-                status_code=500, 
-                detail=f"Summarization failed: {summary_result.get('error_message', 'Unknown error')}"
+                status_code=409,
+                detail="Summary is being generated by another worker, retry shortly"
             )
+        try:
+            # It may have been stored while we were checking
+            stored = None if force_regenerate else stored_summary_response(video_id)
+            if stored:
+                return stored
+            
+            # Copies of one story share a single summary
+            shared = None if force_regenerate else find_story_summary(news_item)
+            if shared:
+                logger.info(f"Reusing summary of {shared['video_id']} for duplicate upload {video_id}")
+                summary_result = {"status": "success", "summary": shared["summary"]}
+                summary_status = "shared_from_story"
+            else:
+                # Generate summary
+                logger.info(f"Generating summary for video_id: {video_id}")
+                with tracer.span("summarize", video_id=video_id):
+                    summary_result = Phoenix_Sum(transcript, segments)
+                summary_status = "completed"
         
-        # Store summary back in database (without user info since no auth)
-        update_result = db.news.update_one(
-            {"video_id": video_id},
-            {
-                "$set": {
-                    "summary": summary_result["summary"],
-                    "summary_created_at": datetime.utcnow(),
-                    "summary_created_by": "anonymous",  # Since no user authentication
-                    "summary_status": "completed"
-                }
-            }
-        )
+            if summary_result["status"] != "success":
+                raise HTTPException(
+                    status_code=500, 
+                    detail=f"Summarization failed: {summary_result.get('error_message', 'Unknown error')}"
+                )
         
-        if update_result.modified_count == 0:
-            raise HTTPException(
-                status_code=500, 
-                detail="Failed to update news item with summary"
-            )
+            # Store summary back in database (without user info since no auth)
+            updated_item = store_summary(video_id, {
+                "summary": summary_result["summary"],
+                "summary_created_at": datetime.utcnow(),
+                "summary_created_by": "anonymous",  # Since no user authentication
+                "summary_status": summary_status
+            }, lease=lease)
+        
+            if updated_item is None:
+                raise HTTPException(
+                    status_code=500, 
+                    detail="Failed to update news item with summary"
+                )
+            semantic_index.add(video_id, document_text(updated_item, transcript))
+        finally:
+            await run_in_threadpool(lease_manager.release, lease)
         
         logger.info(f"Summary generated and stored for video_id: {video_id}")
         
@@ -688,46 +848,56 @@ async def regenerate_summary(video_id: str):
                 detail=f"No news item found with video_id: {video_id}"
             )
             
-        # Get transcript
-        transcript = news_item.get("transcript", "")
+        # Get transcript (full text, loaded from the transcript store)
+        with tracer.span("transcript_load", video_id=video_id):
+            transcript = transcript_store.load(news_item)
+        segments = TranscriptSegments.from_document(news_item.get("transcript_segments"))
         if not transcript or len(transcript.strip()) < 50:
             # Try description as fallback
             transcript = news_item.get("description", "")
+            segments = None
             if not transcript or len(transcript.strip()) < 50:
                 raise HTTPException(
                     status_code=400, 
                     detail="No transcript or description available for summarization"
                 )
         
-        # Generate new summary
-        logger.info(f"Regenerating summary for video_id: {video_id}")
-        summary_result = Phoenix_Sum(transcript)
-        
-        if summary_result["status"] != "success":
+        # Never regenerate while another worker summarizes the video
+        lease = await run_in_threadpool(lease_manager.acquire, f"summarize:{video_id}")
+        if lease is None:
             raise HTTPException(
-                status_code=500, 
-                detail=f"Summarization failed: {summary_result.get('error_message', 'Unknown error')}"
+                status_code=409,
+                detail="Summary is being generated by another worker, retry shortly"
             )
+        try:
+            # Generate new summary
+            logger.info(f"Regenerating summary for video_id: {video_id}")
+            with tracer.span("summarize", video_id=video_id):
+                summary_result = Phoenix_Sum(transcript, segments)
         
-        # Store new summary (overwrite existing)
-        update_result = db.news.update_one(
-            {"video_id": video_id},
-            {
-                "$set": {
-                    "summary": summary_result["summary"],
-                    "summary_created_at": datetime.utcnow(),
-                    "summary_created_by": "anonymous",
-                    "summary_status": "regenerated",
-                    "previous_summary_backup": news_item.get("summary", "")
-                }
-            }
-        )
+            if summary_result["status"] != "success":
+                raise HTTPException(
+                    status_code=500, 
+                    detail=f"Summarization failed: {summary_result.get('error_message', 'Unknown error')}"
+                )
         
-        if update_result.modified_count == 0:
-            raise HTTPException(
-                status_code=500, 
-                detail="Failed to update news item with new summary"
-            )
+            # Store new summary (overwrite existing)
+            updated_item = store_summary(video_id, {
+                "summary": summary_result["summary"],
+                "summary_created_at": datetime.utcnow(),
+                "summary_created_by": "anonymous",
+                "summary_status": "regenerated",
+                "previous_summary_backup": news_item.get("summary", "")
+            }, lease=lease)
+        
+            if updated_item is None:
+                raise HTTPException(
+                    status_code=500, 
+                    detail="Failed to update news item with new summary"
+                )
+            semantic_index.add(video_id, document_text(updated_item, transcript))
+        finally:
+            await run_in_threadpool(lease_manager.release, lease)
         
         logger.info(f"Summary regenerated for video_id: {video_id}")
         
@@ -780,6 +950,7 @@ async def batch_summarize_news(
         
         successful = 0
         failed = 0
+        skipped_busy = 0
         failed_items = []
         
         for item in items:
@@ -790,41 +961,60 @@ async def batch_summarize_news(
                     failed_items.append({"item": str(item.get("_id", "unknown")), "reason": "No video_id"})
                     continue
                 
-                # Get transcript
-                transcript = item.get("transcript", "")
+                # Get transcript (full text, loaded from the transcript store)
+                with tracer.span("transcript_load", video_id=video_id):
+                    transcript = transcript_store.load(item)
+                segments = TranscriptSegments.from_document(item.get("transcript_segments"))
                 if not transcript or len(transcript.strip()) < 50:
                     transcript = item.get("description", "")
+                    segments = None
                     if not transcript or len(transcript.strip()) < 50:
                         failed += 1
                         failed_items.append({"video_id": video_id, "reason": "No transcript or description"})
                         continue
                 
-                # Generate summary
-                summary_result = Phoenix_Sum(transcript)
-                
-                if summary_result["status"] != "success":
-                    failed += 1
-                    failed_items.append({"video_id": video_id, "reason": summary_result.get("error_message", "Summarization failed")})
+                # Items another worker is summarizing are skipped, not waited for
+                lease = await run_in_threadpool(lease_manager.acquire, f"summarize:{video_id}")
+                if lease is None:
+                    skipped_busy += 1
                     continue
+                try:
+                    # It may have been summarized since the query
+                    if skip_existing and stored_summary_response(video_id):
+                        skipped_busy += 1
+                        continue
+                    
+                    # Generate summary, once per story
+                    shared = find_story_summary(item)
+                    if shared:
+                        summary_result = {"status": "success", "summary": shared["summary"]}
+                        summary_status = "shared_from_story"
+                    else:
+                        with tracer.span("summarize", video_id=video_id):
+                            summary_result = Phoenix_Sum(transcript, segments)
+                        summary_status = "batch_generated"
                 
-                # Update database
-                update_result = db.news.update_one(
-                    {"video_id": video_id},
-                    {
-                        "$set": {
-                            "summary": summary_result["summary"],
-                            "summary_created_at": datetime.utcnow(),
-                            "summary_created_by": "anonymous",
-                            "summary_status": "batch_generated"
-                        }
-                    }
-                )
+                    if summary_result["status"] != "success":
+                        failed += 1
+                        failed_items.append({"video_id": video_id, "reason": summary_result.get("error_message", "Summarization failed")})
+                        continue
                 
-                if update_result.modified_count > 0:
-                    successful += 1
-                else:
-                    failed += 1
-                    failed_items.append({"video_id": video_id, "reason": "Database update failed"})
+                    # Update database
+                    updated_item = store_summary(video_id, {
+                        "summary": summary_result["summary"],
+                        "summary_created_at": datetime.utcnow(),
+                        "summary_created_by": "anonymous",
+                        "summary_status": summary_status
+                    }, lease=lease)
+                
+                    if updated_item is not None:
+                        semantic_index.add(video_id, document_text(updated_item, transcript))
+                        successful += 1
+                    else:
+                        failed += 1
+                        failed_items.append({"video_id": video_id, "reason": "Database update failed"})
+                finally:
+                    await run_in_threadpool(lease_manager.release, lease)
                 
             except Exception as e:
                 failed += 1
@@ -835,6 +1025,7 @@ async def batch_summarize_news(
             "processed": len(items),
             "successful": successful,
             "failed": failed,
+            "skipped_busy": skipped_busy,
             "failed_items": failed_items[:5] if failed_items else [],
             "filter_applied": filter_query
         }
@@ -890,7 +1081,7 @@ async def get_video_details(video_id: str):
     Get complete video details including summary status
     """
     try:
-        news_item = db.news.find_one({"video_id": video_id})
+        news_item = db.news.find_one({"video_id": video_id}, {"_id": 0})
         
         if not news_item:
             raise HTTPException(
@@ -898,12 +1089,15 @@ async def get_video_details(video_id: str):
                 detail=f"No video found with video_id: {video_id}"
             )
         
-        # Remove MongoDB ObjectId
-        news_item.pop('_id', None)
+        # Packed segment timings are binary, exposed through /transcript_position
+        segments = news_item.pop("transcript_segments", None)
+        news_item.pop("minhash", None)
+        news_item["transcript"] = transcript_store.load(news_item)
         
         # Add summary status
         news_item["has_summary"] = bool(news_item.get("summary"))
         news_item["has_transcript"] = bool(news_item.get("transcript"))
+        news_item["has_segments"] = bool(segments)
         
         return news_item
         
@@ -913,150 +1107,298 @@ async def get_video_details(video_id: str):
         logger.error(f"Error retrieving video details for {video_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
     
+@app.get("/transcript_position/{video_id}")
+async def get_transcript_position(
+    video_id: str,
+    offset: int | None = Query(None, ge=0, description="Character offset in the transcript"),
+    seconds: float | None = Query(None, ge=0, description="Playback time in seconds")
+):
+    """
+    Map between a transcript character offset and a video timestamp
+    (jump-to-moment). Give either offset or seconds.
+    """
+    if (offset is None) == (seconds is None):
+        raise HTTPException(status_code=400, detail="Provide exactly one of offset or seconds")
+    
+    try:
+        news_item = db.news.find_one(
+            {"video_id": video_id},
+            {"_id": 0, "video_id": 1, "transcript": 1, "transcript_external": 1, "transcript_segments": 1}
+        )
+        if not news_item:
+            raise HTTPException(status_code=404, detail=f"No video found with video_id: {video_id}")
+        
+        segments = TranscriptSegments.from_document(news_item.get("transcript_segments"))
+        if not segments:
+            raise HTTPException(status_code=404, detail="No segment timings stored for this video")
+        
+        with tracer.span("transcript_load", video_id=video_id):
+            transcript = transcript_store.load(news_item)
+        index = segments.segment_at_offset(offset) if offset is not None else segments.segment_at_time(seconds)
+        begin, end = segments.text_span(index, len(transcript))
+        start = float(segments.starts[index])
+        
+        return {
+            "video_id": video_id,
+            "segment_index": index,
+            "start": round(start, 2),
+            "duration": round(float(segments.durations[index]), 2),
+            "text_offset": begin,
+            "text": transcript[begin:end].strip(),
+            "video_url": f"https://www.youtube.com/watch?v={video_id}&t={int(start)}s"
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error resolving transcript position for {video_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
 # YouTube retrieval with proper error handling and channel_id focus
 @app.get("/get_latest_news", response_model=List[NewsItem])
 async def get_latest_news(
+    response: Response,
     channel_id: str | None = None,
     query: str = "Sports latest news", 
     num_videos: int = 3, 
-    minutes_ago: int = 1440
+    minutes_ago: int = 1440,
+    refresh: bool = Query(False, description="Crawl now instead of serving a cached feed")
 ):
+    # Every document is normalized when it is written (models/news_document.py),
+    # so results are returned as-is without per-item fixups.
     try:
         logger.info(f"Attempting to fetch latest news: channel_id='{channel_id}', query='{query}', num_videos={num_videos}")
         
-        # FORCE FRESH FETCH when channel_id is provided to avoid cross-channel contamination
-        force_refresh = bool(channel_id)  # Always force refresh for specific channels
-        
-        # Try to get fresh news first
+        # Whether a channel feed is crawled is decided by its freshness below;
+        # once it is, the crawl skips the cacher's own cache (not channel-keyed by query)
+        force_refresh = bool(channel_id)
+        key = (channel_id, query, minutes_ago, num_videos, force_refresh)
+        
+        # Serve a recently crawled channel feed from the cache, refreshing it
+        # in the background once it is past the soft TTL. A crawl that found
+        # nothing counts as a refresh too, so empty feeds are not crawled per request.
+        if channel_id and not refresh:
+            last_refresh = feed_refresh(channel_id, query)
+            if last_refresh:
+                refreshed_at = last_refresh["refreshed_at"]
+                age = (datetime.utcnow() - refreshed_at).total_seconds()
+                if age <= FEED_MAX_STALE_SECONDS:
+                    stale = age > FEED_SOFT_TTL_SECONDS
+                    if stale:
+                        revalidate_feed(key, query, num_videos, minutes_ago, channel_id, force_refresh)
+                    tracer.annotate(feed_age_s=round(age), feed_stale=stale)
+                    cached = cached_feed(last_refresh, channel_id, num_videos, minutes_ago)
+                    return feed_response(cached, response, "stale" if stale else "fresh", refreshed_at)
+        
+        # Try to get fresh news first; identical concurrent requests share one crawl
         try:
-            results = get_latest_news_with_caching(
-                query=query,
-                num_videos_to_fetch=num_videos,
-                minutes_ago=minutes_ago,
-                channel_id=channel_id,
-                force_refresh=force_refresh,
-                cache_hours=6
+            results, shared = await crawl_flights.do_async(
+                key, run_in_threadpool, fetch_latest_news, query, num_videos, minutes_ago, channel_id, force_refresh
             )
+            tracer.annotate(crawl_coalesced=shared)
         except Exception as fetch_error:
             logger.error(f"Error in get_latest_news_with_caching: {fetch_error}")
             results = []
         
-        if results and len(results) > 0:
+        if results:
             logger.info(f"Successfully fetched {len(results)} fresh news items")
-            
-            # CRITICAL FIX: Validate and fix data before filtering
-            results = validate_and_fix_news_data(results, channel_id)
-            
-            # Additional validation - filter out any items that still don't meet requirements
-            final_results = []
-            for item in results:
-                # Double-check that item has all required fields after validation
-                if (item.get('video_id') and 
-                    item.get('title') and 
-                    item.get('video_url')):
-                    
-                    # Validate that all results match the requested channel_id (if specified)
-                    if channel_id:
-                        if item.get('channel_id') == channel_id:
-                            final_results.append(item)
-                        else:
-                            logger.warning(f"Filtered out item from wrong channel: got {item.get('channel_id')}, expected {channel_id}")
-                    else:
-                        # No channel_id specified, accept all valid results
-                        final_results.append(item)
-                else:
-                    logger.warning(f"Item still invalid after validation: {item.get('title', 'unknown')}")
-            
-            results = final_results
-            
-            # Save to MongoDB (handle duplicates)
-            if results:
-                try:
-                    saved_count = 0
-                    for item in results:
-                        try:
-                            # Use upsert to handle duplicates
-                            db.news.replace_one(
-                                {"video_id": item.get("video_id")},
-                                item,
-                                upsert=True
-                            )
-                            saved_count += 1
-                        except Exception as save_item_error:
-                            logger.warning(f"Error saving individual item {item.get('video_id', 'unknown')}: {save_item_error}")
-                    
-                    logger.info(f"Saved/updated {saved_count} items to MongoDB")
-                except Exception as save_error:
-                    logger.warning(f"Error saving to database: {save_error}")
-            
-            return results
-        else:
-            # If no fresh results, fall back to cached data with STRICT channel_id filtering
-            logger.warning("No fresh results found, falling back to cached data")
-            
             if channel_id:
-                # Get cached data with STRICT filtering
-                cached_results = get_cached_news_from_db(
-                    channel_id=channel_id, 
-                    query=None,  # Don't use query for fallback to get more results
-                    limit=num_videos
-                )
-                
-                if cached_results:
-                    logger.info(f"Successfully retrieved {len(cached_results)} cached items for channel {channel_id}")
-                    
-                    # Validate cached results too
-                    cached_results = validate_and_fix_news_data(cached_results, channel_id)
-                    
-                    # Mark as cached source and validate channel
-                    validated_cached = []
-                    for item in cached_results:
-                        if item.get('channel_id') == channel_id:
-                            item["source"] = "cached"
-                            validated_cached.append(item)
-                    
-                    return validated_cached
-                else:
-                    logger.error(f"No cached data available for channel {channel_id}")
-                    return []
-            else:
-                # No channel_id and no fresh data
-                logger.warning("No channel_id specified and no fresh data available")
-                return []
+                last_refresh = feed_refresh(channel_id, query)
+                return feed_response(results, response, "crawled", last_refresh and last_refresh["refreshed_at"])
+            return news_list_response(results)
+        
+        # If no fresh results, fall back to cached data with STRICT channel_id filtering
+        logger.warning("No fresh results found, falling back to cached data")
+        return news_list_response(get_cached_fallback(channel_id, num_videos, "cached"))
             
     except Exception as e:
         logger.error(f"Error fetching news: {e}")
         
         # Final fallback to cached data from MongoDB with STRICT channel_id filtering
-        if channel_id:
-            logger.info(f"Final fallback to cached news for channel {channel_id}")
-            try:
-                cached_results = get_cached_news_from_db(
-                    channel_id=channel_id, 
-                    query=None, 
-                    limit=num_videos
-                )
-                
-                if cached_results:
-                    logger.info(f"Final fallback: retrieved {len(cached_results)} cached items")
-                    
-                    # Validate fallback results
-                    cached_results = validate_and_fix_news_data(cached_results, channel_id)
-                    
-                    # Double-check channel validation
-                    final_results = []
-                    for item in cached_results:
-                        if item.get('channel_id') == channel_id:
-                            item["source"] = "cached_fallback"
-                            final_results.append(item)
-                    
-                    return final_results
-            except Exception as fallback_error:
-                logger.error(f"Final fallback also failed: {fallback_error}")
+        try:
+            return news_list_response(get_cached_fallback(channel_id, num_videos, "cached_fallback"))
+        except Exception as fallback_error:
+            logger.error(f"Final fallback also failed: {fallback_error}")
         
         logger.error("All fallback attempts failed")
         return []
 
+
+crawl_flights = SingleFlight("crawl")
+
+
+def fetch_latest_news(query: str, num_videos: int, minutes_ago: int, channel_id: Optional[str],
+                      force_refresh: bool) -> List[dict]:
+    """
+    One crawl for /get_latest_news, run by the first of any identical
+    concurrent requests (see crawl_flights); the rest get its results.
+    Across workers the feed's lease decides who crawls: the others wait
+    for it and serve what it stored, read from db.news (their own hot feed
+    index has not seen the holder's writes).
+    """
+    lease_name = f"crawl:{channel_id}:{query}"
+    with lease_manager.hold(lease_name) as lease:
+        if lease is None:
+            lease_manager.wait_released(lease_name)
+            tracer.annotate(crawl_leased_elsewhere=True)
+            last_refresh = feed_refresh(channel_id, query) if channel_id else None
+            if not last_refresh:
+                return []
+            return cached_feed(last_refresh, channel_id, num_videos, minutes_ago)
+        results = get_latest_news_with_caching(
+            query=query,
+            num_videos_to_fetch=num_videos,
+            minutes_ago=minutes_ago,
+            channel_id=channel_id,
+            force_refresh=force_refresh,
+            cache_hours=6
+        )
+        save_direct_fetch_results(results)
+        if channel_id:
+            mark_feed_refreshed(channel_id, query, results)
+        return results
+
+
+def feed_key(channel_id: str, query: str) -> str:
+    return f"{channel_id}:{query}"
+
+
+def feed_refresh(channel_id: str, query: str) -> Optional[dict]:
+    """
+    The last crawl of a feed by any worker: refreshed_at (naive UTC) and the
+    video_ids it returned, in order; None if never crawled.
+    """
+    try:
+        return db.feed_refreshes.find_one({"_id": feed_key(channel_id, query)}, {"refreshed_at": 1, "video_ids": 1})
+    except Exception as e:
+        logger.warning(f"Could not read feed freshness of {channel_id}: {e}")
+        return None
+
+
+def mark_feed_refreshed(channel_id: str, query: str, results: List[dict]):
+    try:
+        db.feed_refreshes.update_one(
+            {"_id": feed_key(channel_id, query)},
+            {"$set": {
+                "channel_id": channel_id,
+                "query": query,
+                "refreshed_at": datetime.utcnow(),
+                "video_ids": [item["video_id"] for item in results if item.get("video_id")]
+            }},
+            upsert=True
+        )
+    except Exception as e:
+        logger.warning(f"Could not record feed refresh of {channel_id}: {e}")
+
+
+def cached_feed(last_refresh: dict, channel_id: str, limit: int, minutes_ago: int) -> List[dict]:
+    """
+    The items the feed's last crawl returned (so for its own query) that were
+    published within `minutes_ago`, read back from db.news to pick up summaries
+    stored since, in crawl order. When fewer than `limit` remain (a smaller or
+    narrower crawl), the channel's newest stored items in the window fill up.
+    """
+    published_after = (datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)).isoformat(
+        timespec="seconds").replace("+00:00", "Z")
+    window = {"channel_id": {"$eq": channel_id}, "published_at": {"$gte": published_after}}
+    video_ids = last_refresh.get("video_ids", [])
+    items = []
+    if video_ids:
+        found = {
+            item["video_id"]: item
+            for item in db.news.find({**window, "video_id": {"$in": video_ids}}, LIST_PROJECTION)
+        }
+        items = [found[video_id] for video_id in video_ids if video_id in found][:limit]
+    if len(items) < limit:
+        cursor = db.news.find({**window, "video_id": {"$nin": video_ids}}, LIST_PROJECTION)
+        items.extend(cursor.sort("cached_at", -1).limit(limit - len(items)))
+    return items
+
+
+def revalidate_feed(key, query, num_videos, minutes_ago, channel_id, force_refresh):
+    """
+    Crawl a stale feed without making the request wait. The crawl runs in
+    its own thread (and trace), coalesced with any crawl of the same feed;
+    nothing is started while one is already running.
+    """
+    if crawl_flights.running(key):
+        return
+
+    def run():
+        try:
+            crawl_flights.do(key, fetch_latest_news, query, num_videos, minutes_ago, channel_id, force_refresh)
+        except Exception as e:
+            logger.warning(f"Background refresh of {channel_id} failed: {e}")
+
+    threading.Thread(target=run, name="feed-revalidate", daemon=True).start()
+
+
+def feed_response(items: List[dict], response: Response, freshness: str, refreshed_at: Optional[datetime]):
+    """A channel feed with headers telling how old it is"""
+    age = max(0, int((datetime.utcnow() - refreshed_at).total_seconds())) if refreshed_at else 0
+    headers = {
+        "Age": str(age),
+        "Cache-Control": f"max-age={max(0, FEED_SOFT_TTL_SECONDS - age)}, "
+                         f"stale-while-revalidate={FEED_MAX_STALE_SECONDS - FEED_SOFT_TTL_SECONDS}",
+        "X-Feed-Freshness": freshness,
+    }
+    if refreshed_at:
+        headers["X-Feed-Refreshed-At"] = refreshed_at.isoformat(timespec="seconds") + "Z"
+    FEED_RESPONSES.inc(freshness=freshness)
+    payload = news_list_response(items)
+    # Headers set on the injected response only reach responses FastAPI builds itself
+    target = payload if isinstance(payload, Response) else response
+    target.headers.update(headers)
+    return payload
+
+
+def save_direct_fetch_results(results: List[dict]):
+    """
+    Persist results that did not go through the cacher (direct fetch mode).
+    Cacher results are already stored by EnhancedNewsTranscriptCacher.cache_video_data.
+    """
+    saved_count = 0
+    for item in results:
+        if item.get("source") != "direct_fetch":
+            continue
+        try:
+            # Use upsert to handle duplicates
+            previous = db.news.find_one_and_replace(
+                {"video_id": item["video_id"]},
+                item,
+                upsert=True,
+                return_document=ReturnDocument.BEFORE
+            )
+            news_stats.apply_change(previous, item)
+            hot_feed_index.upsert(item)
+            saved_count += 1
+        except Exception as save_item_error:
+            logger.warning(f"Error saving individual item {item.get('video_id', 'unknown')}: {save_item_error}")
+    
+    if saved_count:
+        logger.info(f"Saved/updated {saved_count} direct fetch items to MongoDB")
+
+
+def get_cached_fallback(channel_id: Optional[str], limit: int, source: str) -> List[dict]:
+    """Cached items for a channel when no fresh data could be fetched"""
+    if not channel_id:
+        logger.warning("No channel_id specified and no fresh data available")
+        return []
+    
+    cached_results = get_cached_news_from_db(
+        channel_id=channel_id, 
+        query=None,  # Don't use query for fallback to get more results
+        limit=limit
+    )
+    if not cached_results:
+        logger.error(f"No cached data available for channel {channel_id}")
+        return []
+    
+    logger.debug(f"Retrieved {len(cached_results)} cached items for channel {channel_id}")
+    for item in cached_results:
+        item["source"] = source
+    return cached_results
+
 @app.get("/get_saved_news", response_model=List[NewsItem])
 async def get_saved_news(
     channel_id: str | None = None,
@@ -1069,15 +1411,11 @@ async def get_saved_news(
         if channel_id:
             filter_query["channel_id"] = {"$eq": channel_id}  # Strict filtering
         
-        news = []
-        cursor = db.news.find(filter_query).sort("cached_at", -1).skip(skip).limit(limit)
-        
-        for item in cursor:
-            item.pop('_id', None)
-            news.append(item)
+        cursor = db.news.find(filter_query, LIST_PROJECTION).sort("cached_at", -1).skip(skip).limit(limit)
+        news = list(cursor)
             
-        logger.info(f"Retrieved {len(news)} saved news items (channel_id: {channel_id})")
-        return news
+        logger.debug(f"Retrieved {len(news)} saved news items (channel_id: {channel_id})")
+        return news_list_response(news)
         
     except Exception as e:
         logger.error(f"Error retrieving saved news: {e}")
@@ -1089,7 +1427,8 @@ async def get_cached_news_endpoint(
     channel_id: str | None = Query(None, description="REQUIRED: YouTube Channel ID for specific channel"),
     query: str | None = Query(None, description="Optional: Search text within the channel"),
     limit: int = Query(50, description="Maximum number of results"),
-    hours_back: int = Query(24, description="Hours back to search in cache")
+    hours_back: int = Query(24, description="Hours back to search in cache"),
+    collapse_duplicates: bool = Query(False, description="Show one item per story")
 ):
     """Get cached news - MUST specify channel_id to avoid mixed results"""
     try:
@@ -1105,16 +1444,12 @@ async def get_cached_news_endpoint(
             hours_back=hours_back
         )
         
-        # Additional validation - make sure all results are from the requested channel
-        validated_results = []
-        for item in cached_results:
-            if item.get('channel_id') == channel_id:
-                validated_results.append(item)
-            else:
-                logger.warning(f"Filtered out item from wrong channel: {item.get('channel_id')}")
+        if collapse_duplicates:
+            cached_results = collapse_stories(cached_results)
         
-        logger.info(f"Returning {len(validated_results)} validated items for channel {channel_id}")
-        return validated_results
+        # The query filters on channel_id with $eq, no second pass needed
+        logger.debug(f"Returning {len(cached_results)} items for channel {channel_id}")
+        return news_list_response(cached_results)
         
     except Exception as e:
         logger.error(f"Error in cached news endpoint: {e}")
@@ -1156,7 +1491,7 @@ async def get_news_by_channel(
                 detail=f"No cached news found for channel_id: {channel_id}"
             )
         
-        return results
+        return news_list_response(results)
         
     except HTTPException:
         raise
@@ -1164,35 +1499,60 @@ async def get_news_by_channel(
         logger.error(f"Error retrieving news for channel {channel_id}: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+# Home screen feed: several channels in one request
+@app.get("/get_news_by_channels", response_model=Dict[str, List[NewsItem]])
+async def get_news_by_channels(
+    channel_ids: List[str] = Query(..., description="Channel IDs, repeated or comma separated"),
+    per_channel: int = Query(10, ge=1, le=50, description="Latest items per channel"),
+    hours_back: int = Query(24, description="Hours back to search"),
+    collapse_duplicates: bool = Query(False, description="Show each story once, under the first channel that has it")
+):
+    """Get the latest news of several channels, keyed by channel_id"""
+    # Accept both ?channel_ids=A&channel_ids=B and ?channel_ids=A,B
+    requested = []
+    for value in channel_ids:
+        for channel_id in value.split(","):
+            channel_id = channel_id.strip()
+            if channel_id and channel_id not in requested:
+                requested.append(channel_id)
+    
+    if len(requested) > 50:
+        raise HTTPException(status_code=400, detail="At most 50 channel_ids per request")
+    
+    try:
+        feeds = get_cached_news_for_channels(requested, per_channel=per_channel, hours_back=hours_back)
+        if collapse_duplicates:
+            seen = set()
+            for channel_id in requested:
+                feeds[channel_id] = collapse_stories(feeds[channel_id], seen)
+        return news_feeds_response(feeds)
+    except Exception as e:
+        logger.error(f"Error retrieving news for channels {requested}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 # New endpoint to debug cache contents
 @app.get("/debug_cache")
 async def debug_cache_contents():
     """Debug endpoint to see what's actually in your cache"""
     try:
-        # Get channel distribution
-        pipeline = [
-            {"$group": {
-                "_id": "$channel_id", 
-                "count": {"$sum": 1},
-                "channel_name": {"$first": "$channel_name"},
-                "sample_titles": {"$push": "$title"},
-                "has_summaries": {"$sum": {"$cond": [{"$ne": ["$summary", None]}, 1, 0]}},
-                "has_transcripts": {"$sum": {"$cond": [{"$ne": ["$transcript", None]}, 1, 0]}}
-            }},
-            {"$sort": {"count": -1}}
+        # Get channel distribution from the maintained stats documents
+        channel_stats = [
+            {
+                "_id": stat["channel_id"],
+                "count": stat["total_items"],
+                "channel_name": stat["channel_name"],
+                "sample_titles": stat["sample_titles"],
+                "has_summaries": stat["items_with_summaries"],
+                "has_transcripts": stat["items_with_transcripts"]
+            }
+            for stat in news_stats.get_channels()
         ]
         
-        channel_stats = list(db.news.aggregate(pipeline))
-        
-        # Limit sample titles to first 3
-        for stat in channel_stats:
-            if stat["sample_titles"]:
-                stat["sample_titles"] = stat["sample_titles"][:3]
-        
         # Get summary statistics
-        total_items = db.news.count_documents({})
-        items_with_summaries = db.news.count_documents({"summary": {"$exists": True, "$ne": None}})
-        items_with_transcripts = db.news.count_documents({"transcript": {"$exists": True, "$ne": None}})
+        overview = news_stats.get_global()
+        total_items = overview["total_items"]
+        items_with_summaries = overview["items_with_summaries"]
+        items_with_transcripts = overview["items_with_transcripts"]
         
         return {
             "total_items": total_items,
@@ -1201,9 +1561,7 @@ async def debug_cache_contents():
             "summary_coverage": f"{(items_with_summaries/total_items*100):.1f}%" if total_items > 0 else "0%",
             "transcript_coverage": f"{(items_with_transcripts/total_items*100):.1f}%" if total_items > 0 else "0%",
             "channels": channel_stats,
-            "recent_items": db.news.count_documents({
-                "cached_at": {"$gte": datetime.utcnow() - timedelta(hours=24)}
-            })
+            "recent_items": overview["recent_cached_items"]
         }
         
     except Exception as e:
@@ -1215,42 +1573,29 @@ async def debug_cache_contents():
 async def get_summary_statistics():
     """Get statistics about summaries in the database"""
     try:
-        # Aggregate summary statistics
-        pipeline = [
-            {
-                "$group": {
-                    "_id": "$channel_id",
-                    "channel_name": {"$first": "$channel_name"},
-                    "total_items": {"$sum": 1},
-                    "items_with_summaries": {
-                        "$sum": {"$cond": [{"$ne": ["$summary", None]}, 1, 0]}
-                    },
-                    "items_with_transcripts": {
-                        "$sum": {"$cond": [{"$ne": ["$transcript", None]}, 1, 0]}
-                    },
-                    "latest_summary": {"$max": "$summary_created_at"}
-                }
-            },
-            {"$sort": {"total_items": -1}}
-        ]
-        
-        channel_summary_stats = list(db.news.aggregate(pipeline))
-        
-        # Calculate coverage percentages
-        for stat in channel_summary_stats:
+        # Per-channel counters are maintained by the write paths
+        channel_summary_stats = []
+        for stat in news_stats.get_channels():
             total = stat["total_items"]
-            stat["summary_coverage"] = f"{(stat['items_with_summaries']/total*100):.1f}%" if total > 0 else "0%"
-            stat["transcript_coverage"] = f"{(stat['items_with_transcripts']/total*100):.1f}%" if total > 0 else "0%"
+            channel_summary_stats.append({
+                "_id": stat["channel_id"],
+                "channel_name": stat["channel_name"],
+                "total_items": total,
+                "items_with_summaries": stat["items_with_summaries"],
+                "items_with_transcripts": stat["items_with_transcripts"],
+                "latest_summary": stat["latest_summary_at"],
+                "summary_coverage": f"{(stat['items_with_summaries']/total*100):.1f}%" if total > 0 else "0%",
+                "transcript_coverage": f"{(stat['items_with_transcripts']/total*100):.1f}%" if total > 0 else "0%"
+            })
         
         # Overall statistics
-        total_items = db.news.count_documents({})
-        total_summaries = db.news.count_documents({"summary": {"$exists": True, "$ne": None}})
-        total_transcripts = db.news.count_documents({"transcript": {"$exists": True, "$ne": None}})
+        overview = news_stats.get_global()
+        total_items = overview["total_items"]
+        total_summaries = overview["items_with_summaries"]
+        total_transcripts = overview["items_with_transcripts"]
         
         # Recent activity
-        recent_summaries = db.news.count_documents({
-            "summary_created_at": {"$gte": datetime.utcnow() - timedelta(hours=24)}
-        })
+        recent_summaries = overview["recent_summaries"]
         
         return {
             "overall_stats": {
@@ -1285,7 +1630,15 @@ async def clear_cache(
     try:
         if channel_id:
             # Clear specific channel
+            external = db.news.distinct("video_id", {"channel_id": {"$eq": channel_id}, "transcript_external": True})
+            # Take the channel out of the global and genre counters instead of rebuilding them
+            await run_in_threadpool(news_stats.subtract, {"channel_id": {"$eq": channel_id}})
             result = db.news.delete_many({"channel_id": {"$eq": channel_id}})
+            transcript_store.delete_many(external)
+            news_stats.delete_channel(channel_id)
+            db.feed_refreshes.delete_many({"channel_id": {"$eq": channel_id}})
+            hot_feed_index.clear(channel_id)
+            await run_in_threadpool(story_index.rebuild, db.news)
             return {
                 "message": f"Cleared {result.deleted_count} items for channel {channel_id}",
                 "channel_id": channel_id
@@ -1293,6 +1646,12 @@ async def clear_cache(
         else:
             # Clear all cache
             result = db.news.delete_many({})
+            transcript_store.delete_many()
+            db.feed_refreshes.delete_many({})
+            await run_in_threadpool(news_stats.rebuild)
+            hot_feed_index.clear()
+            await run_in_threadpool(story_index.rebuild, db.news)
+            semantic_index.reset()
             return {
                 "message": f"Cleared all {result.deleted_count} cached items",
                 "warning": "All cache cleared"
@@ -1320,6 +1679,9 @@ async def clear_summaries(
         if channel_id:
             filter_query["channel_id"] = {"$eq": channel_id}
         
+        if channel_id:
+            await run_in_threadpool(news_stats.subtract, filter_query, summaries_only=True)
+        
         # Remove summary fields but keep the news items
         result = db.news.update_many(
             filter_query,
@@ -1333,6 +1695,8 @@ async def clear_summaries(
                 }
             }
         )
+        if not channel_id:
+            await run_in_threadpool(news_stats.rebuild)
         
         return {
             "message": f"Cleared summaries from {result.modified_count} items",
@@ -1345,6 +1709,306 @@ async def clear_summaries(
         raise HTTPException(status_code=500, detail=f"Error clearing summaries: {e}")
 
 
+# Admin endpoint to re-run genre detection over the whole corpus
+@app.post("/reclassify_genres")
+async def reclassify_genres_endpoint(
+    batch_size: int = Query(500, description="Documents per bulk write"),
+    confirm: bool = Query(False, description="Must be True to actually update genres")
+):
+    """Recompute genre/genres of every cached document"""
+    if not confirm:
+        return {
+            "message": "Add ?confirm=true to actually update genres",
+            "warning": "Existing genre labels will be overwritten"
+        }
+    
+    # Whole-corpus pass ending in a stats rebuild; keep it off the event loop
+    result = await run_in_threadpool(reclassify_genres, batch_size=batch_size)
+    if "error" in result:
+        raise HTTPException(status_code=500, detail=result["error"])
+    await run_in_threadpool(load_hot_feed_index)
+    return result
+
+
+# Every upload of the story a video belongs to
+@app.get("/get_story/{video_id}")
+async def get_story(video_id: str):
+    """Near-duplicate uploads of the same story across channels, newest first"""
+    try:
+        news_item = db.news.find_one({"video_id": video_id}, {"_id": 0, "story_id": 1})
+        if not news_item:
+            raise HTTPException(status_code=404, detail=f"No video found with video_id: {video_id}")
+        
+        story_id = news_item.get("story_id") or video_id
+        projection = {"_id": 0, "video_id": 1, "title": 1, "video_url": 1, "channel_id": 1,
+                      "channel_name": 1, "cached_at": 1, "summary": 1}
+        members = list(db.news.find({"story_id": story_id}, projection).sort("cached_at", -1)) if news_item.get("story_id") else []
+        if not members:
+            members = [db.news.find_one({"video_id": video_id}, projection)]
+        
+        return {
+            "story_id": story_id,
+            "uploads": len(members),
+            "channels": sorted({m.get("channel_id") for m in members if m.get("channel_id")}),
+            "items": members
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving story for {video_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+# Semantic search over transcripts and summaries, from locally computed embeddings
+def ranked_news_items(ranked, channel_id=None):
+    """News documents of [(video_id, similarity)] in rank order, with their similarity"""
+    scores = dict(ranked)
+    query = {"video_id": {"$in": list(scores)}}
+    if channel_id:
+        query["channel_id"] = {"$eq": channel_id}
+    items = {item["video_id"]: item for item in db.news.find(query, LIST_PROJECTION)}
+    return [dict(items[video_id], similarity=round(score, 4)) for video_id, score in ranked if video_id in items]
+
+
+@app.get("/semantic_search")
+async def semantic_search(
+    q: str = Query(..., min_length=2, description="Free-text query"),
+    limit: int = Query(10, ge=1, le=100),
+    channel_id: str | None = Query(None, description="Only return items of this channel"),
+    collapse_duplicates: bool = Query(True, description="Return one upload per story")
+):
+    """Cached news closest in meaning to a query (not just title matches)"""
+    if not semantic_index.available():
+        raise HTTPException(status_code=503, detail="Semantic index not built yet, call /build_semantic_index")
+    try:
+        # Over-fetch so channel filtering, deleted items and duplicates still leave `limit` results
+        ranked = semantic_index.search(q, limit=limit * 4 if channel_id or collapse_duplicates else limit + 10)
+        items = ranked_news_items(ranked, channel_id)
+        if collapse_duplicates:
+            items = collapse_stories(items)
+        return {"query": q, "count": len(items[:limit]), "results": items[:limit]}
+    except Exception as e:
+        logger.error(f"Error in semantic search: {e}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@app.get("/related_stories/{video_id}")
+async def related_stories(
+    video_id: str,
+    limit: int = Query(10, ge=1, le=100)
+):
+    """Other stories closest in meaning to a video; its own near-duplicate copies are left out"""
+    if not semantic_index.available():
+        raise HTTPException(status_code=503, detail="Semantic index not built yet, call /build_semantic_index")
+    try:
+        news_item = db.news.find_one({"video_id": video_id}, {"_id": 0, "video_id": 1, "story_id": 1})
+        if not news_item:
+            raise HTTPException(status_code=404, detail=f"No video found with video_id: {video_id}")
+        
+        ranked = semantic_index.related(video_id, limit=limit * 4)
+        if ranked is None:
+            raise HTTPException(status_code=404, detail=f"Video {video_id} is not in the semantic index yet")
+        # The video's own story is marked seen, so its copies are dropped too
+        items = collapse_stories(ranked_news_items(ranked), seen={news_item.get("story_id") or video_id})
+        return {"video_id": video_id, "count": len(items[:limit]), "results": items[:limit]}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error finding stories related to {video_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+# Admin endpoint to (re)build the semantic index from every cached document
+@app.post("/build_semantic_index")
+async def build_semantic_index_endpoint(
+    sample_size: int = Query(2000, description="Newest documents the embedder is fitted on"),
+    batch_size: int = Query(256, description="Documents embedded per batch"),
+    confirm: bool = Query(False, description="Must be True to actually rebuild the index")
+):
+    """Fit the embedder (unless a local model is configured) and embed every cached document"""
+    if not confirm:
+        return {
+            "message": "Add ?confirm=true to actually build the semantic index",
+            "warning": "Refitting the embedder replaces every stored embedding"
+        }
+    
+    # Embeds the whole corpus; keep it off the event loop
+    result = await run_in_threadpool(build_semantic_index, sample_size=sample_size, batch_size=batch_size)
+    if "error" in result:
+        raise HTTPException(status_code=500, detail=result["error"])
+    return result
+
+
+@app.get("/semantic_index_stats")
+async def semantic_index_stats():
+    """Embedder, size and query count of the semantic index"""
+    return semantic_index.stats()
+
+
+# Admin endpoint to assign story ids to transcripts cached before detection existed
+@app.post("/assign_story_ids")
+async def assign_story_ids_endpoint(
+    batch_size: int = Query(500, description="Documents per bulk write"),
+    confirm: bool = Query(False, description="Must be True to actually update documents")
+):
+    """Cluster recent transcripts into near-duplicate stories"""
+    if not confirm:
+        return {
+            "message": "Add ?confirm=true to actually assign story ids",
+            "warning": "Only transcripts without a signature inside the story window are processed"
+        }
+    
+    # Whole-corpus MinHash pass; keep it off the event loop
+    result = await run_in_threadpool(assign_story_ids, batch_size=batch_size)
+    if "error" in result:
+        raise HTTPException(status_code=500, detail=result["error"])
+    await run_in_threadpool(load_hot_feed_index)
+    return result
+
+
+# Admin endpoint to move inline transcripts into the compressed transcript store
+@app.post("/externalize_transcripts")
+async def externalize_transcripts_endpoint(
+    batch_size: int = Query(500, description="Documents per bulk write"),
+    confirm: bool = Query(False, description="Must be True to actually move transcripts")
+):
+    """Store full transcripts compressed outside db.news, keeping previews inline"""
+    if not confirm:
+        return {
+            "message": "Add ?confirm=true to actually move transcripts",
+            "warning": "Inline transcripts are replaced by previews"
+        }
+    
+    # Compresses and stores the whole corpus; keep it off the event loop
+    result = await run_in_threadpool(externalize_transcripts, batch_size=batch_size)
+    if "error" in result:
+        raise HTTPException(status_code=500, detail=result["error"])
+    await run_in_threadpool(load_hot_feed_index)
+    return result
+
+
+@app.get("/transcript_storage_stats")
+async def transcript_storage_stats():
+    """Size and compression ratio of the out-of-line transcript store"""
+    try:
+        return transcript_store.stats()
+    except Exception as e:
+        logger.error(f"Error reading transcript storage stats: {e}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+# Admin endpoints for the negative cache of rejected videos
+@app.get("/negative_cache_stats")
+async def negative_cache_stats():
+    """Rejected videos by reason and the requests crawls skipped thanks to them"""
+    result = get_negative_cache_stats()
+    if "error" in result:
+        raise HTTPException(status_code=500, detail=result["error"])
+    return result
+
+
+@app.delete("/clear_negative_cache")
+async def clear_negative_cache_endpoint(
+    reason: str | None = Query(None, description="Only clear rejections with this reason code"),
+    confirm: bool = Query(False, description="Must be True to actually delete")
+):
+    """Forget rejected videos so the next crawl checks them again"""
+    if not confirm:
+        return {
+            "message": "Add ?confirm=true to actually delete rejections",
+            "warning": "Rejected videos will be re-checked, spending API quota"
+        }
+    
+    result = clear_negative_cache(reason)
+    if "error" in result:
+        raise HTTPException(status_code=500, detail=result["error"])
+    return result
+
+
+# Admin endpoint to inspect the near-duplicate story index
+@app.get("/story_index_stats")
+async def story_index_stats():
+    """Size and duplicate rate of the story index"""
+    return story_index.stats()
+
+
+# Admin endpoint to inspect the in-process hot feed index
+@app.get("/hot_feed_stats")
+async def hot_feed_stats():
+    """Size, memory use and hit rate of the hot feed index"""
+    return hot_feed_index.stats()
+
+
+# Admin endpoint to normalize documents written before the canonical schema
+@app.post("/backfill_news_schema")
+async def backfill_news_schema_endpoint(
+    batch_size: int = Query(500, description="Documents per bulk write"),
+    confirm: bool = Query(False, description="Must be True to actually rewrite documents")
+):
+    """Rewrite old-shape news documents into the canonical schema"""
+    if not confirm:
+        return {
+            "message": "Add ?confirm=true to actually rewrite documents",
+            "warning": "Documents missing video_id/title/video_url are moved to news_invalid"
+        }
+    
+    # Whole-corpus pass ending in a stats rebuild; keep it off the event loop
+    result = await run_in_threadpool(backfill_news_schema, batch_size=batch_size)
+    if "error" in result:
+        raise HTTPException(status_code=500, detail=result["error"])
+    await run_in_threadpool(load_hot_feed_index)
+    return result
+
+
+# Prometheus scrape endpoint for per-stage latency, errors, quota and in-flight work
+@app.get("/metrics")
+def metrics():
+    """Pipeline metrics in the Prometheus text format"""
+    return Response(metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+# Admin endpoint to change the profiled share of traffic and list written profiles
+@app.post("/profiling")
+async def profiling_settings(
+    sample_rate: Optional[float] = Query(None, ge=0, le=1, description="Share of all requests to profile"),
+    x_admin_token: Optional[str] = Header(None)
+):
+    """Profiling settings and recent profiles; needs the X-Admin-Token header"""
+    if not request_profiler.check_token(x_admin_token):
+        raise HTTPException(status_code=403, detail="Profiling is disabled or the admin token is wrong")
+    if sample_rate is not None:
+        request_profiler.sample_rate = sample_rate
+    return request_profiler.stats()
+
+
+# Latency per traced stage and the slowest videos of the recent requests
+@app.get("/trace_stats")
+async def trace_stats(limit: int = Query(10, ge=1, le=100, description="Slowest videos and spans to list")):
+    """Summary of the spans of the last traced requests (TRACE_FILE keeps all of them)"""
+    return {"traces": len(tracer.recent.traces), **summarize_spans(tracer.recent.spans(), limit)}
+
+
+# Crawl and summarize leases shared by all workers
+@app.get("/lease_stats")
+async def lease_stats():
+    """Leases this worker holds and the unexpired leases of the whole cluster"""
+    try:
+        return lease_manager.stats()
+    except Exception as e:
+        logger.error(f"Error reading leases: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to read leases: {str(e)}")
+
+
+# Rolling request latency per route, measured by the logging middleware
+@app.get("/route_latency")
+async def route_latency_stats(reset: bool = Query(False, description="Clear the windows after reading")):
+    """p50/p95/p99 latency of the last requests of every route"""
+    routes = route_latency.snapshot()
+    if reset:
+        route_latency.reset()
+    return {"window": route_latency.window, "routes": routes}
+
+
 # Health check endpoint (enhanced with summarization model status)
 @app.get("/health")
 async def health_check():
@@ -1353,14 +2017,11 @@ async def health_check():
         # Test database connection
         db.command('ping')
         
-        # Get cache statistics
-        total_cached = db.news.count_documents({})
-        recent_cached = db.news.count_documents({
-            "cached_at": {"$gte": datetime.utcnow() - timedelta(hours=24)}
-        })
-        
-        # Get summary statistics
-        total_summaries = db.news.count_documents({"summary": {"$exists": True, "$ne": None}})
+        # Get cache and summary statistics (single stats document read)
+        overview = news_stats.get_global()
+        total_cached = overview["total_items"]
+        recent_cached = overview["recent_cached_items"]
+        total_summaries = overview["items_with_summaries"]
         
         return {
             "status": "healthy",
@@ -1393,8 +2054,9 @@ def root():
         ],
         "endpoints": {
             "auth": ["/signup", "/login", "/users/me"],
-            "news": ["/get_latest_news", "/get_cached_news", "/get_news_by_channel/{channel_id}"],
+            "news": ["/get_latest_news", "/get_cached_news", "/get_news_by_channel/{channel_id}", "/get_news_by_channels", "/get_story/{video_id}", "/semantic_search", "/related_stories/{video_id}"],
             "summarization": ["/summarize_news/{video_id}", "/get_summary/{video_id}", "/batch_summarize"],
-            "admin": ["/debug_cache", "/summary_stats", "/clear_cache", "/clear_summaries"]
+            "transcripts": ["/get_video_details/{video_id}", "/transcript_position/{video_id}"],
+            "admin": ["/debug_cache", "/summary_stats", "/clear_cache", "/clear_summaries", "/backfill_news_schema", "/reclassify_genres", "/hot_feed_stats", "/assign_story_ids", "/story_index_stats", "/negative_cache_stats", "/clear_negative_cache", "/externalize_transcripts", "/transcript_storage_stats", "/build_semantic_index", "/semantic_index_stats", "/metrics", "/route_latency", "/profiling", "/trace_stats", "/lease_stats"]
         }
     }
\ No newline at end of file
@@ -0,0 +1,74 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+# Bumped whenever the canonical shape changes; the backfill job rewrites
+# every document whose cache_version differs.
+SCHEMA_VERSION = "2.0"
+
+# Projection for list reads: leaves out the ObjectId and the binary
+# per-document internals no feed publishes
+LIST_PROJECTION = {"_id": 0, "transcript_segments": 0, "minhash": 0}
+
+
+class NewsDocument(BaseModel):
+    """Canonical shape of a db.news document, enforced on every write"""
+    model_config = ConfigDict(extra="allow")
+
+    video_id: str
+    title: str
+    video_url: str
+    description: str = ""
+    thumbnail: str = ""
+    channel_id: Optional[str] = None
+    channel_name: str = ""
+    channel_url: str = ""
+    published_at: str = ""
+    genre: str = "general"
+    genres: List[str] = Field(default_factory=list)
+    transcript: str = "No transcript available"
+    transcript_external: bool = False  # full text lives in the transcript store, `transcript` is a preview
+    transcript_language: str = "none"
+    transcript_segments: Optional[Dict[str, Any]] = None  # see Transcripts/transcript_segments.py
+    word_count: int = 0
+    story_id: Optional[str] = None  # shared by near-duplicate copies of one story
+    minhash: Optional[bytes] = None  # see Transcripts/story_dedup.py
+    cached_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    cache_version: str = SCHEMA_VERSION
+    source: str = "youtube"
+
+    @model_validator(mode="before")
+    @classmethod
+    def drop_missing_values(cls, data):
+        # Stored documents use None for "missing"; let the defaults apply instead
+        if isinstance(data, dict):
+            data = {key: value for key, value in data.items()
+                    if not (value is None and key in cls.model_fields)}
+        return data
+
+    @field_validator("video_id", "title", "video_url")
+    @classmethod
+    def required_not_empty(cls, value):
+        value = value.strip()
+        if not value:
+            raise ValueError("must not be empty")
+        return value
+
+    @model_validator(mode="after")
+    def fill_derived_fields(self):
+        if not self.channel_url and self.channel_id:
+            self.channel_url = f"https://www.youtube.com/channel/{self.channel_id}"
+        self.cache_version = SCHEMA_VERSION
+        return self
+
+
+def normalize_news_document(doc: dict, channel_id: Optional[str] = None) -> dict:
+    """
+    Return the canonical form of a news document ready to be written.
+    Raises ValueError (pydantic ValidationError) when a required field is missing.
+    """
+    doc = dict(doc)
+    doc.pop("_id", None)
+    if not doc.get("channel_id") and channel_id:
+        doc["channel_id"] = channel_id
+    return NewsDocument(**doc).model_dump()
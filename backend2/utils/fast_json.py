@@ -0,0 +1,58 @@
+# fast_json.py
+import json
+from typing import Any, Iterable, List
+
+from fastapi.responses import Response
+
+from models.youtubevid import NewsItem
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib encoder
+    orjson = None
+
+
+# Published fields of NewsItem, in schema order
+NEWS_ITEM_FIELDS = tuple(NewsItem.model_fields)
+
+
+def _default(value: Any):
+    # datetimes and ObjectIds never reach the projected output, but be safe
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def dumps(payload: Any) -> bytes:
+    """Serialize to JSON bytes with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default)
+    return json.dumps(payload, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def project_news_items(docs: Iterable[dict]) -> List[dict]:
+    """
+    Keep only the NewsItem fields of each document, in schema order.
+    This is exactly what response_model=List[NewsItem] would emit for a
+    normalized document, without running pydantic or jsonable_encoder.
+    """
+    fields = NEWS_ITEM_FIELDS
+    return [{field: doc.get(field, "") for field in fields} for doc in docs]
+
+
+class NewsListResponse(Response):
+    """JSON response for pre-normalized news documents"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(project_news_items(content))
+
+
+class NewsFeedsResponse(Response):
+    """JSON response for {channel_id: [pre-normalized news documents]}"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps({key: project_news_items(items) for key, items in content.items()})
@@ -0,0 +1,272 @@
+# feed_index.py
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+
+def _as_naive_utc(dt):
+    """Mongo returns naive UTC datetimes, the cacher writes aware ones"""
+    if isinstance(dt, datetime) and dt.tzinfo is not None:
+        return dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+class FeedEntry:
+    """One feed item; only the fields the feed endpoints publish"""
+
+    __slots__ = ("video_id", "channel_id", "title", "genre", "video_url",
+                 "thumbnail", "transcript", "story_id", "cached_at", "nbytes")
+
+    FIELDS = ("video_id", "channel_id", "title", "genre", "video_url",
+              "thumbnail", "transcript", "story_id", "cached_at")
+
+    def __init__(self, doc):
+        self.video_id = doc.get("video_id", "")
+        self.channel_id = doc.get("channel_id")
+        self.title = doc.get("title", "")
+        self.genre = doc.get("genre", "general")
+        self.video_url = doc.get("video_url", "")
+        self.thumbnail = doc.get("thumbnail", "")
+        self.transcript = doc.get("transcript", "")
+        self.story_id = doc.get("story_id")
+        self.cached_at = _as_naive_utc(doc.get("cached_at")) or datetime.utcnow()
+        self.nbytes = sys.getsizeof(self) + sum(
+            sys.getsizeof(getattr(self, field)) for field in self.FIELDS
+        )
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+
+class _ChannelFeed:
+    __slots__ = ("entries", "exhaustive", "loaded_at")
+
+    def __init__(self):
+        self.entries = []        # newest first
+        self.exhaustive = True   # True while entries hold every document of the channel
+        self.loaded_at = time.monotonic()
+
+
+class HotFeedIndex:
+    """
+    Newest items per channel kept in process memory.
+
+    Invariant: for every channel the entries are exactly the newest
+    documents of that channel in db.news. Reads that fit inside what is held
+    are answered without touching Mongo; anything else returns None and the
+    caller queries the database.
+
+    Memory is bounded twice: at most `per_channel` entries per channel and
+    at most `max_bytes` in total (oldest entries of the largest channel are
+    evicted first).
+
+    Each process keeps its own index and sees only its own writes, so a
+    channel read more than `ttl` seconds after it was loaded is reloaded
+    from the database first (by one reader; the others keep serving the
+    held entries meanwhile). Writes and deletes made by other worker
+    processes therefore show up within `ttl` seconds.
+    """
+
+    def __init__(self,
+                 per_channel=int(os.getenv("HOT_FEED_PER_CHANNEL", "50")),
+                 max_bytes=int(os.getenv("HOT_FEED_MAX_MB", "64")) * 1024 * 1024,
+                 ttl=float(os.getenv("HOT_FEED_TTL_SECONDS", "15"))):
+        self.per_channel = per_channel
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._collection = None
+        self._channels = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.loaded = False
+
+    # ------------------------------------------------------------------ writes
+
+    def rebuild(self, collection):
+        """Load the newest `per_channel` documents of every channel"""
+        pipeline = [
+            {"$sort": {"channel_id": 1, "cached_at": -1}},
+            {"$setWindowFields": {
+                "partitionBy": "$channel_id",
+                "sortBy": {"cached_at": -1},
+                "output": {"feed_rank": {"$documentNumber": {}}}
+            }},
+            {"$match": {"feed_rank": {"$lte": self.per_channel}}},
+            {"$project": {field: 1 for field in FeedEntry.FIELDS} | {"_id": 0}},
+        ]
+        channels = {}
+        total_bytes = 0
+        for doc in collection.aggregate(pipeline, allowDiskUse=True):
+            feed = channels.setdefault(doc.get("channel_id"), _ChannelFeed())
+            entry = FeedEntry(doc)
+            feed.entries.append(entry)
+            total_bytes += entry.nbytes
+
+        for feed in channels.values():
+            feed.entries.sort(key=lambda e: e.cached_at, reverse=True)
+            feed.exhaustive = len(feed.entries) < self.per_channel
+
+        with self._lock:
+            self._collection = collection
+            self._channels = channels
+            self._bytes = total_bytes
+            self._enforce_budget()
+            self.loaded = True
+        logger.info(f"[feed_index] Loaded {self.item_count()} items for {len(channels)} channels")
+
+    def reload_channel(self, channel_id):
+        """Replace a channel's entries with its newest documents in the database"""
+        if self._collection is None:
+            return
+        try:
+            cursor = self._collection.find(
+                {"channel_id": {"$eq": channel_id}}, {field: 1 for field in FeedEntry.FIELDS} | {"_id": 0}
+            ).sort("cached_at", -1).limit(self.per_channel)
+            feed = _ChannelFeed()
+            feed.entries = [FeedEntry(doc) for doc in cursor]
+        except Exception as e:
+            # Keep serving the held entries; the next expiry tries again
+            logger.warning(f"[feed_index] could not reload channel {channel_id}: {e}")
+            return
+        feed.exhaustive = len(feed.entries) < self.per_channel
+        with self._lock:
+            previous = self._channels.get(channel_id)
+            if previous:
+                self._bytes -= sum(entry.nbytes for entry in previous.entries)
+            self._channels[channel_id] = feed
+            self._bytes += sum(entry.nbytes for entry in feed.entries)
+            self._enforce_budget()
+            self.reloads += 1
+
+    def _claim_expired(self, channel_id):
+        """True for the one caller that should reload an expired channel"""
+        with self._lock:
+            feed = self._channels.get(channel_id) if self.loaded else None
+            if feed is None or self._collection is None:
+                return False
+            now = time.monotonic()
+            if now - feed.loaded_at <= self.ttl:
+                return False
+            feed.loaded_at = now
+            return True
+
+    def upsert(self, doc):
+        """Record a freshly written news document"""
+        if not doc or not doc.get("video_id"):
+            return
+        entry = FeedEntry(doc)
+        with self._lock:
+            self._remove_video(entry.video_id)
+            feed = self._channels.setdefault(entry.channel_id, _ChannelFeed())
+            entries = feed.entries
+            # Fresh writes are almost always the newest item
+            position = 0
+            while position < len(entries) and entries[position].cached_at > entry.cached_at:
+                position += 1
+            entries.insert(position, entry)
+            self._bytes += entry.nbytes
+            while len(entries) > self.per_channel:
+                self._bytes -= entries.pop().nbytes
+                feed.exhaustive = False
+            self._enforce_budget()
+
+    def clear(self, channel_id=None):
+        """All documents of a channel (or of every channel) were deleted"""
+        with self._lock:
+            if channel_id is None:
+                self._channels = {}
+                self._bytes = 0
+            else:
+                feed = self._channels.pop(channel_id, None)
+                if feed:
+                    self._bytes -= sum(entry.nbytes for entry in feed.entries)
+                # Known to be empty now, so reads stay exact
+                self._channels[channel_id] = _ChannelFeed()
+
+    def drop_older_than(self, cutoff):
+        """Documents cached before `cutoff` were deleted from the database"""
+        cutoff = _as_naive_utc(cutoff)
+        with self._lock:
+            for feed in self._channels.values():
+                while feed.entries and feed.entries[-1].cached_at < cutoff:
+                    self._bytes -= feed.entries.pop().nbytes
+
+    def _remove_video(self, video_id):
+        """Drop a re-cached video from its channel (channel_id may have changed)"""
+        for feed in self._channels.values():
+            for position, entry in enumerate(feed.entries):
+                if entry.video_id == video_id:
+                    self._bytes -= entry.nbytes
+                    del feed.entries[position]
+                    return
+
+    def _enforce_budget(self):
+        while self._bytes > self.max_bytes and self._channels:
+            feed = max(self._channels.values(), key=lambda f: len(f.entries))
+            if not feed.entries:
+                break
+            self._bytes -= feed.entries.pop().nbytes
+            feed.exhaustive = False
+
+    # ------------------------------------------------------------------ reads
+
+    def get_feed(self, channel_id, limit, cutoff=None):
+        """
+        Newest `limit` items of a channel cached after `cutoff` (naive UTC),
+        or None when the index cannot answer exactly.
+        """
+        if self._claim_expired(channel_id):
+            self.reload_channel(channel_id)
+        with self._lock:
+            feed = self._channels.get(channel_id) if self.loaded else None
+            if feed is None:
+                self.misses += 1
+                return None
+
+            entries = feed.entries
+            if cutoff is not None:
+                fresh = [entry for entry in entries if entry.cached_at >= cutoff]
+                # An indexed entry older than the cutoff means nothing newer is missing
+                covered = feed.exhaustive or len(fresh) < len(entries) or len(fresh) >= limit
+            else:
+                fresh = entries
+                covered = feed.exhaustive or len(fresh) >= limit
+
+            if not covered:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return [entry.to_dict() for entry in fresh[:limit]]
+
+    def item_count(self):
+        return sum(len(feed.entries) for feed in self._channels.values())
+
+    def stats(self):
+        with self._lock:
+            items = self.item_count()
+            return {
+                "loaded": self.loaded,
+                "channels": len(self._channels),
+                "items": items,
+                "per_channel_limit": self.per_channel,
+                "approx_bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "reloads": self.reloads,
+                "bytes_per_1000_items": round(self._bytes / items * 1000) if items else 0,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Shared by the ingest write path (cacher) and the read endpoints (main)
+hot_feed_index = HotFeedIndex()
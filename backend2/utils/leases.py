@@ -0,0 +1,171 @@
+# leases.py
+import logging
+import os
+import secrets
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from utils.metrics import LEASE_EVENTS
+
+logger = logging.getLogger(__name__)
+
+# A lease whose holder stops renewing it can be taken over after this long
+LEASE_TTL_SECONDS = float(os.getenv("LEASE_TTL_SECONDS", "60"))
+# How long a worker that finds a lease taken waits for the holder to finish
+LEASE_WAIT_SECONDS = float(os.getenv("LEASE_WAIT_SECONDS", "30"))
+
+
+def _kind(name):
+    return name.partition(":")[0]
+
+
+class Lease:
+    """A held lease; `token` changes with every acquisition and fences stale holders"""
+
+    __slots__ = ("name", "token", "expires_at", "lost")
+
+    def __init__(self, name, token, expires_at):
+        self.name = name
+        self.token = token
+        self.expires_at = expires_at
+        self.lost = False
+
+
+class LeaseManager:
+    """
+    Cluster-wide leases in the `leases` collection, one document per name
+    ("crawl:<channel>:<query>", "summarize:<video_id>").
+
+    Acquiring is a single findOneAndUpdate that matches the lease only
+    while it is expired and upserts it when it does not exist, so of any
+    number of workers racing for a name exactly one wins; the others hit
+    the unique _id. An expired lease (its holder crashed or stalled past
+    the TTL) is taken over the same way. While a lease is held, a
+    background thread renews it every third of the TTL; a renewal that
+    finds the lease gone or re-acquired marks it lost. Expiry compares
+    against the workers' clocks, so hosts need roughly synced time.
+    """
+
+    def __init__(self, db, collection_name="leases", ttl_seconds=LEASE_TTL_SECONDS):
+        self.collection = db[collection_name]
+        self.ttl = ttl_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._held = {}  # token -> Lease
+        self._lock = threading.Lock()
+        self._heartbeat = None
+        try:
+            # Expired leases are deleted an hour later; takeover does not wait for it
+            self.collection.create_index("expires_at", expireAfterSeconds=3600)
+        except Exception as e:
+            logger.warning(f"[lease] could not create indexes: {e}")
+
+    def acquire(self, name):
+        """The lease, or None while another worker holds it"""
+        now = datetime.now(timezone.utc)
+        token = secrets.token_hex(8)
+        expires_at = now + timedelta(seconds=self.ttl)
+        try:
+            previous = self.collection.find_one_and_update(
+                {"_id": name, "expires_at": {"$lte": now}},
+                {
+                    "$set": {"owner": self.owner, "token": token, "acquired_at": now, "expires_at": expires_at},
+                    "$inc": {"generation": 1},
+                },
+                upsert=True,
+                return_document=ReturnDocument.BEFORE,
+            )
+        except DuplicateKeyError:
+            LEASE_EVENTS.inc(kind=_kind(name), event="busy")
+            return None
+        if previous is not None and previous.get("token"):
+            LEASE_EVENTS.inc(kind=_kind(name), event="taken_over")
+            logger.warning(f"[lease] took over expired lease {name} from {previous.get('owner')}")
+        else:
+            LEASE_EVENTS.inc(kind=_kind(name), event="acquired")
+
+        lease = Lease(name, token, expires_at)
+        with self._lock:
+            self._held[token] = lease
+            if self._heartbeat is None:
+                self._heartbeat = threading.Thread(target=self._renew_loop, name="lease-heartbeat", daemon=True)
+                self._heartbeat.start()
+        return lease
+
+    def renew(self, lease):
+        """Push the expiry out; False (and lease.lost) when the lease is no longer ours"""
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl)
+        result = self.collection.update_one(
+            {"_id": lease.name, "token": lease.token}, {"$set": {"expires_at": expires_at}}
+        )
+        if result.matched_count:
+            lease.expires_at = expires_at
+            return True
+        with self._lock:
+            if self._held.pop(lease.token, None) is None:
+                return False  # released meanwhile
+        lease.lost = True
+        LEASE_EVENTS.inc(kind=_kind(lease.name), event="lost")
+        logger.warning(f"[lease] lost lease {lease.name}")
+        return False
+
+    def release(self, lease):
+        with self._lock:
+            self._held.pop(lease.token, None)
+        if lease.lost:
+            return
+        try:
+            self.collection.delete_one({"_id": lease.name, "token": lease.token})
+            LEASE_EVENTS.inc(kind=_kind(lease.name), event="released")
+        except Exception as e:
+            # It expires on its own
+            logger.warning(f"[lease] could not release {lease.name}: {e}")
+
+    @contextmanager
+    def hold(self, name):
+        """`with leases.hold(name) as lease:` — lease is None while another worker holds it"""
+        lease = self.acquire(name)
+        try:
+            yield lease
+        finally:
+            if lease is not None:
+                self.release(lease)
+
+    def wait_released(self, name, timeout=LEASE_WAIT_SECONDS, poll=0.25):
+        """Block until nobody holds `name` (released or expired); False on timeout"""
+        deadline = time.monotonic() + timeout
+        while True:
+            now = datetime.now(timezone.utc)
+            if self.collection.count_documents({"_id": name, "expires_at": {"$gt": now}}, limit=1) == 0:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(poll)
+
+    def _renew_loop(self):
+        while True:
+            time.sleep(self.ttl / 3)
+            with self._lock:
+                held = list(self._held.values())
+            for lease in held:
+                try:
+                    self.renew(lease)
+                except Exception as e:
+                    # Try again next beat; the lease survives until its expiry
+                    logger.warning(f"[lease] could not renew {lease.name}: {e}")
+
+    def stats(self):
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            held = [lease.name for lease in self._held.values()]
+        return {
+            "owner": self.owner,
+            "ttl_seconds": self.ttl,
+            "held_here": held,
+            "active_cluster_wide": self.collection.count_documents({"expires_at": {"$gt": now}}),
+        }
@@ -0,0 +1,137 @@
+# log_config.py
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+
+from utils.fast_json import dumps
+
+# Default level, per-logger levels ("Transcripts=WARNING,main.access=INFO")
+# and per-logger sampling of records below WARNING ("main.access=0.1")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+LOG_SAMPLING = os.getenv("LOG_SAMPLING", "")
+# "json" for one object per line, "text" for the plain format
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+
+# LogRecord attributes that are not `extra` fields
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+
+def _parse_pairs(spec, convert):
+    pairs = {}
+    for item in spec.split(","):
+        name, _, value = item.partition("=")
+        if name.strip() and value.strip():
+            pairs[name.strip()] = convert(value.strip())
+    return pairs
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record; `extra` fields become top-level keys"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return dumps(entry).decode("utf-8")
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a share of the records below WARNING of the configured loggers
+    (and their children); warnings and errors always pass.
+    """
+
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        name = record.name
+        while name:
+            rate = self.rates.get(name)
+            if rate is not None:
+                return random.random() < rate
+            name = name.rpartition(".")[0]
+        return True
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to the listener thread unformatted: only the message
+    is merged here (so later changes to the arguments cannot show up),
+    JSON encoding and the write happen off the calling thread.
+    """
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        # Like QueueHandler.prepare: the text is kept, the traceback (and its frames) is not
+        record.exc_info = None
+        return record
+
+
+_listener = None
+
+
+def configure_logging(level=LOG_LEVEL, levels=LOG_LEVELS, sampling=LOG_SAMPLING, fmt=LOG_FORMAT, stream=None):
+    """
+    Route every log record through a queue drained by a background thread,
+    so request handlers never format or write log lines themselves.
+    Calling it again replaces the previous configuration.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    if fmt == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    records = queue.SimpleQueue()
+    handler = _DeferredQueueHandler(records)
+    handler.addFilter(SamplingFilter(_parse_pairs(sampling, float)))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+    for name, logger_level in _parse_pairs(levels, str.upper).items():
+        logging.getLogger(name).setLevel(logger_level)
+
+    _listener = logging.handlers.QueueListener(records, output)
+    _listener.start()
+    return _listener
+
+
+def flush_logging():
+    """Stop the listener after it has written every queued record"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(flush_logging)
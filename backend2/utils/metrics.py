@@ -0,0 +1,284 @@
+# metrics.py
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+from utils.tracing import tracer
+
+# Latency buckets (seconds) from sub-millisecond Mongo writes to minute-long crawls
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Data API quota cost of each request type
+YOUTUBE_QUOTA_UNITS = {"search.list": 100, "videos.list": 1}
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(labels[name] for name in self.labelnames)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def value(self, **labels):
+        """Current value of a counter or gauge"""
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _samples(self):
+        with self._lock:
+            return [(_labels(self.labelnames, key), value) for key, value in sorted(self._values.items())]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{self.name}{labels} {_number(value)}" for labels, value in self._samples())
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def summary(self, **labels):
+        """(count, sum) of the observations with these labels"""
+        with self._lock:
+            counts, total = self._values.get(self._key(labels), ((), 0.0))
+            return sum(counts), total
+
+    def quantile(self, q, **labels):
+        """
+        Estimate of the q-quantile, interpolated inside its bucket the way
+        PromQL's histogram_quantile does; None without observations.
+        """
+        with self._lock:
+            counts = list(self._values.get(self._key(labels), ((), 0.0))[0])
+        if not counts or not sum(counts):
+            return None
+        rank = q * sum(counts)
+        cumulative, lower = 0, 0.0
+        for bound, count in zip(self.buckets, counts):
+            if count and cumulative + count >= rank:
+                return lower + (bound - lower) * (rank - cumulative) / count
+            cumulative += count
+            lower = bound
+        return self.buckets[-1]
+
+    def label_values(self):
+        with self._lock:
+            return sorted(self._values)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _labels(self.labelnames, key, [("le", _number(bound))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_number(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Process-local metrics in the Prometheus text exposition format (0.0.4).
+
+    Deliberately small: counters, gauges and fixed-bucket histograms with
+    labels, each guarded by its own lock, rendered on scrape. With several
+    worker processes every worker reports its own numbers.
+    """
+
+    def __init__(self):
+        self._metrics = []
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def clear(self):
+        """Drop every recorded value (benchmarks measure one phase at a time)"""
+        for metric in self._metrics:
+            metric.clear()
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+STAGE_SECONDS = registry.histogram(
+    "newsbyte_stage_duration_seconds",
+    "Time spent in each ingestion and summarization stage",
+    ["stage"],
+)
+STAGE_ERRORS = registry.counter(
+    "newsbyte_stage_errors_total",
+    "Stage runs that raised or returned a failure",
+    ["stage"],
+)
+IN_FLIGHT = registry.gauge(
+    "newsbyte_in_flight",
+    "Stage runs currently in progress",
+    ["stage"],
+)
+YOUTUBE_QUOTA = registry.counter(
+    "newsbyte_youtube_quota_units_total",
+    "YouTube Data API quota units spent",
+    ["endpoint"],
+)
+CRAWL_VIDEOS = registry.counter(
+    "newsbyte_crawl_videos_total",
+    "Search results handled by crawls, by outcome",
+    ["outcome"],
+)
+CRAWL_CACHE_RATIO = registry.gauge(
+    "newsbyte_crawl_cache_hit_ratio",
+    "Share of the last crawl's results served from the cache",
+)
+SINGLE_FLIGHT_CALLS = registry.counter(
+    "newsbyte_single_flight_calls_total",
+    "Coalesced calls by role; every follower is a duplicate run avoided",
+    ["group", "role"],
+)
+FEED_RESPONSES = registry.counter(
+    "newsbyte_feed_responses_total",
+    "/get_latest_news responses by freshness: fresh or stale from the cache, or crawled while waiting",
+    ["freshness"],
+)
+LEASE_EVENTS = registry.counter(
+    "newsbyte_lease_events_total",
+    "Lease acquisitions, takeovers of expired leases, busy refusals, losses and releases",
+    ["kind", "event"],
+)
+
+
+class StageRun:
+    """Handle of a running stage; set `failed` for failures that do not raise"""
+
+    __slots__ = ("failed",)
+
+    def __init__(self):
+        self.failed = False
+
+
+@contextmanager
+def track_stage(stage, **attributes):
+    """
+    Time a stage, count it in flight while it runs and count its failures.
+    The stage is also a trace span carrying `attributes` (like video_id),
+    which never become metric labels.
+    """
+    run = StageRun()
+    IN_FLIGHT.inc(stage=stage)
+    start = time.perf_counter()
+    with tracer.span(stage, **attributes) as span:
+        try:
+            yield run
+        except BaseException:
+            run.failed = True
+            raise
+        finally:
+            STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage)
+            IN_FLIGHT.dec(stage=stage)
+            if run.failed:
+                STAGE_ERRORS.inc(stage=stage)
+                span.set(failed=True)
+
+
+def timed_stage(stage):
+    """Decorator form of track_stage"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with track_stage(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def spend_quota(endpoint):
+    YOUTUBE_QUOTA.inc(YOUTUBE_QUOTA_UNITS.get(endpoint, 0), endpoint=endpoint)
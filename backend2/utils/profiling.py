@@ -0,0 +1,160 @@
+# profiling.py
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+
+# Admin token; profiling is off entirely while it is unset
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+# Share of all requests profiled without being asked (0 disables)
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "2"))
+
+PROFILE_HEADER = "x-profile"
+PROFILE_QUERY_PARAM = "profile"
+
+# Leaf frames of threads that are waiting, not working
+_IDLE_FRAMES = {
+    ("threading.py", "wait"), ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"), ("queue.py", "get"), ("handlers.py", "dequeue"),
+    ("base_events.py", "_run_once"),
+}
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Samples the Python stacks of every other thread at a fixed interval
+    and counts them as folded stacks ("thread;outer;...;leaf count"), the
+    input format of flamegraph.pl, speedscope and inferno. Threads that
+    are only waiting are left out. Every thread is sampled because sync
+    endpoints run in the threadpool, not where the middleware runs; work
+    of concurrent requests therefore shows up as well.
+    """
+
+    def __init__(self, interval=PROFILE_INTERVAL_MS / 1000):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self):
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                if (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in _IDLE_FRAMES:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                if ident not in names:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self
+
+    def folded(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class RequestProfiler:
+    """
+    Decides which requests are profiled and writes their profiles.
+
+    A request is profiled when it carries the admin token in the
+    X-Profile header or the ?profile= query parameter, or when it falls
+    into `sample_rate` of all traffic. One profile runs at a time; while
+    the token is unset nothing is ever profiled and the per-request cost
+    is a single attribute check.
+    """
+
+    def __init__(self, token=PROFILING_TOKEN, directory=PROFILE_DIR, sample_rate=PROFILE_SAMPLE_RATE,
+                 interval=PROFILE_INTERVAL_MS / 1000):
+        self.token = token
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.profiles_written = 0
+        self._busy = threading.Lock()
+
+    @property
+    def enabled(self):
+        return bool(self.token)
+
+    def check_token(self, candidate):
+        return bool(self.token) and hmac.compare_digest((candidate or "").encode(), self.token.encode())
+
+    def wants(self, headers, query_params):
+        """Whether to profile a request; only called while enabled"""
+        requested = headers.get(PROFILE_HEADER) or query_params.get(PROFILE_QUERY_PARAM)
+        if requested:
+            return self.check_token(requested)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def start(self):
+        """A running sampler, or None when another profile is in progress"""
+        if not self._busy.acquire(blocking=False):
+            return None
+        try:
+            return StackSampler(self.interval).start()
+        except Exception:
+            self._busy.release()
+            raise
+
+    def finish(self, sampler, method, route, seconds):
+        """Stop the sampler and write its profile; returns the file path"""
+        try:
+            sampler.stop()
+        finally:
+            self._busy.release()
+        os.makedirs(self.directory, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+        filename = f"{datetime.now(timezone.utc):%Y%m%d-%H%M%S}_{method}_{slug}_{seconds * 1000:.0f}ms.folded"
+        path = os.path.join(self.directory, filename)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(sampler.folded())
+        self.profiles_written += 1
+        return path
+
+    def recent(self, limit=20):
+        try:
+            files = sorted(os.listdir(self.directory), reverse=True)
+        except FileNotFoundError:
+            return []
+        return [name for name in files if name.endswith(".folded")][:limit]
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "interval_ms": self.interval * 1000,
+            "directory": os.path.abspath(self.directory),
+            "profiles_written": self.profiles_written,
+            "recent": self.recent(),
+        }
+
+
+request_profiler = RequestProfiler()
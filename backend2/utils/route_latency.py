@@ -0,0 +1,60 @@
+# route_latency.py
+import threading
+from collections import deque
+
+import numpy as np
+
+
+class RouteLatency:
+    """
+    Rolling latency percentiles per route: the last `window` durations of
+    every route template (/summarize_news/{video_id}, not each video id)
+    are kept in a ring buffer and the percentiles are computed on read.
+    """
+
+    def __init__(self, window=2048):
+        self.window = window
+        self._samples = {}  # (method, route) -> deque of seconds
+        self._counts = {}   # (method, route) -> requests since start
+        self._errors = {}   # (method, route) -> 5xx responses and exceptions
+        self._lock = threading.Lock()
+
+    def record(self, method, route, seconds, failed=False):
+        key = (method, route)
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(seconds)
+            self._counts[key] = self._counts.get(key, 0) + 1
+            if failed:
+                self._errors[key] = self._errors.get(key, 0) + 1
+
+    def snapshot(self):
+        """{"METHOD /route": {requests, errors, p50_ms, p95_ms, p99_ms, max_ms}}, slowest p95 first"""
+        with self._lock:
+            samples = {key: list(values) for key, values in self._samples.items()}
+            counts = dict(self._counts)
+            errors = dict(self._errors)
+        routes = {}
+        for key, values in samples.items():
+            p50, p95, p99 = np.percentile(values, [50, 95, 99]) * 1000
+            routes[f"{key[0]} {key[1]}"] = {
+                "requests": counts[key],
+                "errors": errors.get(key, 0),
+                "window": len(values),
+                "p50_ms": round(float(p50), 2),
+                "p95_ms": round(float(p95), 2),
+                "p99_ms": round(float(p99), 2),
+                "max_ms": round(max(values) * 1000, 2),
+            }
+        return dict(sorted(routes.items(), key=lambda item: -item[1]["p95_ms"]))
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+            self._errors.clear()
+
+
+route_latency = RouteLatency()
@@ -0,0 +1,84 @@
+# single_flight.py
+import asyncio
+import threading
+from concurrent.futures import Future
+
+from utils.metrics import SINGLE_FLIGHT_CALLS
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller (the
+    leader) runs the function, callers arriving while it runs (followers)
+    wait for it and get the same result or exception. Nothing is kept
+    afterwards, so the next call with that key runs the function again.
+    Followers share the leader's result object and must not modify it.
+    Async callers (`do_async`) wait on the event loop instead of a thread,
+    so a burst of followers does not drain the threadpool.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._calls = {}  # key -> Future of the running call
+        self._lock = threading.Lock()
+
+    def _join(self, key):
+        """(future of the call, whether the caller leads it)"""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        SINGLE_FLIGHT_CALLS.inc(group=self.name, role="leader" if leader else "follower")
+        return future, leader
+
+    def _finish(self, key):
+        with self._lock:
+            del self._calls[key]
+
+    def do(self, key, fn, *args, **kwargs):
+        """Returns (result, shared); shared is True for followers"""
+        future, leader = self._join(key)
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            self._finish(key)
+
+    async def do_async(self, key, run, *args, **kwargs):
+        """
+        `do` for the event loop: the leader awaits run(*args, **kwargs)
+        (typically run_in_threadpool(fn, ...)), followers await its future
+        without holding a thread. Coalesces with `do` callers of the same key.
+        """
+        future, leader = self._join(key)
+        if not leader:
+            # A cancelled follower must not cancel the shared future
+            return await asyncio.shield(asyncio.wrap_future(future)), True
+
+        try:
+            result = await run(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            self._finish(key)
+
+    def running(self, key):
+        with self._lock:
+            return key in self._calls
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,201 @@
+# tracing.py
+"""
+Per-request trace spans with parent/child structure.
+
+The current span lives in a context variable, so spans opened inside a
+request (including sync code run in the threadpool) become its children.
+When the root span of a trace ends, all its spans go to the exporters at
+once. Exporters are pluggable (anything with export(spans) and
+shutdown()); the recent-traces ring always runs, JsonLinesExporter
+writes to TRACE_FILE when it is set.
+
+Inspect a trace file offline:
+
+    cd backend2
+    python -m utils.tracing traces.jsonl --limit 10
+"""
+import argparse
+import json
+import os
+import secrets
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import numpy as np
+
+TRACE_FILE = os.getenv("TRACE_FILE", "")
+TRACE_RECENT = int(os.getenv("TRACE_RECENT", "200"))
+
+_current_span = ContextVar("current_span", default=None)
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start", "duration", "attributes", "error",
+                 "_trace", "_started")
+
+    def __init__(self, name, parent, attributes):
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else None
+        self.name = name
+        self.start = time.time()
+        self.duration = None
+        self.attributes = attributes
+        self.error = None
+        self._trace = parent._trace if parent else []  # spans of the trace that have ended
+        self._started = time.perf_counter()
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def to_dict(self):
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": round(self.duration * 1000, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class RecentTracesExporter:
+    """The last `max_traces` traces in memory, for the stats endpoint"""
+
+    def __init__(self, max_traces=TRACE_RECENT):
+        self.traces = deque(maxlen=max_traces)
+
+    def export(self, spans):
+        self.traces.append(spans)
+
+    def spans(self):
+        return [span for trace in list(self.traces) for span in trace]
+
+    def shutdown(self):
+        pass
+
+
+class JsonLinesExporter:
+    """Appends one JSON object per span to a file; works offline"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans):
+        lines = "".join(json.dumps(span, default=str) + "\n" for span in spans)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+    def shutdown(self):
+        pass
+
+
+class Tracer:
+    def __init__(self, exporters=()):
+        self.exporters = list(exporters)
+        self.recent = RecentTracesExporter()
+        self.exporters.insert(0, self.recent)
+        self.export_errors = 0
+
+    def add_exporter(self, exporter):
+        self.exporters.append(exporter)
+
+    @contextmanager
+    def span(self, name, **attributes):
+        """Child of the current span, or the root of a new trace"""
+        parent = _current_span.get()
+        span = Span(name, parent, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            span.duration = time.perf_counter() - span._started
+            span._trace.append(span.to_dict())
+            if parent is None:
+                self._export(span._trace)
+
+    def current(self):
+        return _current_span.get()
+
+    def annotate(self, **attributes):
+        """Add attributes to the current span, if there is one"""
+        span = _current_span.get()
+        if span is not None:
+            span.set(**attributes)
+
+    def _export(self, spans):
+        for exporter in self.exporters:
+            try:
+                exporter.export(spans)
+            except Exception:
+                self.export_errors += 1
+
+    def shutdown(self):
+        for exporter in self.exporters:
+            exporter.shutdown()
+
+
+def summarize_spans(spans, limit=10):
+    """Latency per span name and the slowest videos (summed over their spans)"""
+    by_name = defaultdict(list)
+    by_video = defaultdict(float)
+    for span in spans:
+        by_name[span["name"]].append(span["duration_ms"])
+        video_id = span["attributes"].get("video_id")
+        if video_id:
+            by_video[video_id] += span["duration_ms"]
+    stages = {}
+    for name, durations in by_name.items():
+        p50, p95 = np.percentile(durations, [50, 95])
+        stages[name] = {"count": len(durations), "p50_ms": round(float(p50), 2), "p95_ms": round(float(p95), 2),
+                        "max_ms": round(max(durations), 2), "total_ms": round(sum(durations), 2)}
+    slowest_spans = sorted(spans, key=lambda span: -span["duration_ms"])[:limit]
+    return {
+        "spans": len(spans),
+        "stages": dict(sorted(stages.items(), key=lambda item: -item[1]["total_ms"])),
+        "slowest_videos": [{"video_id": video_id, "total_ms": round(total, 2)}
+                           for video_id, total in sorted(by_video.items(), key=lambda item: -item[1])[:limit]],
+        "slowest_spans": [{"name": span["name"], "duration_ms": span["duration_ms"],
+                           "trace_id": span["trace_id"], **span["attributes"]} for span in slowest_spans],
+    }
+
+
+tracer = Tracer([JsonLinesExporter(TRACE_FILE)] if TRACE_FILE else [])
+
+
+def _read_spans(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("file", help="spans written by JsonLinesExporter")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--trace", help="print the spans of one trace as a tree")
+    args = parser.parse_args()
+
+    spans = _read_spans(args.file)
+    if args.trace:
+        children = defaultdict(list)
+        for span in spans:
+            if span["trace_id"] == args.trace:
+                children[span["parent_id"]].append(span)
+
+        def show(parent_id, depth):
+            for span in sorted(children[parent_id], key=lambda span: span["start"]):
+                print(f"{'  ' * depth}{span['name']:30s} {span['duration_ms']:10.2f} ms  {span['attributes']}")
+                show(span["span_id"], depth + 1)
+        show(None, 0)
+    else:
+        print(json.dumps(summarize_spans(spans, args.limit), indent=2, ensure_ascii=False))
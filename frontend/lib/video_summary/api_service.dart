@@ -38,6 +38,29 @@ class ApiService {
     }
   }
 
+  // Get latest news of several channels in one request, keyed by channel id
+  static Future<Map<String, List<NewsItem>>> getNewsByChannels(List<String> channelIds, {int perChannel = 10}) async {
+    try {
+      final response = await http.get(
+        Uri.parse('$baseUrl/get_news_by_channels?channel_ids=${channelIds.join(',')}&per_channel=$perChannel'),
+        headers: _headers,
+      );
+
+      if (response.statusCode == 200) {
+        final Map<String, dynamic> data = json.decode(response.body);
+        return data.map((channelId, items) => MapEntry(
+          channelId,
+          (items as List<dynamic>).map((item) => NewsItem.fromJson(item)).toList(),
+        ));
+      } else {
+        throw Exception('Failed to fetch news: ${response.statusCode}');
+      }
+    } catch (e) {
+      print('Error fetching news: $e');
+      return {};
+    }
+  }
+
   // Get summary for a specific video
   static Future<Map<String, dynamic>?> getSummary(String videoId) async {
     try {